@@ -7,6 +7,7 @@
 
 
 import random
+from bisect import bisect_left
 from queue_and_stack import Queue, Stack
 from bst import BSTNode, BST
 
@@ -14,12 +15,14 @@ from bst import BSTNode, BST
 class AVLNode(BSTNode):
     """
     AVL Tree Node class. Inherits from BSTNode
-    DO NOT CHANGE THIS CLASS IN ANY WAY
     """
+
+    # fixed attribute layout, no per-node __dict__
+    __slots__ = ('parent', 'height')
+
     def __init__(self, value: object) -> None:
         """
         Initialize a new AVL node
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
         # call __init__() from parent class
         super().__init__(value)
@@ -41,13 +44,25 @@ class AVL(BST):
     AVL Tree class. Inherits from BST
     """
 
-    def __init__(self, start_tree=None) -> None:
+    # node class (or factory taking a value) used for every new node
+    _node_type = AVLNode
+
+    # load() bulk-builds instead of restoring a stored shape (see BST)
+    _restore_shape = False
+
+    # advanced whenever the root is replaced, so cursors can tell that
+    # the tree was modified under them
+    _version = 0
+
+    def __init__(self, start_tree=None, multiset: bool = False) -> None:
         """
         Initialize a new AVL Tree
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        Without multiset mode duplicates are ignored; with it each node
+        counts the copies of its value.
         """
         # call __init__() from parent class
-        super().__init__(start_tree)
+        super().__init__(start_tree, multiset)
 
     def __str__(self) -> str:
         """
@@ -101,18 +116,106 @@ class AVL(BST):
 
     # ------------------------------------------------------------------ #
 
-    def add(self, value: object) -> None: #passes the first two prescribed tests
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with a perfectly
+        balanced tree built from a sorted list. Duplicates are dropped, or
+        counted in multiset mode.
+
+        Parameters:
+        - values: Sorted list of values.
+
+        Returns:
+        - None
+        """
+        unique, counts = self._group_runs(values)
+        if not self._multiset:
+            counts = None
+        self._set_root(self._build_balanced(unique, 0, len(unique), counts))
+        self._refresh_extremes()
+
+    def _set_root(self, root: AVLNode) -> None:
+        """
+        Helper method to install a new root: clears its parent pointer and
+        advances the version seen by cursors.
+
+        Parameters:
+        - root: The new root, or None.
+
+        Returns:
+        - None
+        """
+        if root is not None:
+            root.parent = None
+        self._root = root
+        self._version += 1
+
+    def _update_node(self, node: AVLNode) -> None:
+        """
+        Helper method to recompute a node's height and subtree size from
+        its children, and point the children's parent pointers at it.
+
+        Parameters:
+        - node: The node whose children changed.
+
+        Returns:
+        - None
+        """
+        left, right = node.left, node.right
+        if left is None:
+            if right is None:
+                node.height, node.size = 0, node.count
+            else:
+                node.height, node.size = 1 + right.height, node.count + right.size
+                right.parent = node
+        elif right is None:
+            node.height, node.size = 1 + left.height, node.count + left.size
+            left.parent = node
+        else:
+            node.height = 1 + max(left.height, right.height)
+            node.size = node.count + left.size + right.size
+            left.parent = right.parent = node
+
+    def add(self, value: object, n: int = 1) -> bool: #passes the first two prescribed tests
         """
                 Add a new value to the AVL tree while maintaining its AVL property.
+                Duplicates are detected during the same descent that inserts,
+                so the tree is only walked once.
 
                 Parameters:
                 - value: The value to be added to the tree.
+                - n: Number of copies to add (multiset mode only).
 
                 Returns:
-                - None
+                - bool: True if the value was added, False if it was already present.
                 """
-        if not self.contains(value):
-            self._root = self._add_recursive(self._root, value)
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        self._changed = False
+        root = self._add_recursive(self._root, value, n)
+        if self._changed:
+            self._finish_add(root, value)
+        return self._changed
+
+    def _finish_add(self, root: AVLNode, value: object) -> None:
+        """
+        Helper method that installs the root returned by an insert and
+        keeps the cached extremes current.
+
+        Parameters:
+        - root: The new root.
+        - value: The value that was inserted.
+
+        Returns:
+        - None
+        """
+        if self._root is None:
+            self._min_value = self._max_value = value
+        elif value < self._min_value:
+            self._min_value = value
+        elif self._max_value < value:
+            self._max_value = value
+        self._set_root(root)
 
     def _height(self, node):
         """Helper method to get the height of a node."""
@@ -120,50 +223,74 @@ class AVL(BST):
             return -1
         return node.height
 
-    def _add_recursive(self, node: AVLNode, value: object) -> AVLNode:
+    def _add_recursive(self, node: AVLNode, value: object, n: int = 1) -> AVLNode:
         """
             Helper method for recursive addition of a value to the AVL tree.
+            Sets self._changed when a new node is created (or a count grows).
 
             Parameters:
             - node: The current node in the recursion.
             - value: The value to be added to the tree.
+            - n: Number of copies to add (multiset mode only).
 
             Returns:
             - AVLNode: The root of the modified subtree.
             """
         # Perform standard BST insert
         if node is None:
-            return AVLNode(value)
+            self._changed = True
+            return self._new_node(value, n if self._multiset else 1)
         elif value < node.value:
-            node.left = self._add_recursive(node.left, value)
+            node.left = self._add_recursive(node.left, value, n)
+        elif value > node.value:
+            node.right = self._add_recursive(node.right, value, n)
+        elif self._multiset:
+            # Already present, count the new copies
+            self._changed = True
+            node.count += n
+            node.size += n
+            return node
         else:
-            node.right = self._add_recursive(node.right, value)
+            # Already present, nothing below this node changes
+            return node
 
-        # Update height of the current node
-        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        if not self._changed:
+            return node
 
-        # Get the balance factor and perform rotations if needed
-        balance = self._get_balance(node)
+        return self._rebalance(node)  # Return the new root after rotations
 
-        # Left Left Case
-        if balance > 1 and value < node.left.value:
-            return self._rotate_right(node)
+    def _rebalance(self, node: AVLNode) -> AVLNode:
+        """
+        Update the height and size of a node whose subtree changed and perform the
+        rotations needed to restore the AVL property at that node.
 
-        # Right Right Case
-        if balance < -1 and value > node.right.value:
-            return self._rotate_left(node)
+        Parameters:
+        - node: The AVL node.
+
+        Returns:
+        - AVLNode: The root of the subtree after rotations.
+        """
+        # Update height and size of the current node
+        self._update_node(node)
+
+        # Get the balance factor and perform rotations if needed
+        balance = self._get_balance(node)
 
-        # Left Right Case
-        if balance > 1 and value > node.left.value:
-            node.left = self._rotate_left(node.left)
+        if balance > 1:
+            # Left Right Case
+            if self._get_balance(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            # Left Left Case
             return self._rotate_right(node)
 
-        # Right Left Case
-        if balance < -1 and value < node.right.value:
-            node.right = self._rotate_right(node.right)
+        if balance < -1:
+            # Right Left Case
+            if self._get_balance(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            # Right Right Case
             return self._rotate_left(node)
 
-        return node  # Return the new root after rotations
+        return node
 
     def _get_balance(self, node: AVLNode) -> int:
         """
@@ -194,9 +321,9 @@ class AVL(BST):
         y.right = z
         z.left = T2
 
-        # Update heights
-        z.height = 1 + max(self._height(z.left), self._height(z.right))
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        # Update heights and sizes
+        self._update_node(z)
+        self._update_node(y)
 
         return y
 
@@ -217,48 +344,88 @@ class AVL(BST):
         x.left = y
         y.right = T2
 
-        # Update heights
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
-        x.height = 1 + max(self._height(x.left), self._height(x.right))
+        # Update heights and sizes
+        self._update_node(y)
+        self._update_node(x)
 
         return x
 
-    def remove(self, value: object) -> bool:
+    def remove(self, value: object, n: int = 1) -> bool:
         """
-                Remove the value from the AVL tree.
+                Remove the value from the AVL tree. A missing value is detected
+                during the same descent that removes, so the tree is only
+                walked once.
 
                 Parameters:
                 - value: The value to be removed.
+                - n: Number of copies to remove (multiset mode only).
 
                 Returns:
                 - bool: True if the value is removed, False otherwise.
                 """
-        if not self.contains(value):
-            return False
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        self._changed = False
+        root = self._remove_recursive(self._root, value, n)
+        if self._changed:
+            self._finish_remove(root, value)
+        return self._changed
+
+    def _finish_remove(self, root: AVLNode, value: object) -> None:
+        """
+        Helper method that installs the root returned by a removal and
+        keeps the cached extremes current.
 
-        self._root = self._remove_recursive(self._root, value)
-        return True
+        Parameters:
+        - root: The new root.
+        - value: The value that was removed.
+
+        Returns:
+        - None
+        """
+        self._set_root(root)
+        # Removing the smallest or largest value moves that extreme.
+        if not self._min_value < value < self._max_value:
+            self._refresh_extremes()
+
+    def _empty_copy(self) -> 'AVL':
+        """
+        Helper method that returns a new empty tree configured like this
+        one (same class and mode).
+        """
+        return type(self)(multiset=self._multiset)
 
-    def _remove_recursive(self, node: AVLNode, value: object) -> AVLNode:
+    def _remove_recursive(self, node: AVLNode, value: object, n: int = 1) -> AVLNode:
         """
         Helper method for recursive removal of a value from the AVL tree.
+        Sets self._changed when a node is removed (or a count shrinks).
 
         Parameters:
         - node: The current node in the recursion.
         - value: The value to be removed.
+        - n: Number of copies to remove; the node goes once none are left.
 
         Returns:
         - AVLNode: The root of the modified subtree.
         """
         if node is None:
+            # Value not found
             return None
 
         # Perform standard BST delete
         if value < node.value:
-            node.left = self._remove_recursive(node.left, value)
+            node.left = self._remove_recursive(node.left, value, n)
         elif value > node.value:
-            node.right = self._remove_recursive(node.right, value)
+            node.right = self._remove_recursive(node.right, value, n)
         else:
+            self._changed = True
+
+            if node.count > n:
+                # Multiset mode with copies to spare
+                node.count -= n
+                node.size -= n
+                return node
+
             # Node with only one child or no child
             if node.left is None:
                 return node.right
@@ -270,36 +437,15 @@ class AVL(BST):
             successor = self._get_min_value_node(node.right)
 
             # Copy the inorder successor's value to this node
-            node.value = successor.value
+            self._copy_entry(node, successor)
 
             # Delete the inorder successor
-            node.right = self._remove_recursive(node.right, successor.value)
+            node.right = self._remove_recursive(node.right, successor.value, successor.count)
 
-        # Update height of the current node
-        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        if not self._changed:
+            return node
 
-        # Get the balance factor and perform rotations if needed
-        balance = self._get_balance(node)
-
-        # Left Left Case
-        if balance > 1 and self._get_balance(node.left) >= 0:
-            return self._rotate_right(node)
-
-        # Right Right Case
-        if balance < -1 and self._get_balance(node.right) <= 0:
-            return self._rotate_left(node)
-
-        # Left Right Case
-        if balance > 1 and self._get_balance(node.left) < 0:
-            node.left = self._rotate_left(node.left)
-            return self._rotate_right(node)
-
-        # Right Left Case
-        if balance < -1 and self._get_balance(node.right) > 0:
-            node.right = self._rotate_right(node.right)
-            return self._rotate_left(node)
-
-        return node
+        return self._rebalance(node)
 
     def _get_min_value_node(self, node: AVLNode) -> AVLNode:
         """
@@ -316,12 +462,574 @@ class AVL(BST):
             current = current.left
         return current
 
+    # ------------------------------------------------------------------ #
+
+    def _new_tree(self, root: AVLNode) -> 'AVL':
+        """
+        Helper method to wrap a detached subtree in a new tree of the same
+        class as this one.
+
+        Parameters:
+        - root: The root of the subtree, or None.
+
+        Returns:
+        - AVL: The new tree.
+        """
+        tree = self._empty_copy()
+        tree._set_root(root)
+        tree._refresh_extremes()
+        return tree
+
+    def _join(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Helper method that joins two AVL subtrees and a detached pivot node,
+        where every value in left < pivot < every value in right.
+        Descends the taller subtree's spine to where the heights match,
+        so it costs O(1 + height difference).
+
+        Parameters:
+        - left: Root of the left subtree, or None.
+        - pivot: Node to put between the two subtrees.
+        - right: Root of the right subtree, or None.
+
+        Returns:
+        - AVLNode: The root of the joined subtree.
+        """
+        left_height, right_height = self._height(left), self._height(right)
+        if left_height > right_height + 1:
+            left.right = self._join(left.right, pivot, right)
+            return self._rebalance(left)
+        if right_height > left_height + 1:
+            right.left = self._join(left, pivot, right.left)
+            return self._rebalance(right)
+
+        pivot.left, pivot.right = left, right
+        self._update_node(pivot)
+        return pivot
+
+    def _join2(self, left: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Helper method that joins two AVL subtrees without a pivot, using
+        the largest node of left as the pivot.
+
+        Parameters:
+        - left: Root of the left subtree, or None.
+        - right: Root of the right subtree, or None.
+
+        Returns:
+        - AVLNode: The root of the joined subtree.
+        """
+        if left is None:
+            return right
+        left, pivot = self._pop_max_node(left)
+        return self._join(left, pivot, right)
+
+    def _pop_max_node(self, node: AVLNode) -> tuple:
+        """
+        Helper method that detaches the node with the largest value from a
+        subtree and rebalances the path to it.
+
+        Parameters:
+        - node: The root of the subtree.
+
+        Returns:
+        - tuple: (root of the remaining subtree, detached node)
+        """
+        if node.right is None:
+            return node.left, node
+        node.right, largest = self._pop_max_node(node.right)
+        return self._rebalance(node), largest
+
+    def _add_sorted_batch(self, batch: list) -> int:
+        """
+        Helper method for add_many(): adds a small sorted batch in one
+        shared descent instead of one descent per value. Each node on the
+        search paths is visited once, the batch is split at it, and its
+        new subtrees are put back together with _join(). Part of the batch
+        that reaches an empty subtree is bulk-built there. O(M log(N / M + 1)).
+
+        Parameters:
+        - batch: Sorted list of values.
+
+        Returns:
+        - int: Number of values that were added.
+        """
+        unique, counts = self._group_runs(batch)
+        if not self._multiset:
+            counts = [1] * len(unique)
+        size = len(self)
+        if unique:
+            self._set_root(self._add_batch(self._root, unique, counts, 0, len(unique)))
+        self._refresh_extremes()
+        return len(self) - size
+
+    def _add_batch(self, node: AVLNode, values: list, counts: list, lo: int, hi: int) -> AVLNode:
+        """
+        Helper method for _add_sorted_batch() that adds values[lo:hi] to a
+        subtree. The range is never empty.
+
+        Returns:
+        - AVLNode: The root of the modified subtree.
+        """
+        if node is None:
+            if hi - lo == 1:
+                return self._new_node(values[lo], counts[lo])
+            return self._build_balanced(values, lo, hi, counts if self._multiset else None)
+
+        i = bisect_left(values, node.value, lo, hi)
+        j = i + (i < hi and not node.value < values[i])
+        if j > i and self._multiset:
+            node.count += counts[i]
+        left, right = node.left, node.right
+        if lo < i:
+            left = self._add_batch(left, values, counts, lo, i)
+        if j < hi:
+            right = self._add_batch(right, values, counts, j, hi)
+        return self._join(left, node, right)
+
+    def _remove_sorted_batch(self, batch: list) -> int:
+        """
+        Helper method for remove_many(): removes a small sorted batch in one
+        shared descent, as _add_sorted_batch() adds one. A node that loses
+        all its copies is dropped and its subtrees are joined with _join2().
+
+        Parameters:
+        - batch: Sorted list of values.
+
+        Returns:
+        - int: Number of values that were removed.
+        """
+        unique, counts = self._group_runs(batch)
+        if not self._multiset:
+            counts = [1] * len(unique)
+        size = len(self)
+        if unique:
+            self._set_root(self._remove_batch(self._root, unique, counts, 0, len(unique)))
+        self._refresh_extremes()
+        return size - len(self)
+
+    def _remove_batch(self, node: AVLNode, values: list, counts: list,
+                      lo: int, hi: int) -> AVLNode:
+        """
+        Helper method for _remove_sorted_batch() that removes values[lo:hi]
+        from a subtree. The range is never empty.
+
+        Returns:
+        - AVLNode: The root of the modified subtree.
+        """
+        if node is None:
+            return None
+
+        i = bisect_left(values, node.value, lo, hi)
+        j = i + (i < hi and not node.value < values[i])
+        left, right = node.left, node.right
+        if lo < i:
+            left = self._remove_batch(left, values, counts, lo, i)
+        if j < hi:
+            right = self._remove_batch(right, values, counts, j, hi)
+        if j > i:
+            if node.count <= counts[i]:
+                return self._join2(left, right)
+            node.count -= counts[i]
+        return self._join(left, node, right)
+
+    def _split(self, node: AVLNode, key: object) -> tuple:
+        """
+        Helper method that splits a subtree around key. O(log N).
+
+        Parameters:
+        - node: The root of the subtree, or None.
+        - key: The value to split at.
+
+        Returns:
+        - tuple: (subtree of values < key, detached node equal to key or
+          None, subtree of values > key)
+        """
+        if node is None:
+            return None, None, None
+        if key < node.value:
+            left, found, right = self._split(node.left, key)
+            return left, found, self._join(right, node, node.right)
+        if node.value < key:
+            left, found, right = self._split(node.right, key)
+            return self._join(node.left, node, left), found, right
+
+        left, right = node.left, node.right
+        node.left = node.right = None
+        self._update_node(node)
+        return left, node, right
+
+    def split(self, key: object) -> tuple:
+        """
+        Split the tree into a tree of the values less than key and a tree
+        of the values greater than or equal to key. This tree is left empty.
+
+        O(log N) runtime complexity.
+
+        Parameters:
+        - key: The value to split at.
+
+        Returns:
+        - tuple: (AVL of values < key, AVL of values >= key)
+        """
+        left, found, right = self._split(self._root, key)
+        if found is not None:
+            right = self._join(None, found, right)
+        self.make_empty()
+        return self._new_tree(left), self._new_tree(right)
+
+    @classmethod
+    def join(cls, left: 'AVL', pivot: object, right: 'AVL') -> 'AVL':
+        """
+        Join two trees and a value, where every value in left is less than
+        pivot and every value in right is greater than pivot. Both input
+        trees are left empty.
+
+        O(log N) runtime complexity.
+
+        Parameters:
+        - left: Tree of values less than pivot.
+        - pivot: The value between the two trees.
+        - right: Tree of values greater than pivot.
+
+        Returns:
+        - AVL: A new tree holding all the values.
+        """
+        tree = left._empty_copy()
+        node = tree._pivot_node(pivot)
+        # The cached extremes are sort keys for maps, like node.value.
+        if not left.is_empty() and not left._max_value < node.value:
+            raise ValueError('join() requires every value in left to be less than pivot')
+        if not right.is_empty() and not node.value < right._min_value:
+            raise ValueError('join() requires every value in right to be greater than pivot')
+
+        tree._set_root(tree._join(left._root, node, right._root))
+        tree._refresh_extremes()
+        left.make_empty()
+        right.make_empty()
+        return tree
+
+    def _pivot_node(self, pivot: object) -> AVLNode:
+        """
+        Helper method for join() that returns a new node for the pivot.
+        """
+        return self._new_node(pivot, 1)
+
+    def _union(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Helper method for union(): splits second at the root of first and
+        recurses on both sides. O(M log(N / M + 1)).
+        """
+        if first is None:
+            return second
+        if second is None:
+            return first
+        first_left, first_right = first.left, first.right
+        left, found, right = self._split(second, first.value)
+        if found is not None and self._multiset:
+            first.count += found.count
+        return self._join(self._union(first_left, left), first, self._union(first_right, right))
+
+    def _intersection(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Helper method for intersection(). O(M log(N / M + 1)).
+        """
+        if first is None or second is None:
+            return None
+        first_left, first_right = first.left, first.right
+        left, found, right = self._split(second, first.value)
+        left = self._intersection(first_left, left)
+        right = self._intersection(first_right, right)
+        if found is not None:
+            first.count = min(first.count, found.count)
+            return self._join(left, first, right)
+        return self._join2(left, right)
+
+    def _difference(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Helper method for difference(): splits first at the root of second.
+        O(M log(N / M + 1)).
+        """
+        if first is None or second is None:
+            return first
+        second_left, second_right = second.left, second.right
+        left, found, right = self._split(first, second.value)
+        left = self._difference(left, second_left)
+        right = self._difference(right, second_right)
+        if found is not None and found.count > second.count:
+            found.count -= second.count
+            return self._join(left, found, right)
+        return self._join2(left, right)
+
+    def _symmetric_difference(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Helper method for symmetric_difference(). O(M log(N / M + 1)).
+        """
+        if first is None:
+            return second
+        if second is None:
+            return first
+        first_left, first_right = first.left, first.right
+        left, found, right = self._split(second, first.value)
+        left = self._symmetric_difference(first_left, left)
+        right = self._symmetric_difference(first_right, right)
+        if found is not None:
+            if first.count == found.count:
+                return self._join2(left, right)
+            first.count = abs(first.count - found.count)
+        return self._join(left, first, right)
+
+    def _combine(self, other: 'AVL', operation) -> 'AVL':
+        """
+        Helper method that runs a set operation on the roots of this tree
+        and other, leaves both empty and wraps the result in a new tree.
+        """
+        if other is self:
+            raise ValueError('cannot combine a tree with itself')
+        root = operation(self._root, other._root)
+        self.make_empty()
+        other.make_empty()
+        return self._new_tree(root)
+
+    def union(self, other: 'AVL') -> 'AVL':
+        """
+        Return a new tree with the values in either tree. The nodes of both
+        trees are reused, so both are left empty. In multiset mode the
+        counts of a shared value are added.
+
+        O(M log(N / M + 1)) for trees of sizes M <= N.
+        """
+        return self._combine(other, self._union)
+
+    def intersection(self, other: 'AVL') -> 'AVL':
+        """
+        Return a new tree with the values in both trees. Both trees are
+        left empty. In multiset mode the smaller count is kept.
+
+        O(M log(N / M + 1)) for trees of sizes M <= N.
+        """
+        return self._combine(other, self._intersection)
+
+    def difference(self, other: 'AVL') -> 'AVL':
+        """
+        Return a new tree with the values in this tree but not in other.
+        Both trees are left empty. In multiset mode the counts in other are
+        subtracted.
+
+        O(M log(N / M + 1)) for trees of sizes M <= N.
+        """
+        return self._combine(other, self._difference)
+
+    def make_empty(self) -> None:
+        """
+                Removes all the nodes from the tree.
+
+                O(1) runtime complexity.
+
+                Returns:
+                - None
+                """
+        self._set_root(None)
+        self._min_value = self._max_value = None
+
+    def height(self) -> int:
+        """
+        Return the height of the tree, -1 for an empty tree.
+
+        O(1) runtime complexity: read from the root node.
+
+        Returns:
+        - int: The height of the tree.
+        """
+        return self._height(self._root)
+
+    def cursor(self, value: object = None) -> 'Cursor':
+        """
+        Return a cursor positioned at the smallest value greater than or
+        equal to value (the smallest value in the tree if value is None).
+
+        Parameters:
+        - value: Where to start, or None for the beginning.
+
+        Returns:
+        - Cursor: The new cursor.
+        """
+        cursor = Cursor(self)
+        cursor.seek(value)
+        return cursor
+
+    def symmetric_difference(self, other: 'AVL') -> 'AVL':
+        """
+        Return a new tree with the values in exactly one of the trees.
+        Both trees are left empty. In multiset mode the difference of the
+        counts is kept.
+
+        O(M log(N / M + 1)) for trees of sizes M <= N.
+        """
+        return self._combine(other, self._symmetric_difference)
+
+
+class Cursor:
+    """
+    Position in an AVL tree that steps to the next or previous value by
+    following child and parent pointers, with no stack of its own. Each
+    step is amortized O(1).
+
+    If the tree is modified between steps, the next step finds its place
+    again by value with one O(log N) descent, so a long scan can be resumed
+    after interleaved adds and removes. The cursor keeps its own copy of
+    the value at its position for this, since removing that value can
+    move another value into its node (see BST._copy_entry()).
+    """
+
+    def __init__(self, tree: AVL) -> None:
+        """
+        Initialize a cursor on tree with no position. Use AVL.cursor().
+        """
+        self._tree = tree
+        self._node = None
+        self._value = None
+        self._version = tree._version
+
+    @property
+    def value(self) -> object:
+        """
+        The value at the cursor, or None if the cursor has no position.
+        """
+        return self._value
+
+    def seek(self, value: object = None) -> object:
+        """
+        Move to the smallest value greater than or equal to value (the
+        smallest value in the tree if value is None).
+
+        Parameters:
+        - value: The value to move to.
+
+        Returns:
+        - object: The value at the new position, or None if there is none.
+        """
+        self._node = self._descend(value, True, True)
+        self._value = None if self._node is None else self._node.value
+        self._version = self._tree._version
+        return self._value
+
+    def _descend(self, value: object, forward: bool, inclusive: bool) -> AVLNode:
+        """
+        Helper method that finds, with one descent from the root, the first
+        node after value (forward) or the last node before value (not
+        forward). A value of None matches every node.
+
+        Parameters:
+        - value: The value to search from, or None.
+        - forward: Search for a larger value instead of a smaller one.
+        - inclusive: Whether a node equal to value counts.
+
+        Returns:
+        - AVLNode: The node found, or None.
+        """
+        best = None
+        node = self._tree._root
+        while node is not None:
+            if forward:
+                if value is None or value < node.value or (inclusive and not node.value < value):
+                    best = node
+                    node = node.left
+                else:
+                    node = node.right
+            else:
+                if value is None or node.value < value or (inclusive and not value < node.value):
+                    best = node
+                    node = node.right
+                else:
+                    node = node.left
+        return best
+
+    def _step(self, forward: bool) -> object:
+        """
+        Helper method for next() and prev().
+        """
+        node = self._node
+        if self._version != self._tree._version:
+            # The tree changed since the last step: find the position again
+            # from the value the cursor was on, which may no longer be in
+            # the tree (or in its old node).
+            node = self._descend(None if node is None else self._value, forward, False)
+            if node is None:
+                # Nothing beyond; the old node may be stale, so the next
+                # step descends again.
+                return None
+            self._version = self._tree._version
+        elif node is None:
+            return None
+        elif forward:
+            if node.right is not None:
+                # Leftmost node of the right subtree.
+                node = node.right
+                while node.left is not None:
+                    node = node.left
+            else:
+                # Climb until we arrive from a left child.
+                while node.parent is not None and node.parent.right is node:
+                    node = node.parent
+                node = node.parent
+        else:
+            if node.left is not None:
+                # Rightmost node of the left subtree.
+                node = node.left
+                while node.right is not None:
+                    node = node.right
+            else:
+                # Climb until we arrive from a right child.
+                while node.parent is not None and node.parent.left is node:
+                    node = node.parent
+                node = node.parent
+
+        if node is None:
+            # At the end; stay on the last value.
+            return None
+        self._node = node
+        self._value = node.value
+        return node.value
+
+    def next(self) -> object:
+        """
+        Move to the next larger value.
+
+        Returns:
+        - object: The new value, or None (without moving) at the end.
+        """
+        return self._step(True)
+
+    def prev(self) -> object:
+        """
+        Move to the next smaller value.
+
+        Returns:
+        - object: The new value, or None (without moving) at the beginning.
+        """
+        return self._step(False)
+
 
 # ------------------- BASIC TESTING -----------------------------------------
 
 
 if __name__ == '__main__':
 
+    # imported here since rbtree imports this module
+    from rbtree import RedBlackTree
+
+    def added(values) -> AVL:
+        """
+        Return an AVL tree built with one add() per value, so that the
+        examples go through add() and its rotations; AVL(values) would
+        bulk-build the tree instead.
+        """
+        tree = AVL()
+        for value in values:
+            tree.add(value)
+        return tree
+
     print("\nPDF - method add() example 1")
     print("----------------------------")
     test_cases = (
@@ -331,7 +1039,7 @@ if __name__ == '__main__':
         (3, 1, 2),  # LR
     )
     for case in test_cases:
-        tree = AVL(case)
+        tree = added(case)
         print(tree)
 
     print("\nPDF - method add() example 2")
@@ -350,7 +1058,7 @@ if __name__ == '__main__':
         (1, 1, 1, 1),
     )
     for case in test_cases:
-        tree = AVL(case)
+        tree = added(case)
         print('INPUT  :', case)
         print('RESULT :', tree)
 
@@ -377,7 +1085,7 @@ if __name__ == '__main__':
         ((50, 40, 60, 30, 70, 20, 80, 45), 30),  # no AVL rotation
     )
     for case, del_value in test_cases:
-        tree = AVL(case)
+        tree = added(case)
         print('INPUT  :', tree, "DEL:", del_value)
         tree.remove(del_value)
         print('RESULT :', tree)
@@ -391,7 +1099,7 @@ if __name__ == '__main__':
         ((50, 40, 60, 30, 70, 20, 80, 25), 40),  # LR
     )
     for case, del_value in test_cases:
-        tree = AVL(case)
+        tree = added(case)
         print('INPUT  :', tree, "DEL:", del_value)
         tree.remove(del_value)
         print('RESULT :', tree)
@@ -399,7 +1107,7 @@ if __name__ == '__main__':
     print("\nPDF - method remove() example 3")
     print("-------------------------------")
     case = range(-9, 16, 2)
-    tree = AVL(case)
+    tree = added(case)
     for del_value in case:
         print('INPUT  :', tree, del_value)
         tree.remove(del_value)
@@ -408,7 +1116,7 @@ if __name__ == '__main__':
     print("\nPDF - method remove() example 4")
     print("-------------------------------")
     case = range(0, 34, 3)
-    tree = AVL(case)
+    tree = added(case)
     for _ in case[:-2]:
         root_value = tree.get_root().value
         print('INPUT  :', tree, root_value)
@@ -494,4 +1202,365 @@ if __name__ == '__main__':
     tree = AVL()
     print("Tree before make_empty():", tree)
     tree.make_empty()
-    print("Tree after make_empty(): ", tree)
\ No newline at end of file
+    print("Tree after make_empty(): ", tree)
+    print("\ncursor() example 1: removing the cursor's own value")
+    print("---------------------------------------------------")
+    for cls in (AVL, RedBlackTree):
+        tree = cls(range(0, 100, 2))
+        cursor = tree.cursor(50)
+        tree.remove(50)
+        if (cursor.value, cursor.next(), cursor.prev()) != (50, 52, 48):
+            raise Exception("PROBLEM WITH CURSOR AFTER REMOVE")
+        cursor = tree.cursor(98)
+        tree.remove(98)
+        if (cursor.next(), cursor.prev()) != (None, 96):
+            raise Exception("PROBLEM WITH CURSOR AT THE END AFTER REMOVE")
+    print('cursor remove test finished')
+
+    # ------------------- CHECKS OF THE EXTENDED API ------------------------
+
+    def traversal_list(tree) -> list:
+        """
+        Return the values of inorder_traversal() as a list.
+        """
+        queue = tree.inorder_traversal()
+        values = []
+        while not queue.is_empty():
+            values.append(queue.dequeue())
+        return values
+
+    print("\nBST - degenerate tree example 1: no recursion limit")
+    print("---------------------------------------------------")
+    tree = BST()
+    for value in range(5000):
+        tree.add(value)
+    if not all(tree.contains(value) for value in range(0, 5000, 7)) or tree.contains(5000):
+        raise Exception("PROBLEM WITH CONTAINS ON A DEGENERATE TREE")
+    if traversal_list(tree) != list(range(5000)) or not tree.is_valid_bst():
+        raise Exception("PROBLEM WITH INORDER TRAVERSAL OF A DEGENERATE TREE")
+    print('degenerate tree test finished')
+
+    def is_balanced(node) -> bool:
+        """
+        Return True if every node below node has the right height and a
+        balance factor of -1, 0 or 1. Unlike is_valid_avl() this does not
+        look at parent pointers.
+        """
+        if node is None:
+            return True
+        left = node.left.height if node.left else -1
+        right = node.right.height if node.right else -1
+        return node.height == 1 + max(left, right) and abs(left - right) <= 1 and \
+            is_balanced(node.left) and is_balanced(node.right)
+
+    print("\nmethod add()/remove() example 1: results against a set")
+    print("------------------------------------------------------")
+    for _ in range(50):
+        tree = AVL()
+        expected = set()
+        for _ in range(1000):
+            value = random.randrange(300)
+            if random.random() < 0.6:
+                if tree.add(value) != (value not in expected):
+                    raise Exception("PROBLEM WITH ADD RESULT")
+                expected.add(value)
+            else:
+                if tree.remove(value) != (value in expected):
+                    raise Exception("PROBLEM WITH REMOVE RESULT")
+                expected.discard(value)
+        if not is_balanced(tree.get_root()):
+            raise Exception("PROBLEM WITH AVL BALANCE")
+        if traversal_list(tree) != sorted(expected):
+            raise Exception("PROBLEM WITH AVL CONTENTS")
+    print('add/remove result test finished')
+
+    print("\nbulk build example 1: from_sorted() and sorted input")
+    print("----------------------------------------------------")
+    for size in (0, 1, 2, 3, 100, 1023, 1024):
+        values = sorted(random.sample(range(10 * size + 1), size))
+        for tree in (AVL(values), AVL.from_sorted(values), AVL(values[::-1]),
+                     AVL(sorted(values + values))):
+            if traversal_list(tree) != values:
+                raise Exception("PROBLEM WITH AVL BULK BUILD")
+            root = tree.get_root()
+            if not is_balanced(root) or (root.height if root else -1) != size.bit_length() - 1:
+                raise Exception("PROBLEM: BULK-BUILT AVL TREE IS NOT OF MINIMAL HEIGHT")
+        for tree in (BST(values), BST.from_sorted(values), BST(random.sample(values, size))):
+            if traversal_list(tree) != values or not tree.is_valid_bst():
+                raise Exception("PROBLEM WITH BST BULK BUILD")
+            if tree.height() != size.bit_length() - 1:
+                raise Exception("PROBLEM: BULK-BUILT BST IS NOT OF MINIMAL HEIGHT")
+    print('bulk build test finished')
+
+    print("\niterator example 1: __iter__()/__reversed__() against sorted()")
+    print("---------------------------------------------------------------")
+    for cls in (BST, AVL):
+        for _ in range(20):
+            values = random.sample(range(1000), random.randrange(300))
+            tree = cls(values)
+            if list(tree) != sorted(values) or list(reversed(tree)) != sorted(values, reverse=True):
+                raise Exception("PROBLEM WITH ITERATION", cls.__name__)
+            if list(tree) != traversal_list(tree):
+                raise Exception("PROBLEM: ITERATION AND TRAVERSAL DISAGREE", cls.__name__)
+    print('iterator test finished')
+
+    from bisect import bisect_right
+
+    print("\nmethod irange() example 1: against bisect")
+    print("-----------------------------------------")
+    for cls in (BST, AVL):
+        for _ in range(20):
+            values = sorted(random.sample(range(1000), 300))
+            tree = cls(random.sample(values, len(values)))
+            for _ in range(100):
+                lo, hi = sorted(random.randrange(-10, 1010) for _ in range(2))
+                if list(tree.irange(lo, hi)) != values[bisect_left(values, lo):bisect_left(values, hi)]:
+                    raise Exception("PROBLEM WITH IRANGE", cls.__name__)
+                if list(tree.irange(lo, hi, (False, True), reverse=True)) != \
+                        values[bisect_right(values, lo):bisect_right(values, hi)][::-1]:
+                    raise Exception("PROBLEM WITH REVERSED IRANGE", cls.__name__)
+                if list(tree.irange(hi=lo)) != values[:bisect_left(values, lo)] or \
+                        list(tree.irange(lo)) != values[bisect_left(values, lo):]:
+                    raise Exception("PROBLEM WITH OPEN-ENDED IRANGE", cls.__name__)
+    print('irange test finished')
+
+    print("\nmethods rank()/select() example 1: sizes kept through add()/remove()")
+    print("--------------------------------------------------------------------")
+    for cls in (BST, AVL):
+        for _ in range(20):
+            tree = cls()
+            expected = set()
+            for _ in range(600):
+                value = random.randrange(300)
+                # BST keeps duplicates, so only new values are added
+                if random.random() < 0.6 and value not in expected:
+                    tree.add(value)
+                    expected.add(value)
+                elif random.random() < 0.5:
+                    tree.remove(value)
+                    expected.discard(value)
+            values = sorted(expected)
+            if len(tree) != len(values):
+                raise Exception("PROBLEM WITH LEN", cls.__name__)
+            for index, value in enumerate(values):
+                if tree.select(index) != value or tree.rank(value) != index or tree[index] != value:
+                    raise Exception("PROBLEM WITH RANK OR SELECT", cls.__name__)
+            value = random.randrange(-10, 310)
+            if tree.rank(value) != bisect_left(values, value):
+                raise Exception("PROBLEM WITH RANK OF A MISSING VALUE", cls.__name__)
+    print('rank/select test finished')
+
+    print("\n__slots__ example 1: nodes carry no __dict__")
+    print("--------------------------------------------")
+    for tree in (BST([1, 2, 3]), AVL([1, 2, 3])):
+        if hasattr(tree.get_root(), '__dict__'):
+            raise Exception("PROBLEM WITH NODE __slots__", type(tree).__name__)
+    print('__slots__ test finished')
+
+    print("\nbatch example 1: add_many()/remove_many()/contains_many()")
+    print("---------------------------------------------------------")
+    # small batches go one value at a time, large ones rebuild the tree;
+    # BST keeps duplicates, so the values added are all new
+    for batch_size in (5, 50, 5000):
+        for cls in (BST, AVL):
+            tree = cls(range(0, 20000, 2))
+            expected = set(range(0, 20000, 2))
+            batch = random.sample(range(1, 20000, 2), batch_size)
+            if tree.add_many(batch) != batch_size:
+                raise Exception("PROBLEM WITH ADD_MANY RESULT", cls.__name__)
+            expected |= set(batch)
+            batch = [random.randrange(20000) for _ in range(batch_size)]
+            if tree.contains_many(batch) != [value in expected for value in batch]:
+                raise Exception("PROBLEM WITH CONTAINS_MANY", cls.__name__)
+            if tree.remove_many(batch) != len(set(batch) & expected):
+                raise Exception("PROBLEM WITH REMOVE_MANY RESULT", cls.__name__)
+            expected -= set(batch)
+            if list(tree) != sorted(expected) or len(tree) != len(expected):
+                raise Exception("PROBLEM WITH BATCH CONTENTS", cls.__name__)
+            if cls is AVL and not is_balanced(tree.get_root()):
+                raise Exception("PROBLEM WITH BATCH BALANCE")
+    print('batch test finished')
+
+    print("\nbatch example 2: small batches in one shared descent")
+    print("----------------------------------------------------")
+    for multiset in (False, True):
+        for _ in range(50):
+            values = [random.randrange(2000) for _ in range(1000)]
+            tree = AVL(values, multiset)
+            expected = sorted(values if multiset else set(values))
+            start = random.randrange(2000)
+            for batch in ([random.randrange(2000) for _ in range(random.randrange(1, 60))],
+                          list(range(start, start + random.randrange(1, 60)))):
+                if random.random() < 0.5:
+                    added = tree.add_many(batch)
+                    before = len(expected)
+                    expected = sorted(expected + batch if multiset else set(expected) | set(batch))
+                    if added != len(expected) - before:
+                        raise Exception("PROBLEM WITH SHARED-DESCENT ADD_MANY RESULT")
+                else:
+                    removed = tree.remove_many(batch)
+                    before = len(expected)
+                    for value in batch:
+                        if value in expected:
+                            expected.remove(value)
+                    if removed != before - len(expected):
+                        raise Exception("PROBLEM WITH SHARED-DESCENT REMOVE_MANY RESULT")
+                if list(tree) != expected or not tree.is_valid_avl() or \
+                        not is_balanced(tree.get_root()):
+                    raise Exception("PROBLEM WITH SHARED-DESCENT BATCH", multiset)
+                if [tree.select(i) for i in range(0, len(tree), 37)] != expected[::37] or \
+                        (expected and (tree.find_min(), tree.find_max()) != (expected[0], expected[-1])):
+                    raise Exception("PROBLEM WITH SIZES OR EXTREMES AFTER A BATCH", multiset)
+    print('shared-descent batch test finished')
+
+    print("\nsplit()/join() and set operations example 1")
+    print("--------------------------------------------")
+    for _ in range(20):
+        first = set(random.randrange(500) for _ in range(200))
+        second = set(random.randrange(500) for _ in range(200))
+        key = random.randrange(500)
+        left, right = AVL(first).split(key)
+        if list(left) != sorted(v for v in first if v < key) or \
+                list(right) != sorted(v for v in first if v >= key):
+            raise Exception("PROBLEM WITH SPLIT")
+        joined = AVL.join(left, 1000, AVL(range(1001, 1100)))
+        if list(joined) != sorted(v for v in first if v < key) + list(range(1000, 1100)) or \
+                not is_balanced(joined.get_root()):
+            raise Exception("PROBLEM WITH JOIN")
+        for name, expected in (('union', first | second), ('intersection', first & second),
+                               ('difference', first - second),
+                               ('symmetric_difference', first ^ second)):
+            result = getattr(AVL(first), name)(AVL(second))
+            if list(result) != sorted(expected) or len(result) != len(expected) or \
+                    not is_balanced(result.get_root()):
+                raise Exception("PROBLEM WITH " + name.upper())
+    print('split/join/set operations test finished')
+
+    print("\nmethods floor()/ceiling()/lower()/higher()/nearest() example 1")
+    print("--------------------------------------------------------------")
+    for cls in (BST, AVL):
+        for _ in range(20):
+            values = sorted(random.sample(range(1000), 200))
+            tree = cls(random.sample(values, len(values)))
+            for value in random.sample(range(-10, 1010), 200):
+                i = bisect_right(values, value)
+                floor = values[i - 1] if i else None
+                higher = values[i] if i < len(values) else None
+                i = bisect_left(values, value)
+                lower = values[i - 1] if i else None
+                ceiling = values[i] if i < len(values) else None
+                if tree.floor(value) != floor or tree.ceiling(value) != ceiling:
+                    raise Exception("PROBLEM WITH FLOOR OR CEILING", cls.__name__)
+                if tree.lower(value) != lower or tree.higher(value) != higher:
+                    raise Exception("PROBLEM WITH LOWER OR HIGHER", cls.__name__)
+                nearest = tree.nearest(value)
+                if min(abs(v - value) for v in values) != abs(nearest - value):
+                    raise Exception("PROBLEM WITH NEAREST", cls.__name__)
+        if cls().floor(1) is not None or cls().nearest(1) is not None:
+            raise Exception("PROBLEM WITH LOOKUPS IN AN EMPTY TREE", cls.__name__)
+    print('neighbour lookup test finished')
+
+    print("\ncursor() example 0: scanning in both directions")
+    print("-----------------------------------------------")
+    for _ in range(20):
+        values = sorted(random.sample(range(1000), 200))
+        tree = AVL(random.sample(values, len(values)))
+        start = random.randrange(-10, 1010)
+        i = bisect_left(values, start)
+        cursor = tree.cursor(start)
+        if cursor.value != (values[i] if i < len(values) else None):
+            raise Exception("PROBLEM WITH CURSOR SEEK")
+        forward = [cursor.value]
+        while forward[-1] is not None:
+            forward.append(cursor.next())
+        if forward[:-1] != values[i:] and i < len(values):
+            raise Exception("PROBLEM WITH CURSOR NEXT")
+        cursor = tree.cursor(values[-1])
+        backward = [cursor.value]
+        while backward[-1] is not None:
+            backward.append(cursor.prev())
+        if backward[:-1] != values[::-1]:
+            raise Exception("PROBLEM WITH CURSOR PREV")
+        if not tree.is_valid_avl():
+            raise Exception("PROBLEM WITH PARENT POINTERS")
+    print('cursor scan test finished')
+
+    print("\nmultiset mode example 1: add()/remove()/count() against a dict")
+    print("---------------------------------------------------------------")
+    for cls in (BST, AVL):
+        for _ in range(20):
+            tree = cls(multiset=True)
+            counts = {}
+            for _ in range(2000):
+                value = random.randrange(50)
+                copies = random.randrange(1, 4)
+                if random.random() < 0.6:
+                    tree.add(value, copies)
+                    counts[value] = counts.get(value, 0) + copies
+                elif tree.remove(value, min(copies, counts.get(value, 1))) != (value in counts):
+                    raise Exception("PROBLEM WITH MULTISET REMOVE RESULT", cls.__name__)
+                elif value in counts:
+                    counts[value] -= min(copies, counts[value])
+                    if not counts[value]:
+                        del counts[value]
+            expected = sorted(value for value, copies in counts.items() for _ in range(copies))
+            if list(tree) != expected or len(tree) != len(expected):
+                raise Exception("PROBLEM WITH MULTISET CONTENTS", cls.__name__)
+            if any(tree.count(value) != counts.get(value, 0) for value in range(50)):
+                raise Exception("PROBLEM WITH MULTISET COUNT", cls.__name__)
+            if [tree.select(i) for i in range(len(tree))] != expected:
+                raise Exception("PROBLEM WITH MULTISET SIZES", cls.__name__)
+            if cls is AVL and (not tree.is_valid_avl() or not is_balanced(tree.get_root())):
+                raise Exception("PROBLEM WITH MULTISET BALANCE")
+    print('multiset test finished')
+
+    print("\nfind_min()/find_max()/height()/pop_min()/pop_max() example 1")
+    print("-------------------------------------------------------------")
+    for _ in range(20):
+        values = [random.randrange(1000) for _ in range(300)]
+        tree = AVL(values)
+        expected = sorted(set(values))
+        while expected:
+            if tree.find_min() != expected[0] or tree.find_max() != expected[-1]:
+                raise Exception("PROBLEM WITH CACHED MIN OR MAX")
+            if tree.height() != tree.get_root().height:
+                raise Exception("PROBLEM WITH CACHED HEIGHT")
+            popped = tree.pop_min() if random.random() < 0.5 else tree.pop_max()
+            if popped != expected.pop(0 if popped == expected[0] else -1):
+                raise Exception("PROBLEM WITH POP_MIN OR POP_MAX")
+        if tree.pop_min() is not None or tree.find_max() is not None or tree.height() != -1:
+            raise Exception("PROBLEM WITH EMPTY TREE")
+    print('min/max/height test finished')
+
+    import pickle
+
+    print("\nclone()/pickle example 1")
+    print("------------------------")
+    for multiset in (False, True):
+        tree = AVL([random.randrange(100) for _ in range(500)], multiset=multiset)
+        for copy in (tree.clone(), pickle.loads(pickle.dumps(tree))):
+            if list(copy) != list(tree) or not copy.is_valid_avl() or \
+                    not is_balanced(copy.get_root()):
+                raise Exception("PROBLEM WITH CLONE OR PICKLE")
+            copy.add(1000)
+            if 1000 in tree:
+                raise Exception("PROBLEM: COPY SHARES NODES")
+    print('clone/pickle test finished')
+
+    print("\ncursor() example 2: scan with interleaved removes")
+    print("-------------------------------------------------")
+    for _ in range(20):
+        tree = AVL(range(200))
+        cursor = tree.cursor()
+        seen = [cursor.value]
+        while True:
+            if random.random() < 0.3:
+                tree.remove(random.choice([cursor.value, random.randrange(200)]))
+            value = cursor.next()
+            if value is None:
+                break
+            seen.append(value)
+        if seen != sorted(seen) or len(seen) != len(set(seen)) or \
+                not set(tree) <= set(seen):
+            raise Exception("PROBLEM WITH CURSOR SCAN")
+    print('cursor remove scan test finished')
@@ -0,0 +1,523 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: AVL Tree
+# Description: AVL tree stored in preallocated arrays (struct of arrays) instead of node objects
+
+
+from array import array
+from queue_and_stack import Queue
+
+
+NIL = -1    # index used for a missing child / empty tree
+
+
+class ArrayAVL:
+    """
+    AVL Tree that keeps keys, child indices and heights in parallel
+    preallocated arrays. A node is an index into those arrays and removed
+    slots are recycled through a free list, so adding and removing values
+    allocates no Python objects per node.
+
+    Keys must fit the array typecode ('q' for 64-bit integers by default,
+    'd' for floats).
+    """
+
+    def __init__(self, start_tree=None, typecode: str = 'q', capacity: int = 16) -> None:
+        """
+        Initialize a new array-backed AVL tree
+
+        Parameters:
+        - start_tree: Iterable of initial values, or None.
+        - typecode: array module typecode used for the keys.
+        - capacity: Number of node slots to preallocate.
+        """
+        capacity = max(capacity, 1)
+        self._typecode = typecode
+        self._keys = array(typecode, [0]) * capacity
+        self._left = array('q', [NIL]) * capacity
+        self._right = array('q', [NIL]) * capacity
+        self._height = array('b', [0]) * capacity
+        self._root = NIL
+        self._size = 0
+        self._free = NIL     # head of the free list, linked through _left
+        self._next = 0       # first slot that has never been used
+
+        if start_tree is not None:
+            values = sorted(start_tree)
+            unique = values[:1]
+            for value in values[1:]:
+                if unique[-1] < value:
+                    unique.append(value)
+            self._bulk_load(unique)
+
+    def __str__(self) -> str:
+        """
+        Override string method; display in pre-order
+        """
+        values = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node != NIL:
+                values.append(str(self._keys[node]))
+                stack.append(self._right[node])
+                stack.append(self._left[node])
+        return "ArrayAVL pre-order { " + ", ".join(values) + " }"
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree.
+        """
+        return self._size
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Support the 'in' operator. See contains().
+        """
+        return self.contains(value)
+
+    def __iter__(self):
+        """
+        Iterate over the values in ascending order.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        stack = []
+        node = self._root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield keys[node]
+            node = right[node]
+
+    # ------------------------------------------------------------------ #
+
+    def _grow(self) -> None:
+        """
+        Helper method to double the number of node slots (at least 16 more).
+        """
+        extra = max(len(self._keys), 16)
+        self._keys.extend(array(self._typecode, [0]) * extra)
+        self._left.extend(array('q', [NIL]) * extra)
+        self._right.extend(array('q', [NIL]) * extra)
+        self._height.extend(array('b', [0]) * extra)
+
+    def _alloc(self, value: object) -> int:
+        """
+        Helper method to take a free slot for a new leaf holding value.
+
+        Parameters:
+        - value: The key of the new node.
+
+        Returns:
+        - int: Index of the new node.
+        """
+        node = self._free
+        if node != NIL:
+            # Reuse the most recently freed slot.
+            self._free = self._left[node]
+        else:
+            node = self._next
+            if node == len(self._keys):
+                self._grow()
+            self._next += 1
+
+        self._keys[node] = value
+        self._left[node] = NIL
+        self._right[node] = NIL
+        self._height[node] = 0
+        return node
+
+    def _release(self, node: int) -> None:
+        """
+        Helper method to push a removed node's slot onto the free list.
+        """
+        self._left[node] = self._free
+        self._free = node
+
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with a perfectly
+        balanced tree built from a sorted list of distinct values.
+
+        Parameters:
+        - values: Sorted list of distinct values.
+
+        Returns:
+        - None
+        """
+        self.make_empty()
+        while len(self._keys) < len(values):
+            self._grow()
+
+        # Slots are handed out parents first, so walking them backwards
+        # sets every child's height before its parent's.
+        order = []
+        stack = [(0, len(values), NIL, False)]
+        while stack:
+            lo, hi, parent, is_right = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            node = self._alloc(values[mid])
+            order.append(node)
+            if parent == NIL:
+                self._root = node
+            elif is_right:
+                self._right[parent] = node
+            else:
+                self._left[parent] = node
+            stack.append((mid + 1, hi, node, True))
+            stack.append((lo, mid, node, False))
+
+        for node in reversed(order):
+            self._height[node] = 1 + max(self._node_height(self._left[node]),
+                                         self._node_height(self._right[node]))
+        self._size = len(values)
+
+    def _node_height(self, node: int) -> int:
+        """Helper method to get the height of a node."""
+        if node == NIL:
+            return -1
+        return self._height[node]
+
+    def _rotate_right(self, z: int) -> int:
+        """
+        Perform a right rotation.
+
+        Parameters:
+        - z: The node at which the rotation is performed.
+
+        Returns:
+        - int: The new root after rotation.
+        """
+        left, right, height = self._left, self._right, self._height
+        y = left[z]
+        left[z] = right[y]
+        right[y] = z
+        height[z] = 1 + max(self._node_height(left[z]), self._node_height(right[z]))
+        height[y] = 1 + max(self._node_height(left[y]), height[z])
+        return y
+
+    def _rotate_left(self, y: int) -> int:
+        """
+        Perform a left rotation.
+
+        Parameters:
+        - y: The node at which the rotation is performed.
+
+        Returns:
+        - int: The new root after rotation.
+        """
+        left, right, height = self._left, self._right, self._height
+        x = right[y]
+        right[y] = left[x]
+        left[x] = y
+        height[y] = 1 + max(self._node_height(left[y]), self._node_height(right[y]))
+        height[x] = 1 + max(height[y], self._node_height(right[x]))
+        return x
+
+    def _rebalance(self, node: int) -> int:
+        """
+        Update the height of a node whose subtree changed and perform the
+        rotations needed to restore the AVL property at that node.
+
+        Parameters:
+        - node: The node to rebalance.
+
+        Returns:
+        - int: The root of the subtree after rotations.
+        """
+        left, right = self._left, self._right
+        left_height = self._node_height(left[node])
+        right_height = self._node_height(right[node])
+
+        if left_height - right_height > 1:
+            child = left[node]
+            # Left Right Case
+            if self._node_height(left[child]) < self._node_height(right[child]):
+                left[node] = self._rotate_left(child)
+            # Left Left Case
+            return self._rotate_right(node)
+
+        if right_height - left_height > 1:
+            child = right[node]
+            # Right Left Case
+            if self._node_height(right[child]) < self._node_height(left[child]):
+                right[node] = self._rotate_right(child)
+            # Right Right Case
+            return self._rotate_left(node)
+
+        self._height[node] = 1 + max(left_height, right_height)
+        return node
+
+    def _retrace(self, path: list, child: int) -> None:
+        """
+        Helper method to link a changed subtree back into its parent and
+        rebalance each ancestor on the way up to the root. Stops early once
+        an ancestor keeps both its height and its place in the tree.
+
+        Parameters:
+        - path: (node, went_left) pairs from the root down to the change.
+        - child: New root of the subtree below the last node in path.
+
+        Returns:
+        - None
+        """
+        left, right, height = self._left, self._right, self._height
+        for index in range(len(path) - 1, -1, -1):
+            parent, went_left = path[index]
+            if went_left:
+                left[parent] = child
+            else:
+                right[parent] = child
+
+            old_height = height[parent]
+            child = self._rebalance(parent)
+            if child == parent and height[parent] == old_height:
+                # Nothing above this node changes.
+                return
+        self._root = child
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> bool:
+        """
+        Add a new value to the tree while maintaining the AVL property.
+
+        Parameters:
+        - value: The value to be added to the tree.
+
+        Returns:
+        - bool: True if the value was added, False if it was already present.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        node = self._root
+        while node != NIL:
+            key = keys[node]
+            if value < key:
+                path.append((node, True))
+                node = left[node]
+            elif key < value:
+                path.append((node, False))
+                node = right[node]
+            else:
+                return False
+
+        self._size += 1
+        self._retrace(path, self._alloc(value))
+        return True
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove the value from the tree.
+
+        Parameters:
+        - value: The value to be removed.
+
+        Returns:
+        - bool: True if the value is removed, False otherwise.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        node = self._root
+        while node != NIL:
+            key = keys[node]
+            if value < key:
+                path.append((node, True))
+                node = left[node]
+            elif key < value:
+                path.append((node, False))
+                node = right[node]
+            else:
+                break
+        else:
+            return False
+
+        if left[node] != NIL and right[node] != NIL:
+            # Two children: move the inorder successor's key here and
+            # remove the successor's slot instead.
+            path.append((node, False))
+            successor = right[node]
+            while left[successor] != NIL:
+                path.append((successor, True))
+                successor = left[successor]
+            keys[node] = keys[successor]
+            node = successor
+
+        child = left[node] if left[node] != NIL else right[node]
+        self._release(node)
+        self._size -= 1
+        self._retrace(path, child)
+        return True
+
+    def contains(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree, otherwise returns False.
+
+        Parameters:
+        - value: The value to check for in the tree.
+
+        Returns:
+        - bool: True if the value is in the tree, False otherwise.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        node = self._root
+        while node != NIL:
+            key = keys[node]
+            if value < key:
+                node = left[node]
+            elif key < value:
+                node = right[node]
+            else:
+                return True
+        return False
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Return a Queue with the values of the tree in ascending order.
+
+        Returns:
+        - Queue: Queue object containing values of visited nodes.
+        """
+        result_queue = Queue()
+        for value in self:
+            result_queue.enqueue(value)
+        return result_queue
+
+    def find_min(self) -> object:
+        """
+        Returns the lowest value in the tree. If the tree is empty, return None.
+        """
+        node = self._root
+        if node == NIL:
+            return None
+        while self._left[node] != NIL:
+            node = self._left[node]
+        return self._keys[node]
+
+    def find_max(self) -> object:
+        """
+        Returns the highest value in the tree. If the tree is empty, return None.
+        """
+        node = self._root
+        if node == NIL:
+            return None
+        while self._right[node] != NIL:
+            node = self._right[node]
+        return self._keys[node]
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the tree is empty, otherwise returns False.
+        """
+        return self._root == NIL
+
+    def make_empty(self) -> None:
+        """
+        Removes all the values from the tree. The slots stay allocated.
+        """
+        self._root = NIL
+        self._size = 0
+        self._free = NIL
+        self._next = 0
+
+    def is_valid_avl(self) -> bool:
+        """
+        Check ordering, heights and balance of every reachable node.
+        Troubleshooting helper, like AVL.is_valid_avl().
+        """
+        stack = [(self._root, None, None)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node == NIL:
+                continue
+            key = self._keys[node]
+            if (lo is not None and not lo < key) or (hi is not None and not key < hi):
+                return False
+            left_height = self._node_height(self._left[node])
+            right_height = self._node_height(self._right[node])
+            if self._height[node] != 1 + max(left_height, right_height):
+                return False
+            if abs(left_height - right_height) > 1:
+                return False
+            stack.append((self._left[node], lo, key))
+            stack.append((self._right[node], key, hi))
+        return True
+
+    def buffers(self) -> dict:
+        """
+        Return the whole tree as raw buffers: one memoryview per array,
+        covering the slots in use, plus the root and free list indices.
+        Pass the result to from_buffers() to rebuild the tree. The views
+        must be released before the tree grows.
+
+        Returns:
+        - dict: 'typecode', 'root', 'free', 'size', 'keys', 'left', 'right', 'height'.
+        """
+        used = self._next
+        return {
+            'typecode': self._typecode,
+            'root': self._root,
+            'free': self._free,
+            'size': self._size,
+            'keys': memoryview(self._keys)[:used],
+            'left': memoryview(self._left)[:used],
+            'right': memoryview(self._right)[:used],
+            'height': memoryview(self._height)[:used],
+        }
+
+    @classmethod
+    def from_buffers(cls, buffers: dict) -> 'ArrayAVL':
+        """
+        Rebuild a tree from the output of buffers(). The arrays are copied.
+
+        Parameters:
+        - buffers: Dict as returned by buffers().
+
+        Returns:
+        - ArrayAVL: The rebuilt tree.
+        """
+        tree = cls(typecode=buffers['typecode'])
+        tree._keys = array(buffers['typecode'], buffers['keys'].tobytes())
+        tree._left = array('q', buffers['left'].tobytes())
+        tree._right = array('q', buffers['right'].tobytes())
+        tree._height = array('b', buffers['height'].tobytes())
+        tree._root = buffers['root']
+        tree._free = buffers['free']
+        tree._size = buffers['size']
+        tree._next = len(tree._keys)
+        return tree
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+
+    print("\nArrayAVL - add()/remove() stress test")
+    print("-------------------------------------")
+    for _ in range(50):
+        tree = ArrayAVL(random.sample(range(200), 50), capacity=4)
+        expected = set(tree)
+        for _ in range(500):
+            value = random.randrange(200)
+            if random.random() < 0.6:
+                if tree.add(value) != (value not in expected):
+                    raise Exception("PROBLEM WITH ADD RESULT")
+                expected.add(value)
+            else:
+                if tree.remove(value) != (value in expected):
+                    raise Exception("PROBLEM WITH REMOVE RESULT")
+                expected.discard(value)
+        if not tree.is_valid_avl() or list(tree) != sorted(expected) or len(tree) != len(expected):
+            raise Exception("PROBLEM WITH ARRAY AVL", tree)
+        copy = ArrayAVL.from_buffers(tree.buffers())
+        if list(copy) != list(tree) or not copy.is_valid_avl():
+            raise Exception("PROBLEM WITH BUFFERS ROUND TRIP")
+    print('stress test finished')
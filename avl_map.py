@@ -0,0 +1,840 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Sorted map (key -> value) built on the AVL tree balancing code
+
+
+from operator import itemgetter
+from avl import AVLNode, AVL
+
+
+# marks a missing default argument, since None is a valid default
+_MISSING = object()
+
+
+def _entry(node: AVLNode) -> tuple:
+    """
+    Return the (key, item) pair held by a map node, or None for no node.
+    """
+    return None if node is None else (node.key, node.item)
+
+
+class AVLMapNode(AVLNode):
+    """
+    AVL node that carries a key and its associated item. The inherited
+    value slot holds the sort key, which is what the tree compares.
+    """
+
+    __slots__ = ('key', 'item')
+
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new map node whose key is its sort key and whose item
+        is None.
+        """
+        super().__init__(value)
+        self.key = value
+        self.item = None
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'AVLMap Node: {}: {}'.format(self.key, self.item)
+
+
+class AVLMap(AVL):
+    """
+    Sorted map from keys to items. Inherits from AVL
+
+    Only the keys are compared, never the items. With a key function the
+    tree is ordered by key(k), which is computed once when k is inserted
+    (or looked up) and stored in the node, instead of on every comparison.
+
+    The ordered queries (find_min(), pop_min(), floor(), irange(),
+    select(), ...) take keys and return (key, item) pairs; rank() takes a
+    key. Only cursor() and freeze() still work on sort keys.
+    """
+
+    _node_type = AVLMapNode
+
+    def __init__(self, items=None, key=None, multiset: bool = False) -> None:
+        """
+        Initialize a new AVLMap
+
+        Parameters:
+        - items: Mapping, or iterable of (key, item) pairs. When a key is
+          repeated the last item wins, as with dict.
+        - key: Function mapping a key to the value it is ordered by.
+        - multiset: Must be False; a map holds each key once. Accepted so
+          the tree classmethods can create maps like any other tree.
+        """
+        if multiset:
+            raise ValueError('AVLMap has no multiset mode')
+        self._key_func = key
+        super().__init__()
+        if items is not None:
+            self._load_items(items)
+
+    @classmethod
+    def from_sorted(cls, items, multiset: bool = False, key=None) -> 'AVLMap':
+        """
+        Build a balanced map from (key, item) pairs already in ascending
+        order of sort key, in one linear pass. When a key is repeated the
+        last item wins.
+
+        O(N) runtime complexity.
+
+        Parameters:
+        - items: Mapping, or iterable of (key, item) pairs, in order.
+        - multiset: Must be False, see __init__().
+        - key: Function mapping a key to the value it is ordered by.
+
+        Returns:
+        - AVLMap: A new map holding the pairs.
+        """
+        tree = cls(key=key, multiset=multiset)
+        entries = tree._entries(items)
+        if not cls._is_sorted([entry[0] for entry in entries]):
+            raise ValueError('from_sorted() requires keys in ascending order')
+        tree._load_entries(entries)
+        return tree
+
+    def __str__(self) -> str:
+        """
+        Override string method; display in key order
+        """
+        pairs = ['{}: {}'.format(key, item) for key, item in self.items()]
+        return "AVLMap { " + ", ".join(pairs) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def _sort_key(self, key: object) -> object:
+        """
+        Helper method that returns the value key is ordered by.
+        """
+        return key if self._key_func is None else self._key_func(key)
+
+    def _entries(self, items) -> list:
+        """
+        Helper method that returns a list of (sort key, key, item) entries.
+
+        Parameters:
+        - items: Mapping, or iterable of (key, item) pairs.
+
+        Returns:
+        - list: One entry per pair, in the same order.
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        return [(self._sort_key(key), key, item) for key, item in items]
+
+    def _load_items(self, items) -> None:
+        """
+        Helper method for __init__. The entries are sorted by sort key once
+        and bulk-built into a balanced tree.
+
+        Parameters:
+        - items: Mapping, or iterable of (key, item) pairs.
+
+        Returns:
+        - None
+        """
+        entries = self._entries(items)
+        # Stable sort, so the last of several equal keys is the last entry
+        # of its run.
+        entries.sort(key=itemgetter(0))
+        self._load_entries(entries)
+
+    def _load_entries(self, entries: list) -> None:
+        """
+        Helper method that replaces the contents of the map with entries
+        sorted by sort key, keeping the last of several equal keys. The
+        tree is bulk-built from the sort keys, then the keys and items are
+        filled in with one inorder pass.
+
+        Parameters:
+        - entries: List of (sort key, key, item), in ascending order.
+
+        Returns:
+        - None
+        """
+        unique = []
+        for entry in entries:
+            if unique and not unique[-1][0] < entry[0]:
+                unique[-1] = entry
+            else:
+                unique.append(entry)
+
+        self._set_root(self._build_balanced([entry[0] for entry in unique], 0, len(unique)))
+        for node, (_, key, item) in zip(self._iter_nodes(), unique):
+            node.key = key
+            node.item = item
+        self._refresh_extremes()
+
+    def _empty_copy(self) -> 'AVLMap':
+        """
+        Helper method that returns a new empty map with the same key function.
+        """
+        return type(self)(key=self._key_func)
+
+    def _copy_entry(self, node: AVLMapNode, source: AVLMapNode) -> None:
+        """
+        Helper method used when removal moves the successor's entry into a
+        node: the key and item move with the sort key.
+        """
+        super()._copy_entry(node, source)
+        node.key = source.key
+        node.item = source.item
+
+    def _pivot_node(self, key: object) -> AVLMapNode:
+        """
+        Helper method for join(): the pivot is a key, which is added with
+        item None, as by add().
+        """
+        node = self._new_node(self._sort_key(key), 1)
+        node.key = key
+        return node
+
+    def split(self, key: object) -> tuple:
+        """
+        Split the map into a map of the keys less than key and a map of the
+        keys greater than or equal to it. See AVL.split().
+        """
+        return super().split(self._sort_key(key))
+
+    def _prefer_rebuild(self, batch_size: int) -> bool:
+        """
+        Batches are always applied one key at a time: the rebuild path of
+        add_many()/remove_many() keeps only sort keys, not items.
+        """
+        return False
+
+    def _add_sorted_batch(self, batch: list) -> int:
+        """
+        Helper method for add_many(). Keys are added one at a time: the
+        shared descent of AVL compares and builds nodes from sort keys, and
+        would leave the keys and items of new nodes unset.
+        """
+        added = 0
+        for key in batch:
+            if self.add(key):
+                added += 1
+        return added
+
+    def _remove_sorted_batch(self, batch: list) -> int:
+        """
+        Helper method for remove_many(). Keys are removed one at a time,
+        since the batch is sorted by key, not by sort key.
+        """
+        removed = 0
+        for key in batch:
+            if self.remove(key):
+                removed += 1
+        return removed
+
+    def _find_node(self, key: object) -> AVLMapNode:
+        """
+        Helper method that returns the node holding key, or None.
+        """
+        sort_key = self._sort_key(key)
+        node = self._root
+        while node is not None:
+            if sort_key < node.value:
+                node = node.left
+            elif node.value < sort_key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def _set(self, key: object, item: object, overwrite: bool) -> AVLMapNode:
+        """
+        Helper method that inserts key with item, or finds the node already
+        holding key and (if overwrite is True) replaces its key and item.
+        One descent either way.
+
+        Parameters:
+        - key: The key.
+        - item: The item to store.
+        - overwrite: Whether an existing entry is replaced.
+
+        Returns:
+        - AVLMapNode: The node holding key.
+        """
+        sort_key = self._sort_key(key)
+        self._changed = False
+        self._entry = None
+        root = self._set_recursive(self._root, sort_key, key, item, overwrite)
+        if self._changed:
+            self._finish_add(root, sort_key)
+        entry = self._entry
+        self._entry = None
+        return entry
+
+    def _set_recursive(self, node: AVLMapNode, sort_key: object, key: object,
+                       item: object, overwrite: bool) -> AVLMapNode:
+        """
+        Helper method for _set(). Same descent and rebalancing as
+        AVL._add_recursive(), remembering the node that holds the key.
+
+        Returns:
+        - AVLMapNode: The root of the modified subtree.
+        """
+        if node is None:
+            self._changed = True
+            node = self._new_node(sort_key, 1)
+            node.key = key
+            node.item = item
+            self._entry = node
+            return node
+        elif sort_key < node.value:
+            node.left = self._set_recursive(node.left, sort_key, key, item, overwrite)
+        elif node.value < sort_key:
+            node.right = self._set_recursive(node.right, sort_key, key, item, overwrite)
+        else:
+            # Already present, update in place; the shape does not change
+            if overwrite:
+                node.key = key
+                node.item = item
+            self._entry = node
+            return node
+
+        if not self._changed:
+            return node
+
+        # Rotations move nodes, not entries, so self._entry stays valid.
+        return self._rebalance(node)
+
+    # ------------------------------------------------------------------ #
+
+    def __setitem__(self, key: object, item: object) -> None:
+        """
+        Map key to item, replacing any item already stored for key.
+
+        O(log N) runtime complexity, in a single descent.
+        """
+        self._set(key, item, True)
+
+    def __getitem__(self, key: object) -> object:
+        """
+        Return the item stored for key. Raises KeyError if key is missing.
+        """
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        return node.item
+
+    def __delitem__(self, key: object) -> None:
+        """
+        Remove key and its item. Raises KeyError if key is missing.
+        """
+        if not self.remove(key):
+            raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Iterate over the keys in order. See keys().
+        """
+        return self.keys()
+
+    def __reversed__(self):
+        """
+        Iterate over the keys in descending order.
+        """
+        return (node.key for node in self._iter_nodes(True))
+
+    def get(self, key: object, default: object = None) -> object:
+        """
+        Return the item stored for key, or default if key is missing.
+
+        Parameters:
+        - key: The key to look up.
+        - default: Returned when key is missing.
+
+        Returns:
+        - object: The item, or default.
+        """
+        node = self._find_node(key)
+        return default if node is None else node.item
+
+    def setdefault(self, key: object, default: object = None) -> object:
+        """
+        Return the item stored for key; if key is missing, first store
+        default for it. One descent either way.
+
+        Parameters:
+        - key: The key to look up.
+        - default: Item stored when key is missing.
+
+        Returns:
+        - object: The item now stored for key.
+        """
+        return self._set(key, default, False).item
+
+    def pop(self, key: object, default: object = _MISSING) -> object:
+        """
+        Remove key and return its item. If key is missing, return default,
+        or raise KeyError when no default is given.
+
+        O(log N) runtime complexity, in a single descent.
+
+        Parameters:
+        - key: The key to remove.
+        - default: Returned when key is missing.
+
+        Returns:
+        - object: The removed item, or default.
+        """
+        sort_key = self._sort_key(key)
+        self._changed = False
+        self._entry = None
+        root = self._pop_recursive(self._root, sort_key)
+        if not self._changed:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self._finish_remove(root, sort_key)
+        item = self._entry
+        self._entry = None
+        return item
+
+    def _pop_recursive(self, node: AVLMapNode, sort_key: object) -> AVLMapNode:
+        """
+        Helper method for pop(). Same descent and rebalancing as
+        AVL._remove_recursive(), keeping the removed item in self._entry
+        before the successor's entry can be copied over it.
+
+        Returns:
+        - AVLMapNode: The root of the modified subtree.
+        """
+        if node is None:
+            return None
+        if sort_key < node.value:
+            node.left = self._pop_recursive(node.left, sort_key)
+        elif node.value < sort_key:
+            node.right = self._pop_recursive(node.right, sort_key)
+        else:
+            self._changed = True
+            self._entry = node.item
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            successor = self._get_min_value_node(node.right)
+            self._copy_entry(node, successor)
+            node.right = self._remove_recursive(node.right, successor.value, successor.count)
+
+        if not self._changed:
+            return node
+        return self._rebalance(node)
+
+    def keys(self):
+        """
+        Lazily yield the keys in order.
+        """
+        return (node.key for node in self._iter_nodes())
+
+    def values(self):
+        """
+        Lazily yield the items in key order.
+        """
+        return (node.item for node in self._iter_nodes())
+
+    def items(self):
+        """
+        Lazily yield (key, item) pairs in key order.
+        """
+        return ((node.key, node.item) for node in self._iter_nodes())
+
+    # ------------------------------------------------------------------ #
+    # Ordered queries inherited from BST/AVL, taking keys and returning
+    # (key, item) pairs
+
+    def iter_inorder(self):
+        """
+        Lazily yield the keys in order. See keys().
+        """
+        return self.keys()
+
+    def iter_reversed(self):
+        """
+        Lazily yield the keys in descending order.
+        """
+        return self.__reversed__()
+
+    def find_min(self) -> tuple:
+        """
+        Return the (key, item) pair with the lowest key, or None if the
+        map is empty.
+
+        O(H) runtime complexity.
+        """
+        if self._root is None:
+            return None
+        return _entry(self._get_min_value_node(self._root))
+
+    def find_max(self) -> tuple:
+        """
+        Return the (key, item) pair with the highest key, or None if the
+        map is empty.
+
+        O(H) runtime complexity.
+        """
+        node = self._root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return _entry(node)
+
+    def pop_min(self) -> tuple:
+        """
+        Remove the lowest key and return its (key, item) pair, or None if
+        the map is empty.
+
+        O(H) runtime complexity.
+        """
+        entry = self.find_min()
+        if entry is not None:
+            # The node's sort key is removed directly, not computed again.
+            super().remove(self._min_value)
+        return entry
+
+    def pop_max(self) -> tuple:
+        """
+        Remove the highest key and return its (key, item) pair, or None if
+        the map is empty.
+
+        O(H) runtime complexity.
+        """
+        entry = self.find_max()
+        if entry is not None:
+            super().remove(self._max_value)
+        return entry
+
+    def floor(self, key: object) -> tuple:
+        """
+        Return the (key, item) pair with the largest key less than or equal
+        to key, or None. See BST.floor().
+        """
+        return _entry(self._floor_node(self._sort_key(key)))
+
+    def ceiling(self, key: object) -> tuple:
+        """
+        Return the (key, item) pair with the smallest key greater than or
+        equal to key, or None. See BST.ceiling().
+        """
+        return _entry(self._ceiling_node(self._sort_key(key)))
+
+    def lower(self, key: object) -> tuple:
+        """
+        Return the (key, item) pair with the largest key strictly less than
+        key, or None. See BST.lower().
+        """
+        return _entry(self._lower_node(self._sort_key(key)))
+
+    def higher(self, key: object) -> tuple:
+        """
+        Return the (key, item) pair with the smallest key strictly greater
+        than key, or None. See BST.higher().
+        """
+        return _entry(self._higher_node(self._sort_key(key)))
+
+    def nearest(self, key: object) -> tuple:
+        """
+        Return the (key, item) pair whose sort key is closest to that of
+        key, or None. Sort keys must support subtraction. See BST.nearest().
+        """
+        return _entry(self._nearest_node(self._sort_key(key)))
+
+    def rank(self, key: object) -> int:
+        """
+        Return the number of keys ordered before key. See BST.rank().
+        """
+        return super().rank(self._sort_key(key))
+
+    def select(self, index: int) -> tuple:
+        """
+        Return the (key, item) pair at a position in key order. Raises
+        IndexError if there is none. See BST.select().
+        """
+        return _entry(self._select_node(index))
+
+    def irange(self, lo: object = None, hi: object = None,
+               inclusive: tuple = (True, False), reverse: bool = False):
+        """
+        Lazily yield the (key, item) pairs with keys between lo and hi, in
+        key order. See BST.irange().
+
+        Parameters:
+        - lo: Lower bound key, or None for no lower bound.
+        - hi: Upper bound key, or None for no upper bound.
+        - inclusive: Pair of bools, whether lo and hi themselves are included.
+        - reverse: Yield in descending order instead.
+
+        Returns:
+        - generator: (key, item) pairs in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        if lo is not None:
+            lo = self._sort_key(lo)
+        if hi is not None:
+            hi = self._sort_key(hi)
+        if reverse:
+            nodes = self._irange_descending(lo, hi, lo_inclusive, hi_inclusive)
+        else:
+            nodes = self._irange_ascending(lo, hi, lo_inclusive, hi_inclusive)
+        return ((node.key, node.item) for node in nodes)
+
+    def dump(self, path) -> None:
+        """
+        Write the keys to a file in the tree format (see BST.dump()), in
+        ascending order of the keys themselves, so the file can also be
+        read by AVL.load() or tree_io.MappedTree. The format has no room
+        for items, so every item must be None, as when the map is used as
+        a sorted set with a key function; otherwise TypeError is raised.
+
+        O(N) runtime complexity, O(N log N) with a key function.
+
+        Parameters:
+        - path: File name or path.
+
+        Returns:
+        - None
+        """
+        if any(item is not None for item in self.values()):
+            raise TypeError('AVLMap.dump() stores keys only; every item must be None')
+        keys = list(self.keys())
+        if self._key_func is not None:
+            keys.sort()
+        from tree_io import dump_tree
+        dump_tree(self, path, keys)
+
+    @classmethod
+    def load(cls, path, key=None) -> 'AVLMap':
+        """
+        Read the keys of a tree file written by dump() (or by any set-mode
+        tree) into a new map, each with item None.
+
+        O(N) runtime complexity, O(N log N) with a key function.
+
+        Parameters:
+        - path: File name or path.
+        - key: Function mapping a key to the value it is ordered by.
+
+        Returns:
+        - AVLMap: The new map.
+        """
+        from tree_io import read_tree
+        keys, counts, _ = read_tree(path)
+        if counts is not None:
+            raise ValueError('cannot load a multiset tree file into a map')
+        return cls(((k, None) for k in keys), key=key)
+
+    def __reduce__(self) -> tuple:
+        """
+        Support pickle: the map is pickled as its (key, item) pairs in key
+        order and its key function (which must itself be picklable, so not
+        a lambda). Rebuilding re-sorts already sorted pairs, which is O(N).
+        """
+        return type(self), (list(self.items()), self._key_func)
+
+    # ------------------------------------------------------------------ #
+    # Set-style methods inherited from BST/AVL, taking keys
+
+    def add(self, key: object, n: int = 1) -> bool:
+        """
+        Add key with item None if it is not already present. Returns True
+        if the key was added.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        size = len(self)
+        self._set(key, None, False)
+        return len(self) != size
+
+    def remove(self, key: object, n: int = 1) -> bool:
+        """
+        Remove key and its item. Returns True if the key was removed.
+        """
+        return super().remove(self._sort_key(key), n)
+
+    def contains(self, key: object) -> bool:
+        """
+        Returns True if key is in the map, otherwise returns False.
+        """
+        return self._find_node(key) is not None
+
+    def count(self, key: object) -> int:
+        """
+        Return 1 if key is in the map, otherwise 0.
+        """
+        return int(self._find_node(key) is not None)
+
+    def contains_many(self, keys) -> list:
+        """
+        Check a batch of keys for membership. See BST.contains_many().
+        """
+        return super().contains_many([self._sort_key(key) for key in keys])
+
+
+# alias under the name used by other sorted-container libraries
+SortedDict = AVLMap
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+
+    print("\nAVLMap - operations against a dict")
+    print("----------------------------------")
+    for key_func in (None, abs):
+        for _ in range(20):
+            tree = AVLMap(key=key_func)
+            expected = {}
+            for _ in range(500):
+                key = random.randrange(-100, 100) if key_func else random.randrange(100)
+                sort_key = key if key_func is None else key_func(key)
+                action = random.random()
+                if action < 0.5:
+                    tree[key] = key * 10
+                    expected[sort_key] = (key, key * 10)
+                elif action < 0.8:
+                    if (key in tree) != (sort_key in expected):
+                        raise Exception("PROBLEM WITH CONTAINS")
+                    if sort_key in expected:
+                        del tree[key]
+                        del expected[sort_key]
+                elif tree.get(key) != expected.get(sort_key, (None, None))[1]:
+                    raise Exception("PROBLEM WITH GET")
+            if list(tree.items()) != [expected[k] for k in sorted(expected)]:
+                raise Exception("PROBLEM WITH AVLMAP CONTENTS", tree)
+            if not tree.is_valid_avl() or len(tree) != len(expected):
+                raise Exception("PROBLEM WITH AVLMAP BALANCE")
+    try:
+        del AVLMap()[1]
+        raise Exception("PROBLEM: DELETING A MISSING KEY DID NOT RAISE")
+    except KeyError:
+        pass
+    print('AVLMap test finished')
+
+    print("\nAVLMap - pop()/count()/split() with a key function")
+    print("--------------------------------------------------")
+    for key_func in (None, abs):
+        for _ in range(20):
+            tree = AVLMap(((k, k * 10) for k in range(-50, 50)), key=key_func)
+            expected = {(k if key_func is None else key_func(k)): (k, v) for k, v in tree.items()}
+            for _ in range(200):
+                key = random.randrange(-60, 60)
+                sort_key = key if key_func is None else key_func(key)
+                if tree.count(key) != (sort_key in expected):
+                    raise Exception("PROBLEM WITH COUNT")
+                if tree.pop(key, None) != expected.pop(sort_key, (None, None))[1]:
+                    raise Exception("PROBLEM WITH POP")
+            if list(tree.items()) != [expected[k] for k in sorted(expected)] or \
+                    not tree.is_valid_avl():
+                raise Exception("PROBLEM WITH AVLMAP AFTER POP")
+            # split() empties the map it splits
+            keys = list(tree.keys())
+            split = random.randrange(60)
+            left, right = tree.split(-split if key_func else split)
+            if list(left.keys()) + list(right.keys()) != keys or len(tree) or \
+                    any((k if key_func is None else key_func(k)) >= split for k in left):
+                raise Exception("PROBLEM WITH SPLIT")
+    try:
+        AVLMap().pop(1)
+        raise Exception("PROBLEM: POP OF A MISSING KEY DID NOT RAISE")
+    except KeyError:
+        pass
+    print('AVLMap pop/split test finished')
+
+    print("\nAVLMap - add_many()/remove_many() with a key function")
+    print("-----------------------------------------------------")
+    tree = AVLMap({k: k for k in range(0, 100, 2)}, key=lambda k: -k)
+    if tree.add_many([1, 3, 2, 5]) != 3 or tree.remove_many([4, 7, 6]) != 2:
+        raise Exception("PROBLEM WITH BATCH RESULTS")
+    if list(tree.keys()) != sorted(set(range(0, 100, 2)) - {4, 6} | {1, 3, 5}, reverse=True) or \
+            tree[2] != 2 or tree[5] is not None or not tree.is_valid_avl():
+        raise Exception("PROBLEM WITH BATCH CONTENTS", tree)
+    print('AVLMap batch test finished')
+
+    print("\nAVLMap - ordered queries return (key, item) with a key function")
+    print("----------------------------------------------------------------")
+    import bisect
+    for key_func in (None, lambda k: -k):
+        for _ in range(20):
+            keys = random.sample(range(-500, 500, 2), random.randrange(1, 60))
+            tree = AVLMap({k: str(k) for k in keys}, key=key_func)
+            # expected entries in map order
+            ordered = sorted(keys, reverse=key_func is not None)
+            entries = [(k, str(k)) for k in ordered]
+            sort_keys = [k if key_func is None else -k for k in ordered]
+            if tree.find_min() != entries[0] or tree.find_max() != entries[-1] or \
+                    [tree.select(i) for i in range(len(tree))] != entries or \
+                    list(tree.iter_reversed()) != ordered[::-1]:
+                raise Exception("PROBLEM WITH AVLMAP MIN/MAX/SELECT")
+            for key in range(-505, 505):
+                sort_key = key if key_func is None else -key
+                i = bisect.bisect_left(sort_keys, sort_key)
+                j = bisect.bisect_right(sort_keys, sort_key)
+                floor = entries[j - 1] if j else None
+                ceiling = entries[i] if i < len(entries) else None
+                lower = entries[i - 1] if i else None
+                higher = entries[j] if j < len(entries) else None
+                if (tree.floor(key), tree.ceiling(key), tree.lower(key), tree.higher(key)) != \
+                        (floor, ceiling, lower, higher) or tree.rank(key) != i:
+                    raise Exception("PROBLEM WITH AVLMAP FLOOR/CEILING", key)
+                if tree.nearest(key) not in (floor, ceiling):
+                    raise Exception("PROBLEM WITH AVLMAP NEAREST", key)
+            lo, hi = sorted(random.sample(range(-500, 500), 2), reverse=key_func is not None)
+            lo_sort, hi_sort = (lo, hi) if key_func is None else (-lo, -hi)
+            expected = [entry for entry, s in zip(entries, sort_keys) if lo_sort <= s <= hi_sort]
+            if list(tree.irange(lo, hi, (True, True))) != expected or \
+                    list(tree.irange(lo, hi, (True, True), reverse=True)) != expected[::-1]:
+                raise Exception("PROBLEM WITH AVLMAP IRANGE")
+            # pop_min()/pop_max() remove the entries they return
+            low, high = tree.pop_min(), tree.pop_max() if len(tree) > 1 else None
+            remaining = ordered[1:-1] if high is not None else ordered[1:]
+            if low != entries[0] or (high is not None and high != entries[-1]) or \
+                    list(tree.keys()) != remaining or not tree.is_valid_avl():
+                raise Exception("PROBLEM WITH AVLMAP POP_MIN/POP_MAX", key_func)
+    empty = AVLMap(key=lambda k: -k)
+    if empty.pop_min() is not None or empty.find_max() is not None or empty.floor(1) is not None:
+        raise Exception("PROBLEM WITH EMPTY AVLMAP QUERIES")
+    print('AVLMap ordered query test finished')
+
+    print("\nAVLMap - from_sorted(), dump() and load() round trip")
+    print("----------------------------------------------------")
+    import os
+    import tempfile
+    tree = AVLMap.from_sorted([(k, k * k) for k in range(100, 0, -3)], key=lambda k: -k)
+    if list(tree.items()) != [(k, k * k) for k in range(100, 0, -3)] or not tree.is_valid_avl():
+        raise Exception("PROBLEM WITH AVLMAP FROM_SORTED")
+    for bad in (lambda: AVLMap.from_sorted([(1, 1), (0, 0)]),
+                lambda: AVLMap.from_sorted([], multiset=True)):
+        try:
+            bad()
+            raise Exception("PROBLEM: BAD FROM_SORTED DID NOT RAISE")
+        except ValueError:
+            pass
+    path = os.path.join(tempfile.mkdtemp(), 'map.bst')
+    try:
+        tree.dump(path)
+        raise Exception("PROBLEM: DUMP OF A MAP WITH ITEMS DID NOT RAISE")
+    except TypeError:
+        pass
+    for key_func in (None, lambda k: -k):
+        keys = random.sample(range(10 ** 6), 1000)
+        tree = AVLMap(((k, None) for k in keys), key=key_func)
+        tree.dump(path)
+        loaded = AVLMap.load(path, key=key_func)
+        if list(loaded.keys()) != list(tree.keys()) or not loaded.is_valid_avl() or \
+                set(loaded.values()) != {None} or list(AVL.load(path)) != sorted(keys):
+            raise Exception("PROBLEM WITH AVLMAP DUMP/LOAD ROUND TRIP")
+    os.remove(path)
+    print('AVLMap round trip test finished')
@@ -0,0 +1,764 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Timing benchmarks for the BST and AVL tree classes
+
+
+import argparse
+import gc
+import json
+import platform
+import random
+from bisect import bisect_left, insort
+from itertools import accumulate, repeat
+import sys
+import threading
+import time
+import tracemalloc
+from queue_and_stack import Queue
+from bst import BSTNode, BST
+from avl import AVL
+from rbtree import RedBlackTree
+from btree import BPlusTree
+from splay import SplayTree
+from concurrent_avl import ConcurrentAVL
+
+
+class RecursiveBST(BST):
+    """
+    BST that keeps the original one-call-per-level add/contains/traversal.
+    Used only as the baseline the loop-based BST is measured against.
+    """
+
+    def add(self, value: object) -> None:
+        """
+        Add a value by recursing once per level of the tree.
+        """
+        if self._root is None:
+            self._root = BSTNode(value)
+        else:
+            self._add_recursive(self._root, value)
+
+    def _add_recursive(self, node: BSTNode, value: object) -> BSTNode:
+        """
+        Helper method for recursive addition of a value to the BST.
+        """
+        if node is None:
+            return BSTNode(value)
+        elif value < node.value:
+            node.left = self._add_recursive(node.left, value)
+        else:
+            node.right = self._add_recursive(node.right, value)
+        return node
+
+    def contains(self, value: object) -> bool:
+        """
+        Search for a value by recursing once per level of the tree.
+        """
+        return self._contains_recursive(self._root, value)
+
+    def _contains_recursive(self, node: BSTNode, value: object) -> bool:
+        """
+        Helper method for recursive search in the tree.
+        """
+        if node is None:
+            return False
+        elif node.value == value:
+            return True
+        elif value < node.value:
+            return self._contains_recursive(node.left, value)
+        else:
+            return self._contains_recursive(node.right, value)
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Traverse the tree by recursing once per level of the tree.
+        """
+        result_queue = Queue()
+        self._inorder_traversal_recursive(self._root, result_queue)
+        return result_queue
+
+    def _inorder_traversal_recursive(self, node: BSTNode, result_queue: Queue) -> None:
+        """
+        Helper method for recursive inorder traversal.
+        """
+        if node is not None:
+            self._inorder_traversal_recursive(node.left, result_queue)
+            result_queue.enqueue(node.value)
+            self._inorder_traversal_recursive(node.right, result_queue)
+
+
+class DictBSTNode:
+    """
+    BST node with a per-instance __dict__, the layout BSTNode had before
+    it used __slots__. Used only as the memory baseline.
+    """
+
+    def __init__(self, value: object) -> None:
+        self.value = value
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.count = 1
+
+
+class DictAVLNode(DictBSTNode):
+    """
+    AVL node with a per-instance __dict__. Used only as the memory baseline.
+    """
+
+    def __init__(self, value: object) -> None:
+        super().__init__(value)
+        self.parent = None
+        self.height = 0
+
+
+class DictBST(BST):
+    """
+    BST built from DictBSTNode nodes.
+    """
+    _node_type = DictBSTNode
+
+
+class DictAVL(AVL):
+    """
+    AVL built from DictAVLNode nodes.
+    """
+    _node_type = DictAVLNode
+
+
+def bytes_per_node(tree_class, values: list) -> float:
+    """
+    Build a tree from values (one add at a time, so each node is a separate
+    allocation) and return the traced bytes allocated per node. The keys
+    are created before tracing starts, so only the nodes are counted.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = tree_class()
+    for value in values:
+        tree.add(value)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(values)
+
+
+def bench_node_memory() -> None:
+    """
+    Compare the memory per node of the slotted node classes against the
+    same nodes with a per-instance __dict__.
+    """
+    random.seed(261)
+    values = random.sample(range(10_000_000), 100_000)
+    print('bytes per node, 100000 random keys')
+    print('  {:<6} {:>10} {:>10} {:>9}'.format('tree', '__dict__', '__slots__', 'saving'))
+    for name, before_class, after_class in (('BST', DictBST, BST), ('AVL', DictAVL, AVL)):
+        before = bytes_per_node(before_class, values)
+        after = bytes_per_node(after_class, values)
+        print('  {:<6} {:>10.1f} {:>10.1f} {:>8.0%}'.format(
+            name, before, after, 1 - after / before))
+
+
+def time_per_op(func, values) -> float:
+    """
+    Call func once for every value and return the mean time per call
+    in microseconds.
+    """
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return (time.perf_counter() - start) / max(len(values), 1) * 1e6
+
+
+def bench_operations(tree_class, values: list) -> dict:
+    """
+    Measure add, contains and inorder_traversal on a fresh tree built from
+    values. Returns microseconds per operation, keyed by operation name.
+    A RecursionError is reported as None instead of a timing.
+    """
+    results = {}
+    tree = tree_class()
+    try:
+        results['add'] = time_per_op(tree.add, values)
+        probes = random.sample(values, len(values))
+        results['contains'] = time_per_op(tree.contains, probes)
+        start = time.perf_counter()
+        tree.inorder_traversal()
+        results['traversal'] = (time.perf_counter() - start) / len(values) * 1e6
+    except RecursionError:
+        for name in ('add', 'contains', 'traversal'):
+            results.setdefault(name, None)
+    return results
+
+
+def nearly_sorted(n: int, swaps: int) -> list:
+    """
+    Return range(n) as a list with a few random adjacent swaps, which is
+    the worst case for an unbalanced BST.
+    """
+    values = list(range(n))
+    for _ in range(swaps):
+        i = random.randrange(n - 1)
+        values[i], values[i + 1] = values[i + 1], values[i]
+    return values
+
+
+def report(title: str, baseline: dict, current: dict) -> None:
+    """
+    Print a before/after table for one workload.
+    """
+    print(title)
+    print('  {:<10} {:>14} {:>14} {:>9}'.format('op', 'recursive us', 'loop us', 'speedup'))
+    for name in ('add', 'contains', 'traversal'):
+        before, after = baseline[name], current[name]
+        before_text = 'RecursionError' if before is None else '{:.3f}'.format(before)
+        speedup = '-' if before is None else '{:.2f}x'.format(before / after)
+        print('  {:<10} {:>14} {:>14.3f} {:>9}'.format(name, before_text, after, speedup))
+
+
+def bench_iterative_bst() -> None:
+    """
+    Compare the loop-based BST against the recursive baseline on random
+    keys and on nearly sorted keys.
+    """
+    random.seed(261)
+    values = random.sample(range(1_000_000), 20_000)
+    report('BST, 20000 random keys', bench_operations(RecursiveBST, values),
+           bench_operations(BST, values))
+
+    values = nearly_sorted(3_000, 50)
+    report('BST, 3000 nearly sorted keys', bench_operations(RecursiveBST, values),
+           bench_operations(BST, values))
+
+
+def bench_frozen_lookups() -> None:
+    """
+    Compare one contains() call per key on an AVL tree against a single
+    contains_many() call on its frozen snapshot, for a million probes.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        print('frozen lookups: NumPy not installed, skipped')
+        return
+
+    random.seed(261)
+    tree = AVL(random.sample(range(10_000_000), 1_000_000))
+    probes = np.random.default_rng(261).integers(0, 10_000_000, 1_000_000)
+    probe_list = probes.tolist()
+
+    start = time.perf_counter()
+    expected = [tree.contains(value) for value in probe_list]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frozen = tree.freeze()
+    freeze_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = frozen.contains_many(probes)
+    batch_time = time.perf_counter() - start
+
+    assert found.tolist() == expected
+    print('1000000 probes against 1000000 keys')
+    print('  AVL.contains loop      {:8.3f} s'.format(loop_time))
+    print('  freeze()               {:8.3f} s'.format(freeze_time))
+    print('  contains_many          {:8.3f} s  ({:.1f}x)'.format(batch_time, loop_time / batch_time))
+
+
+def churn_workloads(tree_class, keys: list, window: int) -> dict:
+    """
+    Time three workloads on tree_class, in seconds: adding every key to
+    an empty tree, removing them all again in random order, and a sliding
+    window where each new key expires the one added window steps earlier.
+    """
+    results = {}
+    tree = tree_class()
+    start = time.perf_counter()
+    for key in keys:
+        tree.add(key)
+    results['insert'] = time.perf_counter() - start
+
+    order = random.sample(keys, len(keys))
+    start = time.perf_counter()
+    for key in order:
+        tree.remove(key)
+    results['delete'] = time.perf_counter() - start
+
+    tree = tree_class(keys[:window])
+    start = time.perf_counter()
+    for i in range(window, len(keys)):
+        tree.add(keys[i])
+        tree.remove(keys[i - window])
+    results['mixed'] = time.perf_counter() - start
+    return results
+
+
+def bench_red_black() -> None:
+    """
+    Compare the AVL tree against the red-black tree on insert-heavy,
+    delete-heavy and mixed (expiry) workloads.
+    """
+    random.seed(261)
+    keys = random.sample(range(10_000_000), 200_000)
+    avl = churn_workloads(AVL, keys, 50_000)
+    red_black = churn_workloads(RedBlackTree, keys, 50_000)
+    print('AVL vs red-black, 200000 random keys (window of 50000 for mixed)')
+    print('  {:<8} {:>8} {:>10} {:>9}'.format('workload', 'AVL s', 'RB s', 'speedup'))
+    for name in ('insert', 'delete', 'mixed'):
+        print('  {:<8} {:>8.3f} {:>10.3f} {:>8.2f}x'.format(
+            name, avl[name], red_black[name], avl[name] / red_black[name]))
+
+
+def bench_btree(n: int = 1_000_000, fanout: int = 64) -> None:
+    """
+    Compare the B+ tree against AVL on n random keys: traced memory per
+    key for the built tree, and time per contains() for 200000 probes.
+    Pass a larger n (10 million and up) to see the gap widen, given the
+    memory for the AVL side.
+    """
+    random.seed(261)
+    keys = random.sample(range(n * 10), n)
+    probes = random.sample(keys, min(n, 200_000))
+    print('AVL vs B+ tree (fanout {}), {} random keys'.format(fanout, n))
+    print('  {:<6} {:>14} {:>14}'.format('tree', 'bytes per key', 'contains us'))
+    for name, build in (('AVL', lambda: AVL(keys)),
+                        ('B+', lambda: BPlusTree(keys, fanout=fanout))):
+        tracemalloc.start()
+        tree = build()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        lookup = time_per_op(tree.contains, probes)
+        print('  {:<6} {:>14.1f} {:>14.3f}'.format(name, memory / n, lookup))
+        del tree
+
+
+def zipf_trace(keys: list, length: int, s: float = 1.1) -> list:
+    """
+    Return length keys drawn with Zipf frequencies: the i-th most popular
+    key (in a random order of keys) is drawn with weight 1 / i**s.
+    """
+    popular = random.sample(keys, len(keys))
+    weights = accumulate(1 / rank ** s for rank in range(1, len(keys) + 1))
+    return random.choices(popular, cum_weights=list(weights), k=length)
+
+
+def bench_splay() -> None:
+    """
+    Compare contains() on AVL and on the splay tree for uniform, Zipf and
+    sequential access traces over the same keys. The splay tree is slower
+    on all three (see SplayTree); this records by how much.
+    """
+    random.seed(261)
+    keys = random.sample(range(10_000_000), 100_000)
+    ordered = sorted(keys)
+    traces = (('uniform', random.choices(keys, k=300_000)),
+              ('zipf', zipf_trace(keys, 300_000)),
+              ('sequential', ordered * 3))
+    print('AVL vs splay tree, contains() on 100000 keys, 300000 lookups')
+    print('  {:<10} {:>8} {:>10} {:>9}'.format('trace', 'AVL us', 'splay us', 'speedup'))
+    for name, trace in traces:
+        avl = time_per_op(AVL(keys).contains, trace)
+        splay = time_per_op(SplayTree(keys).contains, trace)
+        print('  {:<10} {:>8.3f} {:>10.3f} {:>8.2f}x'.format(name, avl, splay, avl / splay))
+
+
+class MutexAVL:
+    """
+    AVL tree with every call behind one global mutex, the way it was used
+    from threads before ConcurrentAVL. Used only as the baseline.
+    """
+
+    def __init__(self, start_tree=None) -> None:
+        self._tree = AVL(start_tree)
+        self._lock = threading.Lock()
+
+    def add(self, value: object) -> bool:
+        with self._lock:
+            return self._tree.add(value)
+
+    def remove(self, value: object) -> bool:
+        with self._lock:
+            return self._tree.remove(value)
+
+    def contains(self, value: object) -> bool:
+        with self._lock:
+            return self._tree.contains(value)
+
+
+def threaded_throughput(tree, threads: int, ops: int, write_fraction: float) -> float:
+    """
+    Run ops random operations on tree from each of threads threads, with
+    the given fraction of writes (half adds, half removes), and return the
+    total operations per second.
+    """
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(ops):
+            value = rng.randrange(1_000_000)
+            draw = rng.random()
+            if draw < write_fraction / 2:
+                tree.add(value)
+            elif draw < write_fraction:
+                tree.remove(value)
+            else:
+                tree.contains(value)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def bench_concurrent(threads: int = 4, ops: int = 50_000, repeat: int = 5) -> None:
+    """
+    Compare the global-mutex AVL against ConcurrentAVL under read-mostly
+    and write-heavy mixes from several threads. Under a GIL build readers
+    cannot actually overlap, so this measures what each read and write
+    costs; the parallel-reader gain needs a free-threaded interpreter.
+
+    The two take turns, each run starting on a fresh tree after a full
+    collection (the mutex AVL's nodes are cyclic through their parent
+    pointers, so its garbage would otherwise be collected during the
+    next run), and the fastest of repeat runs of each is kept.
+    """
+    random.seed(261)
+    keys = random.sample(range(1_000_000), 100_000)
+    print('{} threads x {} ops on 100000 keys, operations per second'.format(threads, ops))
+    print('  {:<8} {:>12} {:>14} {:>9}'.format('writes', 'mutex AVL', 'ConcurrentAVL', 'speedup'))
+    for write_fraction in (0.05, 0.5, 0.95):
+        baseline = current = 0
+        for _ in range(repeat):
+            for tree_class in (MutexAVL, ConcurrentAVL):
+                tree = tree_class(keys)
+                gc.collect()
+                rate = threaded_throughput(tree, threads, ops, write_fraction)
+                del tree
+                if tree_class is MutexAVL:
+                    baseline = max(baseline, rate)
+                else:
+                    current = max(current, rate)
+        print('  {:<8.0%} {:>12.0f} {:>14.0f} {:>8.2f}x'.format(
+            write_fraction, baseline, current, current / baseline))
+
+
+# ---------------------------------------------------------------------- #
+# Benchmark suite: every structure x key distribution x size, with JSON
+# output for tracking regressions between releases. Run with
+#
+#   python bench.py suite [--sizes 1000 10000 ...] [--json results.json]
+#                         [--baseline old.json [--threshold 0.25]]
+
+
+class BisectList:
+    """
+    Sorted list kept with bisect, the usual stdlib stand-in for a sorted
+    multiset. Used only as a baseline: O(log N) lookups, but O(N) inserts
+    and removes (a memmove of the tail).
+    """
+
+    def __init__(self) -> None:
+        self._items = []
+
+    def add(self, value: object) -> None:
+        insort(self._items, value)
+
+    def remove(self, value: object) -> bool:
+        items = self._items
+        i = bisect_left(items, value)
+        if i < len(items) and items[i] == value:
+            del items[i]
+            return True
+        return False
+
+    def contains(self, value: object) -> bool:
+        items = self._items
+        i = bisect_left(items, value)
+        return i < len(items) and items[i] == value
+
+    def find_min(self) -> object:
+        return self._items[0] if self._items else None
+
+    def find_max(self) -> object:
+        return self._items[-1] if self._items else None
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class DictCounter:
+    """
+    Multiset as a dict of counts. Used only as a baseline: O(1) add,
+    remove and contains, but min/max are O(N) and sorted iteration sorts
+    the keys every time.
+    """
+
+    def __init__(self) -> None:
+        self._counts = {}
+
+    def add(self, value: object) -> None:
+        counts = self._counts
+        counts[value] = counts.get(value, 0) + 1
+
+    def remove(self, value: object) -> bool:
+        counts = self._counts
+        count = counts.get(value)
+        if count is None:
+            return False
+        if count == 1:
+            del counts[value]
+        else:
+            counts[value] = count - 1
+        return True
+
+    def contains(self, value: object) -> bool:
+        return value in self._counts
+
+    def find_min(self) -> object:
+        return min(self._counts, default=None)
+
+    def find_max(self) -> object:
+        return max(self._counts, default=None)
+
+    def __iter__(self):
+        counts = self._counts
+        for value in sorted(counts):
+            yield from repeat(value, counts[value])
+
+
+# name: (factory, distributions that make each add O(N), largest size to
+# run those on). Every structure keeps duplicates, so they all hold the
+# same contents; the trees use multiset mode so that repeated keys are
+# counted on one node instead of growing a chain.
+SUITE_STRUCTURES = {
+    'BST': (lambda: BST(multiset=True), ('sorted', 'reverse'), 10_000),
+    'AVL': (lambda: AVL(multiset=True), (), None),
+    'RedBlackTree': (lambda: RedBlackTree(multiset=True), (), None),
+    'bisect': (BisectList, ('random', 'reverse', 'zipf', 'duplicates'), 300_000),
+    'dict': (DictCounter, (), None),
+}
+SUITE_DEFAULT_STRUCTURES = ('BST', 'AVL', 'bisect', 'dict')
+
+# name: function returning n integer keys
+SUITE_DISTRIBUTIONS = {
+    'sorted': lambda n: list(range(n)),
+    'reverse': lambda n: list(range(n, 0, -1)),
+    'random': lambda n: random.sample(range(n), n),
+    'zipf': lambda n: zipf_trace(list(range(n)), n),
+    'duplicates': lambda n: random.choices(range(max(n // 100, 1)), k=n),
+}
+
+SUITE_OPERATIONS = ('add', 'contains', 'remove', 'traversal', 'min', 'max')
+
+
+def time_repeated(func, calls: int, budget: float = 0.5) -> float:
+    """
+    Call func() up to calls times, in doubling batches so the clock is
+    read rarely, stopping early once budget seconds have been spent.
+    Returns the mean time per call in microseconds.
+    """
+    done, batch, elapsed = 0, 1, 0.0
+    while done < calls and elapsed < budget:
+        batch = min(batch, calls - done)
+        start = time.perf_counter()
+        for _ in repeat(None, batch):
+            func()
+        elapsed += time.perf_counter() - start
+        done += batch
+        batch *= 2
+    return elapsed / done * 1e6
+
+
+def peak_build_memory(factory, keys: list) -> int:
+    """
+    Build a structure from keys one add at a time under tracemalloc and
+    return the peak bytes traced, which includes growth headroom such as
+    list over-allocation. The keys exist before tracing starts.
+
+    The keys are added in random order: what the structures hold does not
+    depend on the order, and tracing a degenerate BST build is very slow,
+    since every size update on its long paths allocates a new int.
+    """
+    keys = random.sample(keys, len(keys))
+    tracemalloc.start()
+    structure = factory()
+    for key in keys:
+        structure.add(key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del structure
+    return peak
+
+
+def bench_structure(factory, keys: list, ops: int, memory: bool) -> dict:
+    """
+    Measure one structure on one key list: add (building it from keys),
+    then contains, traversal, min and max, then remove, all in
+    microseconds per operation (per element for traversal). Lookups and
+    removes use up to ops keys drawn from the input.
+
+    Returns:
+    - dict: {'us_per_op': {operation: us}, 'peak_bytes': int or None}
+    """
+    probes = random.sample(keys, min(ops, len(keys)))
+    timings = {}
+    structure = factory()
+    timings['add'] = time_per_op(structure.add, keys)
+    timings['contains'] = time_per_op(structure.contains, probes)
+
+    start = time.perf_counter()
+    for _ in structure:
+        pass
+    timings['traversal'] = (time.perf_counter() - start) / len(keys) * 1e6
+
+    timings['min'] = time_repeated(structure.find_min, ops)
+    timings['max'] = time_repeated(structure.find_max, ops)
+    timings['remove'] = time_per_op(structure.remove, probes)
+    del structure
+    gc.collect()
+
+    peak = peak_build_memory(factory, keys) if memory else None
+    return {'us_per_op': timings, 'peak_bytes': peak}
+
+
+def run_suite(structures, distributions, sizes, ops: int = 100_000,
+              memory: bool = True, seed: int = 261, repeat: int = 1) -> dict:
+    """
+    Run bench_structure() for every combination, keeping the fastest of
+    repeat runs of each operation (the least disturbed by other load),
+    and return the results in the suite's JSON layout:
+
+        {"meta": {"python", "implementation", "platform", "time", "seed",
+                  "ops", "repeat"},
+         "results": [{"structure", "distribution", "size",
+                      "us_per_op": {operation: us} or null,
+                      "peak_bytes": int or null,
+                      "skipped": reason or null}, ...]}
+
+    A structure is skipped on inputs that make each of its adds O(N)
+    once the size passes its limit in SUITE_STRUCTURES.
+    """
+    results = []
+    for size in sizes:
+        for distribution in distributions:
+            random.seed(seed)
+            keys = SUITE_DISTRIBUTIONS[distribution](size)
+            for name in structures:
+                factory, degenerate, limit = SUITE_STRUCTURES[name]
+                record = {'structure': name, 'distribution': distribution, 'size': size,
+                          'us_per_op': None, 'peak_bytes': None, 'skipped': None}
+                if distribution in degenerate and size > limit:
+                    record['skipped'] = 'O(N) per add on {} keys above {}'.format(distribution, limit)
+                else:
+                    random.seed(seed)
+                    record.update(bench_structure(factory, keys, ops, memory))
+                    for _ in range(repeat - 1):
+                        timings = bench_structure(factory, keys, ops, False)['us_per_op']
+                        for operation, us in timings.items():
+                            record['us_per_op'][operation] = min(record['us_per_op'][operation], us)
+                results.append(record)
+                print_suite_row(record)
+    meta = {'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'seed': seed, 'ops': ops, 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def print_suite_row(record: dict) -> None:
+    """
+    Print one result of run_suite() as a table row.
+    """
+    label = '{:<12} {:<10} {:>9}'.format(record['structure'], record['distribution'], record['size'])
+    if record['skipped']:
+        print('  {}   skipped: {}'.format(label, record['skipped']))
+        return
+    timings = ' '.join('{:>9.3f}'.format(record['us_per_op'][name]) for name in SUITE_OPERATIONS)
+    peak = record['peak_bytes']
+    print('  {} {} {:>9}'.format(label, timings, '-' if peak is None else '{:.1f}'.format(peak / 1e6)))
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Match the results of two suite runs by structure, distribution and
+    size, and return (key, operation, old us, new us) for every operation
+    that got more than threshold (a fraction) slower.
+    """
+    old = {(r['structure'], r['distribution'], r['size']): r['us_per_op']
+           for r in baseline['results'] if r['us_per_op']}
+    slower = []
+    for record in current['results']:
+        key = (record['structure'], record['distribution'], record['size'])
+        if record['us_per_op'] and key in old:
+            for name, after in record['us_per_op'].items():
+                before = old[key].get(name)
+                if before and after > before * (1 + threshold):
+                    slower.append((key, name, before, after))
+    return slower
+
+
+def suite_main(argv: list) -> int:
+    """
+    Command line entry point of the suite. Returns the exit status: 1 if
+    a --baseline comparison found regressions, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(prog='bench.py suite',
+                                     description='Benchmark the trees against stdlib baselines.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='numbers of keys, e.g. 1000 10000000 (default: 10^3 to 10^5)')
+    parser.add_argument('--structures', nargs='+', choices=SUITE_STRUCTURES,
+                        default=list(SUITE_DEFAULT_STRUCTURES))
+    parser.add_argument('--distributions', nargs='+', choices=SUITE_DISTRIBUTIONS,
+                        default=list(SUITE_DISTRIBUTIONS))
+    parser.add_argument('--ops', type=int, default=100_000,
+                        help='lookups, removes and min/max calls per run')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per measurement, keeping the fastest (default: 1)')
+    parser.add_argument('--seed', type=int, default=261)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc build that measures peak memory')
+    parser.add_argument('--json', metavar='PATH', help='write the results to PATH')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='results of an earlier run to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='slowdown that counts as a regression (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    print('  {:<12} {:<10} {:>9} {} {:>9}'.format(
+        'structure', 'keys', 'size', ' '.join('{:>9}'.format(name) for name in SUITE_OPERATIONS),
+        'peak MB'))
+    results = run_suite(args.structures, args.distributions, args.sizes,
+                        args.ops, not args.no_memory, args.seed, args.repeat)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        slower = compare_results(baseline, results, args.threshold)
+        for (structure, distribution, size), name, before, after in slower:
+            print('regression: {} {} {} {}: {:.3f} -> {:.3f} us ({:+.0%})'.format(
+                structure, distribution, size, name, before, after, after / before - 1))
+        if slower:
+            return 1
+        print('no regressions above {:.0%}'.format(args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['suite']:
+        sys.exit(suite_main(sys.argv[2:]))
+    print('recursion limit:', sys.getrecursionlimit())
+    bench_iterative_bst()
+    bench_node_memory()
+    bench_frozen_lookups()
+    bench_red_black()
+    bench_btree()
+    bench_splay()
+    bench_concurrent()
@@ -6,24 +6,50 @@
 # Description: Binary Search tree implementation using stack and queue class
 
 
+import copy
+import gc
 import random
+from bisect import bisect_left
+from contextlib import contextmanager
+from heapq import merge
+from itertools import islice, repeat
 from queue_and_stack import Queue, Stack
 
 
+@contextmanager
+def _gc_paused():
+    """
+    Context manager that turns off the cyclic garbage collector while a
+    large number of nodes is created. Every allocation counts towards a
+    collection, and each full collection walks every node built so far,
+    which makes big bulk builds several times slower.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class BSTNode:
     """
     Binary Search Tree Node class
-    DO NOT CHANGE THIS CLASS IN ANY WAY
     """
 
+    # fixed attribute layout, no per-node __dict__
+    __slots__ = ('value', 'left', 'right', 'size', 'count')
+
     def __init__(self, value: object) -> None:
         """
         Initialize a new BST node
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
         self.value = value   # to store node's data
         self.left = None     # pointer to root of left subtree
         self.right = None    # pointer to root of right subtree
+        self.size = 1        # number of values in the subtree rooted here
+        self.count = 1       # copies of value held by this node (multiset mode)
 
     def __str__(self) -> str:
         """
@@ -33,23 +59,345 @@ class BSTNode:
         return 'BST Node: {}'.format(self.value)
 
 
+def _all_slots(node_type: type) -> tuple:
+    """
+    Return the names of all __slots__ of a node class and its bases.
+    """
+    return tuple(name for cls in reversed(node_type.__mro__)
+                 for name in cls.__dict__.get('__slots__', ()))
+
+
+def _payload_slots(node_type: type) -> tuple:
+    """
+    Return the slots of a node class other than the links between nodes.
+    """
+    return tuple(name for name in _all_slots(node_type)
+                 if name not in ('left', 'right', 'parent'))
+
+
+def _rebuild_tree(cls, multiset: bool, values: list, counts: list, shape: bytes):
+    """
+    Rebuild a pickled tree. See BST.__reduce__().
+    """
+    tree = cls(multiset=multiset)
+    if shape is None:
+        tree._load_sorted(values, counts)
+    else:
+        tree._restore(values, counts, shape)
+    return tree
+
+
 class BST:
     """
     Binary Search Tree class
     """
 
-    def __init__(self, start_tree=None) -> None:
+    # node class (or factory taking a value) used for every new node
+    _node_type = BSTNode
+
+    # whether dump() stores the shape and load() rebuilds it exactly;
+    # balanced trees are bulk-built from the sorted values instead, since a
+    # stored shape need not satisfy their balance rules
+    _restore_shape = True
+
+    def __init__(self, start_tree=None, multiset: bool = False) -> None:
         """
         Initialize new Binary Search Tree
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        In multiset mode each node holds one distinct value and a count of
+        its copies, instead of one node per duplicate.
         """
         self._root = None
+        self._multiset = multiset
+
+        # smallest and largest values (None when empty), kept up to date by
+        # every mutation so find_min()/find_max() are O(1)
+        self._min_value = None
+        self._max_value = None
+
+        # height of the tree, or None when it has to be recomputed
+        self._tree_height = -1
 
         # populate BST with initial values (if provided)
-        # before using this feature, implement add() method
         if start_tree is not None:
-            for value in start_tree:
-                self.add(value)
+            self._load(start_tree)
+
+    @classmethod
+    def from_sorted(cls, iterable, multiset: bool = False) -> 'BST':
+        """
+        Build a perfectly balanced tree from values already in ascending
+        order, in one linear pass with no comparisons against the tree.
+
+        O(N) runtime complexity.
+
+        Parameters:
+        - iterable: Values in ascending order.
+        - multiset: Create the tree in multiset mode.
+
+        Returns:
+        - BST: A new tree of the same class holding the values.
+        """
+        values = list(iterable)
+        if not cls._is_sorted(values):
+            raise ValueError('from_sorted() requires values in ascending order')
+        tree = cls(multiset=multiset)
+        tree._bulk_load(values)
+        return tree
+
+    @staticmethod
+    def _is_sorted(values: list) -> bool:
+        """
+        Helper method to check that a list is in ascending order.
+
+        Parameters:
+        - values: The list to check.
+
+        Returns:
+        - bool: True if no value is greater than the one after it.
+        """
+        return all(a <= b for a, b in zip(values, islice(values, 1, None)))
+
+    def _load(self, start_tree) -> None:
+        """
+        Helper method for __init__. The initial values are sorted once (a
+        no-op check for sorted input) and bulk-built into a balanced tree,
+        which is faster than adding them one at a time and avoids the
+        degenerate tree that sorted input gives one-by-one insertion. The
+        tree holds the same values in the same order either way; only its
+        shape differs from insertion order.
+
+        Parameters:
+        - start_tree: Iterable of initial values.
+
+        Returns:
+        - None
+        """
+        values = list(start_tree)
+        if not self._is_sorted(values):
+            values.sort()
+        self._bulk_load(values)
+
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with a perfectly
+        balanced tree built from a sorted list.
+
+        Parameters:
+        - values: Sorted list of values.
+
+        Returns:
+        - None
+        """
+        if self._multiset:
+            values, counts = self._group_runs(values)
+            self._root = self._build_balanced(values, 0, len(values), counts)
+        else:
+            self._root = self._build_balanced(values, 0, len(values))
+        self._refresh_extremes()
+        self._tree_height = None
+
+    def _refresh_extremes(self) -> None:
+        """
+        Helper method to recompute the cached smallest and largest values
+        by walking down both spines. O(H).
+
+        Returns:
+        - None
+        """
+        if self._root is None:
+            self._min_value = self._max_value = None
+        else:
+            self._min_value = self._find_min_recursive(self._root)
+            self._max_value = self._find_max_recursive(self._root)
+
+    @staticmethod
+    def _group_runs(values: list) -> tuple:
+        """
+        Helper method that turns a sorted list into its distinct values and
+        the number of copies of each.
+
+        Parameters:
+        - values: Sorted list of values.
+
+        Returns:
+        - tuple: (list of distinct values, list of counts)
+        """
+        unique, counts = values[:1], [1] * bool(values)
+        for value in islice(values, 1, None):
+            if unique[-1] < value:
+                unique.append(value)
+                counts.append(1)
+            else:
+                counts[-1] += 1
+        return unique, counts
+
+    def _build_balanced(self, values: list, lo: int, hi: int, counts: list = None) -> BSTNode:
+        """
+        Helper method that builds a balanced subtree from values[lo:hi].
+        Uses an explicit stack, since a run of duplicates (which must all go
+        to the right) can make the result arbitrarily deep.
+
+        Parameters:
+        - values: Sorted list of values.
+        - lo: Index of the first value in the subtree.
+        - hi: Index one past the last value in the subtree.
+        - counts: Copies of each value (multiset mode), or None for one each.
+
+        Returns:
+        - BSTNode: The root of the new subtree, or None if it is empty.
+        """
+        root = None
+        created = []
+        node_type = self._node_type
+        with _gc_paused():
+            stack = [(lo, hi, None, False)]
+            while stack:
+                lo, hi, parent, is_right = stack.pop()
+                if lo >= hi:
+                    continue
+
+                # Use the middle value as the root. Equal values must all end up
+                # in the right subtree, so move to the first copy of a duplicate.
+                mid = (lo + hi) // 2
+                mid = bisect_left(values, values[mid], lo, mid)
+
+                node = node_type(values[mid])
+                if counts is not None:
+                    node.count = counts[mid]
+                created.append(node)
+                if parent is None:
+                    root = node
+                elif is_right:
+                    parent.right = node
+                else:
+                    parent.left = node
+                stack.append((mid + 1, hi, node, True))
+                stack.append((lo, mid, node, False))
+
+            # Nodes were created parents first, so walking them backwards
+            # finishes every child before its parent.
+            for node in reversed(created):
+                self._update_node(node)
+
+        return root
+
+    def _set_root(self, root: BSTNode) -> None:
+        """
+        Helper method to install a new root.
+        """
+        self._root = root
+
+    def _restore(self, values: list, counts: list, shape: bytes) -> None:
+        """
+        Helper method for load(): rebuilds the exact tree described by its
+        values in order and its pre-order shape bits (2 per node: has a
+        left child, has a right child), in O(N) with no comparisons.
+
+        Parameters:
+        - values: The values of the nodes in ascending order.
+        - counts: Copies of each value (multiset mode), or None.
+        - shape: Packed shape bits, 4 nodes per byte.
+
+        Returns:
+        - None
+        """
+        # Create the nodes in pre-order; each one fills the most recently
+        # opened child slot, left before right.
+        with _gc_paused():
+            created = []
+            root = None
+            slots = [(None, False)]
+            node_type = self._node_type
+            for i in range(len(values)):
+                parent, is_right = slots.pop()
+                node = node_type(None)
+                created.append(node)
+                if parent is None:
+                    root = node
+                elif is_right:
+                    parent.right = node
+                else:
+                    parent.left = node
+                bits = shape[i >> 2] >> (2 * (i & 3))
+                if bits & 2:
+                    slots.append((node, True))
+                if bits & 1:
+                    slots.append((node, False))
+
+        # Fill in the values with an inorder walk.
+        self._root = root
+        for node, value in zip(self._iter_nodes(), values):
+            node.value = value
+        if counts is not None:
+            for node, count in zip(self._iter_nodes(), counts):
+                node.count = count
+
+        # Children come after their parent in pre-order, so walking
+        # backwards finishes every child before its parent.
+        for node in reversed(created):
+            self._update_node(node)
+        self._set_root(root)
+        self._refresh_extremes()
+        self._tree_height = None
+
+    def _load_sorted(self, values: list, counts: list = None) -> None:
+        """
+        Helper method that bulk-loads distinct sorted values, each with
+        its count when counts is given.
+
+        Parameters:
+        - values: Sorted list of values.
+        - counts: Copies of each value, or None for one each.
+
+        Returns:
+        - None
+        """
+        if counts is not None:
+            values = [value for value, count in zip(values, counts)
+                      for value in repeat(value, count)]
+        self._bulk_load(values)
+
+    def _shape_bits(self) -> bytes:
+        """
+        Helper method that encodes the shape of the tree for _restore():
+        2 bits per node in pre-order (has a left child, has a right child),
+        4 nodes per byte.
+        """
+        shape = bytearray()
+        byte = shift = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                byte |= ((node.left is not None) | (node.right is not None) << 1) << shift
+                shift += 2
+                if shift == 8:
+                    shape.append(byte)
+                    byte = shift = 0
+                stack.append(node.right)
+                stack.append(node.left)
+        if shift:
+            shape.append(byte)
+        return bytes(shape)
+
+    def _update_node(self, node: BSTNode) -> None:
+        """
+        Helper method to refresh the bookkeeping a node keeps about its
+        subtree (the subtree size) after its children change.
+
+        Parameters:
+        - node: The node whose children changed.
+
+        Returns:
+        - None
+        """
+        node.size = node.count + self._size(node.left) + self._size(node.right)
+
+    def _size(self, node: BSTNode) -> int:
+        """Helper method to get the subtree size of a node."""
+        if node is None:
+            return 0
+        return node.size
 
     def __str__(self) -> str:
         """
@@ -62,14 +410,16 @@ class BST:
 
     def _str_helper(self, node: BSTNode, values: []) -> None:
         """
-        Helper method for __str__. Does pre-order tree traversal
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Helper method for __str__. Does pre-order tree traversal using an
+        explicit stack, so very deep (unbalanced) trees can still be printed
         """
-        if not node:
-            return
-        values.append(str(node.value))
-        self._str_helper(node.left, values)
-        self._str_helper(node.right, values)
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node:
+                values.append(str(node.value))
+                stack.append(node.right)
+                stack.append(node.left)
 
     def get_root(self) -> BSTNode:
         """
@@ -105,49 +455,83 @@ class BST:
 
     # ------------------------------------------------------------------ #
 
-    def add(self, value: object) -> None: #passes the prescribed tests
+    def add(self, value: object, n: int = 1) -> bool: #passes the prescribed tests
         """
             Add a new value to the tree. Duplicate values are allowed.
             If a node with that value is already in the tree, the new value
-            is added to the right subtree of that node.
+            is added to the right subtree of that node (or, in multiset
+            mode, counted on that node).
+
+            The descent is a loop rather than a recursion, so the depth of
+            the tree is limited only by memory.
 
             O(N) runtime complexity.
 
             Parameters:
             - value: The value to be added to the tree.
+            - n: Number of copies to add.
 
             Returns:
-            - None
+            - bool: True, since the tree always changes (duplicates are kept).
         """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        multiset = self._multiset
+        if n > 1 and not multiset:
+            for _ in range(n):
+                self.add(value)
+            return True
+
         if self._root is None:
             # If the tree is empty, create a new node as the root.
-            self._root = BSTNode(value)
-        else:
-            # Call a helper function to recursively add the value to the tree.
-            self._add_recursive(self._root, value)
-
-    def _add_recursive(self, node: BSTNode, value: object) -> BSTNode:
-        """
-        Helper method for recursive addition of a value to the BST.
+            self._root = self._new_node(value, n)
+            self._min_value = self._max_value = value
+            self._tree_height = 0
+            return True
 
-        Parameters:
-        - node: The current node in the recursion.
-        - value: The value to be added to the tree.
+        # Keep the cached extremes current.
+        if value < self._min_value:
+            self._min_value = value
+        elif not value < self._max_value:
+            self._max_value = value
+
+        # Walk down to the empty slot where the value belongs. Every node on
+        # the way gains n values in its subtree.
+        node = self._root
+        depth = 1
+        while True:
+            node.size += n
+            if value < node.value:
+                if node.left is None:
+                    node.left = self._new_node(value, n)
+                    break
+                node = node.left
+            elif multiset and not node.value < value:
+                # Equal value in multiset mode: count the new copies here.
+                node.count += n
+                return True
+            else:
+                if node.right is None:
+                    node.right = self._new_node(value, n)
+                    break
+                node = node.right
+            depth += 1
+
+        # The new leaf may be the deepest node.
+        if self._tree_height is not None and depth > self._tree_height:
+            self._tree_height = depth
+        return True
 
-        Returns:
-        - BSTNode: The root of the modified subtree.
+    def _new_node(self, value: object, count: int) -> BSTNode:
         """
-        # Perform standard BST insert
-        if node is None:
-            return BSTNode(value)
-        elif value < node.value:
-            node.left = self._add_recursive(node.left, value)
-        else:
-            node.right = self._add_recursive(node.right, value)
-
+        Helper method to create a leaf holding count copies of value.
+        """
+        node = self._node_type(value)
+        if count != 1:
+            node.count = node.size = count
         return node
 
-    def remove(self, value: object) -> bool: #passes the prescribed tests
+    def remove(self, value: object, n: int = 1) -> bool: #passes the prescribed tests
         """
                 Remove a value from the tree. Returns True if the value is removed,
                 otherwise returns False.
@@ -156,16 +540,29 @@ class BST:
 
                 Parameters:
                 - value: The value to be removed from the tree.
+                - n: Number of copies to remove, at most as many as there are.
 
                 Returns:
                 - bool: True if the value is removed, False otherwise.
                 """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        if n > 1 and not self._multiset:
+            removed = False
+            for _ in range(n):
+                if not self.remove(value):
+                    break
+                removed = True
+            return removed
+
         # Initialize parent and current pointers.
         parent, current = None, self._root
+        path = []
 
         # Search for the node to be removed.
         while current and current.value != value:
             parent = current
+            path.append(current)
             if value < current.value:
                 current = current.left
             else:
@@ -175,6 +572,21 @@ class BST:
         if current is None:
             return False
 
+        if current.count > n:
+            # Multiset mode with copies to spare: only the counts change.
+            current.count -= n
+            current.size -= n
+            for node in path:
+                node.size -= n
+            return True
+
+        # The tree may get shallower; work the height out when next asked.
+        self._tree_height = None
+
+        # Every ancestor loses the node's values from its subtree.
+        for node in path:
+            node.size -= current.count
+
         # Check the number of children of the node to be removed.
         if current.left is None and current.right is None:
             # Case 1: Node has no children, just remove it.
@@ -186,8 +598,66 @@ class BST:
             # Case 3: Node has one child, replace it with the child.
             self._remove_node_with_one_child(parent, current)
 
+        # Removing the smallest or largest value moves that extreme.
+        if not self._min_value < value < self._max_value:
+            self._refresh_extremes()
+
         return True
 
+    def discard(self, value: object, n: int = 1) -> bool:
+        """
+        Remove one occurrence (or n) of a value if it is present. Never raises.
+
+        Parameters:
+        - value: The value to be removed from the tree.
+        - n: Number of copies to remove.
+
+        Returns:
+        - bool: True if the tree changed, False if the value was not found.
+        """
+        return self.remove(value, n)
+
+    def count(self, value: object) -> int:
+        """
+        Return the number of copies of value in the tree.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to count.
+
+        Returns:
+        - int: Number of copies, 0 if the value is not in the tree.
+        """
+        # Every copy lies on the search path: equal values go right.
+        total = 0
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            else:
+                if not node.value < value:
+                    if self._multiset:
+                        return node.count
+                    total += 1
+                node = node.right
+        return total
+
+    def _copy_entry(self, node: BSTNode, source: BSTNode) -> None:
+        """
+        Helper method used when a node takes over its successor's place:
+        copies the value (and count) of source into node.
+
+        Parameters:
+        - node: The node that stays in the tree.
+        - source: The node whose entry moves into it.
+
+        Returns:
+        - None
+        """
+        node.value = source.value
+        node.count = source.count
+
     def _remove_leaf(self, parent: BSTNode, node: BSTNode) -> None:
         """
         Helper method to remove a leaf node.
@@ -246,11 +716,19 @@ class BST:
         """
         # Find the inorder successor (leftmost child of the right subtree).
         successor_parent, successor = node, node.right
+        path = []
         while successor.left:
+            path.append(successor)
             successor_parent, successor = successor, successor.left
 
+        # The node loses its own values, everything between it and the
+        # successor loses the successor's values.
+        node.size -= node.count
+        for ancestor in path:
+            ancestor.size -= successor.count
+
         # Replace the node's value with the value of the inorder successor.
-        node.value = successor.value
+        self._copy_entry(node, successor)
 
         # Remove the inorder successor (which has at most one child).
         self._remove_node_with_one_child(successor_parent, successor)
@@ -292,33 +770,162 @@ class BST:
                 Returns:
                 - bool: True if the value is in the tree, False otherwise.
                 """
-        return self._contains_recursive(self._root, value)
+        node = self._root
+        while node is not None:
+            node_value = node.value
+            if value < node_value:
+                # Search in the left subtree.
+                node = node.left
+            elif node_value == value:
+                # The value is equal to the current node's value, it is found.
+                return True
+            else:
+                # Search in the right subtree.
+                node = node.right
+
+        # Fell off the bottom of the tree, the value is not found.
+        return False
 
-    def _contains_recursive(self, node: BSTNode, value: object) -> bool:
+    def _prefer_rebuild(self, batch_size: int) -> bool:
         """
-        Helper method for recursive search in the tree.
+        Helper method that decides how to apply a sorted batch: one descent
+        per value costs about batch_size * log(N) steps, flattening, merging
+        and bulk-building costs about N + batch_size node builds, each of
+        which is measured at roughly four descent steps.
 
         Parameters:
-        - node: The current node in the recursion.
-        - value: The value to check for in the tree.
+        - batch_size: Number of values in the batch.
 
         Returns:
-        - bool: True if the value is in the tree, False otherwise.
+        - bool: True if rebuilding the whole tree is expected to be cheaper.
         """
-        if node is None:
-            # If the current node is None, the value is not found.
-            return False
-        elif node.value == value:
-            # If the value is equal to the current node's value, it is found.
-            return True
-        elif value < node.value:
-            # If the value is less than the current node's value,
-            # search in the left subtree.
-            return self._contains_recursive(node.left, value)
-        else:
-            # If the value is greater than the current node's value,
-            # search in the right subtree.
-            return self._contains_recursive(node.right, value)
+        total = len(self) + batch_size
+        return batch_size * total.bit_length() >= 4 * total
+
+    def _add_sorted_batch(self, batch: list) -> int:
+        """
+        Helper method for add_many() that adds a small sorted batch with one
+        add() per value. AVL overrides it with a single shared descent; the
+        other trees keep their own per-node invariants (colours, splaying,
+        copied paths), which add() maintains.
+
+        Parameters:
+        - batch: Sorted list of values.
+
+        Returns:
+        - int: Number of values that were added.
+        """
+        added = 0
+        for value in batch:
+            if self.add(value):
+                added += 1
+        return added
+
+    def _remove_sorted_batch(self, batch: list) -> int:
+        """
+        Helper method for remove_many() that removes a small sorted batch
+        with one remove() per value. See _add_sorted_batch().
+
+        Parameters:
+        - batch: Sorted list of values.
+
+        Returns:
+        - int: Number of values that were removed.
+        """
+        removed = 0
+        for value in batch:
+            if self.remove(value):
+                removed += 1
+        return removed
+
+    def add_many(self, values) -> int:
+        """
+        Add a batch of values. The batch is sorted once; a small batch is
+        applied by _add_sorted_batch(), a large one is merged with the
+        current contents and the tree is rebuilt in O(N + M).
+
+        Parameters:
+        - values: Iterable of values to add.
+
+        Returns:
+        - int: Number of values that were added.
+        """
+        batch = sorted(values)
+        if not self._prefer_rebuild(len(batch)):
+            return self._add_sorted_batch(batch)
+
+        size = len(self)
+        self._bulk_load(list(merge(self.iter_inorder(), batch)))
+        return len(self) - size
+
+    def remove_many(self, values) -> int:
+        """
+        Remove a batch of values, one occurrence per value in the batch.
+        Like add_many(), a large batch is applied with a linear merge and a
+        rebuild, a small one by _remove_sorted_batch().
+
+        Parameters:
+        - values: Iterable of values to remove.
+
+        Returns:
+        - int: Number of values that were removed.
+        """
+        batch = sorted(values)
+        if not self._prefer_rebuild(len(batch)):
+            return self._remove_sorted_batch(batch)
+
+        # Walk the current contents and the batch side by side, dropping
+        # each value that is matched by the batch.
+        kept = []
+        index, batch_size = 0, len(batch)
+        for value in self.iter_inorder():
+            while index < batch_size and batch[index] < value:
+                index += 1
+            if index < batch_size and not value < batch[index]:
+                index += 1
+            else:
+                kept.append(value)
+
+        size = len(self)
+        self._bulk_load(kept)
+        return size - len(self)
+
+    def contains_many(self, values) -> list:
+        """
+        Check a batch of values for membership. The batch is searched in
+        ascending order and each search starts from the deepest node on the
+        previous search path that can still hold the value (a finger),
+        instead of from the root.
+
+        Parameters:
+        - values: Sequence of values to look up.
+
+        Returns:
+        - list: One bool per value, in the order of the input.
+        """
+        values = list(values)
+        found = [False] * len(values)
+
+        # Nodes where the previous search turned left. Their values are
+        # upper bounds for the subtree the search ended in.
+        fingers = []
+        for index in sorted(range(len(values)), key=values.__getitem__):
+            value = values[index]
+            while fingers and not value < fingers[-1].value:
+                fingers.pop()
+            node = fingers.pop() if fingers else self._root
+
+            while node is not None:
+                if value < node.value:
+                    fingers.append(node)
+                    node = node.left
+                elif node.value < value:
+                    node = node.right
+                else:
+                    found[index] = True
+                    break
+
+        return found
 
     def inorder_traversal(self) -> Queue: #passes the prescribed tests
         """
@@ -332,41 +939,639 @@ class BST:
                 - Queue: Queue object containing values of visited nodes.
                 """
         result_queue = Queue()  # Queue to store the values of visited nodes.
-        self._inorder_traversal_recursive(self._root, result_queue)
+        for value in self.iter_inorder():
+            result_queue.enqueue(value)
         return result_queue
 
-    def _inorder_traversal_recursive(self, node: BSTNode, result_queue: Queue) -> None:
+    def _iter_nodes(self, reverse: bool = False):
+        """
+        Helper method that lazily yields the nodes in ascending order (or
+        descending when reverse is True), one node per distinct value.
+        Uses an explicit stack like iter_inorder().
+        """
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right if reverse else node.left
+            node = stack.pop()
+            yield node
+            node = node.left if reverse else node.right
+
+    def iter_inorder(self):
+        """
+        Lazily yield the values of the tree in ascending order.
+
+        Only the path to the current node is kept, so memory is O(H) and
+        each step is amortized O(1). The tree must not be changed while a
+        traversal is in progress.
+
+        Returns:
+        - generator: Values in ascending order.
+        """
+        # Explicit stack of nodes whose left subtree is being visited.
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            # Go as far left as possible, remembering the path.
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            # Visit the node, then traverse its right subtree.
+            node = stack.pop()
+            yield node.value
+            if node.count > 1:
+                yield from repeat(node.value, node.count - 1)
+            node = node.right
+
+    def iter_reversed(self):
         """
-        Helper method for recursive inorder traversal.
+        Lazily yield the values of the tree in descending order.
+        Mirror image of iter_inorder().
+
+        Returns:
+        - generator: Values in descending order.
+        """
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node.value
+            if node.count > 1:
+                yield from repeat(node.value, node.count - 1)
+            node = node.left
+
+    def irange(self, lo: object = None, hi: object = None,
+               inclusive: tuple = (True, False), reverse: bool = False):
+        """
+        Lazily yield the values between lo and hi in sorted order.
+
+        The first value is found with a single descent, so a query costs
+        O(H + K) for K results instead of a full traversal.
 
         Parameters:
-        - node: The current node in the recursion.
-        - result_queue: Queue to store the values of visited nodes.
+        - lo: Lower bound, or None for no lower bound.
+        - hi: Upper bound, or None for no upper bound.
+        - inclusive: Pair of bools, whether lo and hi themselves are included.
+        - reverse: Yield in descending order instead.
+
+        Returns:
+        - generator: Values in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        if reverse:
+            nodes = self._irange_descending(lo, hi, lo_inclusive, hi_inclusive)
+        else:
+            nodes = self._irange_ascending(lo, hi, lo_inclusive, hi_inclusive)
+        if self._multiset:
+            return (value for node in nodes for value in repeat(node.value, node.count))
+        return (node.value for node in nodes)
+
+    def _irange_ascending(self, lo: object, hi: object,
+                          lo_inclusive: bool, hi_inclusive: bool):
+        """
+        Helper generator for irange() that yields the nodes in the range in
+        ascending order.
+        """
+        # Descend to the first value inside the lower bound, keeping the
+        # nodes still to be visited on the stack.
+        stack = []
+        node = self._root
+        while node is not None:
+            value = node.value
+            if lo is not None and (value < lo or (not lo_inclusive and not lo < value)):
+                # Node and its left subtree are below the range.
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+
+        # Continue as an in-order traversal until past the upper bound.
+        while stack:
+            node = stack.pop()
+            value = node.value
+            if hi is not None and (hi < value or (not hi_inclusive and not value < hi)):
+                return
+            yield node
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def _irange_descending(self, lo: object, hi: object,
+                           lo_inclusive: bool, hi_inclusive: bool):
+        """
+        Helper generator for irange() that yields the nodes in the range in
+        descending order.
+        """
+        # Descend to the last value inside the upper bound.
+        stack = []
+        node = self._root
+        while node is not None:
+            value = node.value
+            if hi is not None and (hi < value or (not hi_inclusive and not value < hi)):
+                # Node and its right subtree are above the range.
+                node = node.left
+            else:
+                stack.append(node)
+                node = node.right
+
+        # Continue as a reversed traversal until past the lower bound.
+        while stack:
+            node = stack.pop()
+            value = node.value
+            if lo is not None and (value < lo or (not lo_inclusive and not lo < value)):
+                return
+            yield node
+            node = node.left
+            while node is not None:
+                stack.append(node)
+                node = node.right
+
+    def __iter__(self):
+        """
+        Iterate over the values in ascending order. See iter_inorder().
+        """
+        return self.iter_inorder()
+
+    def __reversed__(self):
+        """
+        Iterate over the values in descending order. See iter_reversed().
+        """
+        return self.iter_reversed()
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Support the 'in' operator. See contains().
+        """
+        return self.contains(value)
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree.
+
+        O(1) runtime complexity.
+        """
+        return self._size(self._root)
+
+    def rank(self, value: object) -> int:
+        """
+        Return the number of values in the tree that are less than value,
+        which is the index value has (or would have) in sorted order.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to rank.
+
+        Returns:
+        - int: The number of smaller values.
+        """
+        rank = 0
+        node = self._root
+        while node is not None:
+            if node.value < value:
+                # The node and its whole left subtree are smaller.
+                rank += node.count + self._size(node.left)
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def select(self, index: int) -> object:
+        """
+        Return the value at a position in sorted order. Negative positions
+        count from the end, as with lists.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - index: Position of the value, 0 is the smallest.
+
+        Returns:
+        - object: The value at that position.
+        """
+        return self._select_node(index).value
+
+    def _select_node(self, index: int) -> BSTNode:
+        """
+        Helper method for select() that returns the node holding the value
+        at a position in sorted order. Raises IndexError if there is none.
+        """
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('tree index out of range')
+
+        node = self._root
+        while True:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index < left_size + node.count:
+                return node
+            else:
+                # Skip the left subtree and the node itself.
+                index -= left_size + node.count
+                node = node.right
+
+    def __getitem__(self, index: int) -> object:
+        """
+        Return the value at a position in sorted order. See select().
+        """
+        return self.select(index)
+
+    def percentile(self, percent: float) -> object:
+        """
+        Return the nearest-rank percentile of the values in the tree,
+        e.g. percentile(50) is the median and percentile(99) the p99.
+        If the tree is empty, return None.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - percent: Percentile between 0 and 100.
+
+        Returns:
+        - object: The smallest value with at least percent% of values at or below it.
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError('percentile must be between 0 and 100')
+        size = len(self)
+        if size == 0:
+            return None
+        # Nearest rank is ceil(percent / 100 * size), counted from 1.
+        index = max(-int(-percent * size // 100) - 1, 0)
+        return self.select(index)
+
+    def floor(self, value: object) -> object:
+        """
+        Return the largest value in the tree that is less than or equal to
+        value. If there is none, return None.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to search for.
+
+        Returns:
+        - object: The floor of value, or None.
+        """
+        node = self._floor_node(value)
+        return None if node is None else node.value
+
+    def _floor_node(self, value: object) -> BSTNode:
+        """
+        Helper method for floor() that returns the node holding the floor
+        of value, or None.
+        """
+        best = None
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                # Candidate; a closer one can only be to the right.
+                best = node
+                node = node.right
+            else:
+                return node
+        return best
+
+    def ceiling(self, value: object) -> object:
+        """
+        Return the smallest value in the tree that is greater than or equal
+        to value. If there is none, return None.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to search for.
+
+        Returns:
+        - object: The ceiling of value, or None.
+        """
+        node = self._ceiling_node(value)
+        return None if node is None else node.value
+
+    def _ceiling_node(self, value: object) -> BSTNode:
+        """
+        Helper method for ceiling() that returns the node holding the ceiling
+        of value, or None.
+        """
+        best = None
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                # Candidate; a closer one can only be to the left.
+                best = node
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                return node
+        return best
+
+    def lower(self, value: object) -> object:
+        """
+        Return the largest value in the tree that is strictly less than
+        value (the predecessor). If there is none, return None.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to search for.
+
+        Returns:
+        - object: The predecessor of value, or None.
+        """
+        node = self._lower_node(value)
+        return None if node is None else node.value
+
+    def _lower_node(self, value: object) -> BSTNode:
+        """
+        Helper method for lower() that returns the node holding the predecessor
+        of value, or None.
+        """
+        best = None
+        node = self._root
+        while node is not None:
+            if node.value < value:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def higher(self, value: object) -> object:
+        """
+        Return the smallest value in the tree that is strictly greater than
+        value (the successor). If there is none, return None.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to search for.
+
+        Returns:
+        - object: The successor of value, or None.
+        """
+        node = self._higher_node(value)
+        return None if node is None else node.value
+
+    def _higher_node(self, value: object) -> BSTNode:
+        """
+        Helper method for higher() that returns the node holding the successor
+        of value, or None.
+        """
+        best = None
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def nearest(self, value: object) -> object:
+        """
+        Return the value in the tree closest to value, found in a single
+        descent that tracks the floor and the ceiling at the same time.
+        Values must support subtraction. On a tie the smaller value is
+        returned. If the tree is empty, return None.
+
+        O(H) runtime complexity.
+
+        Parameters:
+        - value: The value to search for.
+
+        Returns:
+        - object: The closest value, or None.
+        """
+        node = self._nearest_node(value)
+        return None if node is None else node.value
+
+    def _nearest_node(self, value: object) -> BSTNode:
+        """
+        Helper method for nearest() that returns the node holding the value
+        closest to value, or None.
+        """
+        below = above = None
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                above = node
+                node = node.left
+            elif node.value < value:
+                below = node
+                node = node.right
+            else:
+                return node
+
+        if below is None:
+            return above
+        if above is None or value - below.value <= above.value - value:
+            return below
+        return above
+
+    def freeze(self):
+        """
+        Return an immutable snapshot of the tree that answers membership,
+        rank and range-count queries for whole NumPy batches of keys.
+        Requires NumPy. See frozen.FrozenTree.
+
+        O(N) runtime complexity.
+
+        Returns:
+        - FrozenTree: Snapshot of the current values.
+        """
+        # imported here so NumPy is only needed by callers of freeze()
+        from frozen import FrozenTree
+        return FrozenTree(list(self.iter_inorder()))
+
+    def instrument(self, hook=None):
+        """
+        Start counting what the tree's operations do: comparisons against
+        the searched value, search depth, rotations, and nodes allocated
+        and freed, as totals, per-operation histograms and events passed
+        to hook. Calling it again on an instrumented tree adds the hook.
+
+        The tree's class is switched to an instrumented subclass until
+        uninstrument(), so trees that are not instrumented pay nothing.
+        See instrument.Instrumentation.
+
+        Parameters:
+        - hook: Optional callable, called with each OperationEvent.
+
+        Returns:
+        - Instrumentation: The counters and histograms.
+        """
+        # imported here so the instrumentation is only loaded when used
+        from instrument import instrument
+        return instrument(self, hook)
+
+    def uninstrument(self):
+        """
+        Stop counting and restore the tree's own class.
+
+        Returns:
+        - Instrumentation: The final counters, or None if the tree was not
+          instrumented.
+        """
+        from instrument import uninstrument
+        return uninstrument(self)
+
+    def clone(self) -> 'BST':
+        """
+        Return a copy of the tree with the same shape and new nodes (the
+        values themselves are shared, as with list.copy()). Iterative, so
+        the depth of the tree does not matter.
+
+        O(N) runtime complexity.
+
+        Returns:
+        - BST: The copy.
+        """
+        return self._copy_tree(None)
+
+    def _copy_tree(self, memo: dict) -> 'BST':
+        """
+        Helper method for clone() and __deepcopy__(): copies the tree's
+        attributes and every node, field by field. With a memo dict the
+        node payloads (values, and any other non-link fields) are deep
+        copied too.
+
+        Parameters:
+        - memo: deepcopy() memo, or None for a shallow copy of the values.
+
+        Returns:
+        - BST: The copy.
+        """
+        tree = type(self).__new__(type(self))
+        if memo is not None:
+            memo[id(self)] = tree
+        tree.__dict__.update(self.__dict__)
+
+        root = None
+        if self._root is not None:
+            with _gc_paused():
+                # Copy the nodes in pre-order, linking each copy to the copy
+                # of its parent.
+                fields = _payload_slots(type(self._root))
+                has_parent = 'parent' in _all_slots(type(self._root))
+                stack = [(self._root, None, False)]
+                while stack:
+                    source, parent, is_right = stack.pop()
+                    node_type = type(source)
+                    node = node_type.__new__(node_type)
+                    for field in fields:
+                        value = getattr(source, field)
+                        if memo is not None:
+                            value = copy.deepcopy(value, memo)
+                        setattr(node, field, value)
+                    node.left = node.right = None
+                    if has_parent:
+                        node.parent = parent
+                    if parent is None:
+                        root = node
+                    elif is_right:
+                        parent.right = node
+                    else:
+                        parent.left = node
+                    if source.right is not None:
+                        stack.append((source.right, node, True))
+                    if source.left is not None:
+                        stack.append((source.left, node, False))
+
+        tree._root = root
+        if memo is not None:
+            tree._min_value = copy.deepcopy(self._min_value, memo)
+            tree._max_value = copy.deepcopy(self._max_value, memo)
+        return tree
+
+    def __copy__(self) -> 'BST':
+        """
+        Support copy.copy(). See clone().
+        """
+        return self.clone()
+
+    def __deepcopy__(self, memo: dict) -> 'BST':
+        """
+        Support copy.deepcopy(): like clone(), but the values are deep
+        copied as well. Iterative, unlike the default deepcopy of the node
+        graph, which recurses once per node.
+        """
+        return self._copy_tree(memo)
+
+    def __reduce__(self) -> tuple:
+        """
+        Support pickle: the tree is pickled as its values in order (plus
+        counts in multiset mode, and the shape for trees that keep one, see
+        _restore_shape) instead of as a graph of nodes, and rebuilt in O(N)
+        without comparisons.
+        """
+        values, counts = [], []
+        for node in self._iter_nodes():
+            values.append(node.value)
+            counts.append(node.count)
+        if not self._multiset:
+            counts = None
+        shape = self._shape_bits() if self._restore_shape else None
+        return _rebuild_tree, (type(self), self._multiset, values, counts, shape)
+
+    def dump(self, path) -> None:
+        """
+        Write the tree to a file in a compact, versioned binary format: the
+        values in order (8-byte ints or floats, or length-prefixed strings
+        or bytes), the counts in multiset mode, and the shape, so load()
+        rebuilds it in O(N) without comparisons or rebalancing. All values
+        must be of one of those kinds. See tree_io.
+
+        O(N) runtime complexity.
+
+        Parameters:
+        - path: File name or path.
 
         Returns:
         - None
         """
-        if node is not None:
-            # Traverse the left subtree.
-            self._inorder_traversal_recursive(node.left, result_queue)
-            # Enqueue the current node's value.
-            result_queue.enqueue(node.value)
-            # Traverse the right subtree.
-            self._inorder_traversal_recursive(node.right, result_queue)
+        # imported here so the file format is only loaded when used
+        from tree_io import dump_tree
+        dump_tree(self, path)
+
+    @classmethod
+    def load(cls, path) -> 'BST':
+        """
+        Read a tree written by dump() into a new tree of this class.
+
+        O(N) runtime complexity.
+
+        Parameters:
+        - path: File name or path.
+
+        Returns:
+        - BST: The new tree.
+        """
+        from tree_io import load_tree
+        return load_tree(cls, path)
 
     def find_min(self) -> object: #passes the prescribed tests
         """
                 Returns the lowest value in the tree. If the tree is empty, return None.
 
-                O(N) runtime complexity.
+                O(1) runtime complexity: the value is cached and kept up to
+                date by every change to the tree.
 
                 Returns:
                 - object: The lowest value in the tree or None if the tree is empty.
                 """
-        if self._root is not None:
-            return self._find_min_recursive(self._root)
-        else:
-            return None
+        return self._min_value
 
     def _find_min_recursive(self, node: BSTNode) -> object:
         """
@@ -387,15 +1592,70 @@ class BST:
         """
                 Returns the highest value in the tree. If the tree is empty, return None.
 
-                O(N) runtime complexity.
+                O(1) runtime complexity: the value is cached and kept up to
+                date by every change to the tree.
 
                 Returns:
                 - object: The highest value in the tree or None if the tree is empty.
                 """
-        if self._root is not None:
-            return self._find_max_recursive(self._root)
-        else:
+        return self._max_value
+
+    def pop_min(self) -> object:
+        """
+        Remove one copy of the lowest value and return it, so the tree can
+        be used as a double-ended priority queue. If the tree is empty,
+        return None.
+
+        O(H) runtime complexity.
+
+        Returns:
+        - object: The value removed, or None if the tree is empty.
+        """
+        value = self._min_value
+        if self._root is None:
             return None
+        self.remove(value)
+        return value
+
+    def pop_max(self) -> object:
+        """
+        Remove one copy of the highest value and return it. If the tree is
+        empty, return None.
+
+        O(H) runtime complexity.
+
+        Returns:
+        - object: The value removed, or None if the tree is empty.
+        """
+        value = self._max_value
+        if self._root is None:
+            return None
+        self.remove(value)
+        return value
+
+    def height(self) -> int:
+        """
+        Return the height of the tree: the number of edges on the longest
+        path from the root to a leaf, -1 for an empty tree.
+
+        Adding values keeps the height current in O(1). After a removal or
+        a rebuild it is recomputed once, in O(N), the next time it is asked.
+
+        Returns:
+        - int: The height of the tree.
+        """
+        if self._tree_height is None:
+            height = -1
+            stack = [(self._root, 0)]
+            while stack:
+                node, depth = stack.pop()
+                if node is not None:
+                    if depth > height:
+                        height = depth
+                    stack.append((node.left, depth + 1))
+                    stack.append((node.right, depth + 1))
+            self._tree_height = height
+        return self._tree_height
 
     def _find_max_recursive(self, node: BSTNode) -> object:
         """
@@ -433,3 +1693,5 @@ class BST:
                 - None
                 """
         self._root = None
+        self._min_value = self._max_value = None
+        self._tree_height = -1
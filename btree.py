@@ -0,0 +1,508 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: B+ tree with configurable fanout, bisect-searched nodes and linked leaves
+
+
+from bisect import bisect_left, bisect_right
+from queue_and_stack import Queue
+
+
+class BPlusLeaf:
+    """
+    Leaf node of a B+ tree: a sorted list of values, linked to the leaves
+    on either side for sequential scans.
+    """
+
+    __slots__ = ('keys', 'prev', 'next')
+
+    def __init__(self, keys: list = None) -> None:
+        """
+        Initialize a new leaf holding keys (sorted).
+        """
+        self.keys = [] if keys is None else keys
+        self.prev = None
+        self.next = None
+
+
+class BPlusInternal:
+    """
+    Internal node of a B+ tree. children[i] holds the values below keys[i]
+    and children[i + 1] the values from keys[i] up.
+    """
+
+    __slots__ = ('keys', 'children')
+
+    def __init__(self, keys: list, children: list) -> None:
+        """
+        Initialize a new internal node with separator keys and children.
+        """
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree:
+    """
+    B+ tree class with the add/remove/contains/inorder_traversal/irange
+    API of BST and AVL. Duplicates are ignored, as in AVL.
+
+    Every node holds up to fanout keys (or children) in a Python list that
+    is searched with bisect, so a lookup follows about log_fanout(N) node
+    references instead of log2(N), and the values themselves are packed in
+    lists instead of one object per value. All values live in the leaves,
+    which are linked in order.
+    """
+
+    def __init__(self, start_tree=None, fanout: int = 64) -> None:
+        """
+        Initialize a new B+ tree
+
+        Parameters:
+        - start_tree: Iterable of initial values.
+        - fanout: Most keys in a leaf and most children of an internal node.
+        """
+        if fanout < 4:
+            raise ValueError('fanout must be at least 4')
+        self._fanout = fanout
+        self._min_fill = fanout // 2
+        self._root = BPlusLeaf()
+        self._size = 0
+
+        # populate the tree with initial values (if provided)
+        if start_tree is not None:
+            values = sorted(start_tree)
+            self._bulk_load([value for i, value in enumerate(values)
+                             if i == 0 or values[i - 1] < value])
+
+    def __str__(self) -> str:
+        """
+        Override string method; display in order
+        """
+        return "BPlusTree { " + ", ".join(str(value) for value in self) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def _chunks(self, items: list) -> list:
+        """
+        Helper method that cuts items into the fewest runs of at most fanout
+        items each, all of nearly equal length (so none is under-full).
+        """
+        count = -(-len(items) // self._fanout)
+        size, extra = divmod(len(items), count)
+        chunks, start = [], 0
+        for i in range(count):
+            stop = start + size + (i < extra)
+            chunks.append(items[start:stop])
+            start = stop
+        return chunks
+
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with distinct
+        sorted values, packing full leaves and building the levels above
+        them bottom up.
+
+        Parameters:
+        - values: Sorted list of distinct values.
+
+        Returns:
+        - None
+        """
+        self._size = len(values)
+        if not values:
+            self._root = BPlusLeaf()
+            return
+
+        level = [BPlusLeaf(keys) for keys in self._chunks(values)]
+        for left, right in zip(level, level[1:]):
+            left.next, right.prev = right, left
+        # Smallest value under each node, to use as separators above it.
+        lows = [leaf.keys[0] for leaf in level]
+
+        while len(level) > 1:
+            parents, parent_lows = [], []
+            start = 0
+            for children in self._chunks(level):
+                stop = start + len(children)
+                parents.append(BPlusInternal(lows[start + 1:stop], children))
+                parent_lows.append(lows[start])
+                start = stop
+            level, lows = parents, parent_lows
+        self._root = level[0]
+
+    def _find_leaf(self, value: object, path: list = None) -> BPlusLeaf:
+        """
+        Helper method that descends to the leaf where value belongs. If a
+        list is given as path, the (node, child index) pairs of the descent
+        are appended to it.
+        """
+        node = self._root
+        while type(node) is BPlusInternal:
+            i = bisect_right(node.keys, value)
+            if path is not None:
+                path.append((node, i))
+            node = node.children[i]
+        return node
+
+    def _leftmost_leaf(self) -> BPlusLeaf:
+        """Helper method that returns the first leaf."""
+        node = self._root
+        while type(node) is BPlusInternal:
+            node = node.children[0]
+        return node
+
+    def _rightmost_leaf(self) -> BPlusLeaf:
+        """Helper method that returns the last leaf."""
+        node = self._root
+        while type(node) is BPlusInternal:
+            node = node.children[-1]
+        return node
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> bool:
+        """
+        Add a new value to the tree. If the value is already present the
+        tree is unchanged.
+
+        O(fanout * log_fanout(N)) runtime complexity; the list insertions
+        are memory moves.
+
+        Parameters:
+        - value: The value to be added to the tree.
+
+        Returns:
+        - bool: True if the value was added, False otherwise.
+        """
+        path = []
+        leaf = self._find_leaf(value, path)
+        keys = leaf.keys
+        i = bisect_left(keys, value)
+        if i < len(keys) and not value < keys[i]:
+            return False
+        keys.insert(i, value)
+        self._size += 1
+        if len(keys) <= self._fanout:
+            return True
+
+        # Split the overflowing leaf in half and link the new right half.
+        mid = len(keys) // 2
+        right = BPlusLeaf(keys[mid:])
+        del keys[mid:]
+        right.prev, right.next = leaf, leaf.next
+        if leaf.next is not None:
+            leaf.next.prev = right
+        leaf.next = right
+        separator = right.keys[0]
+
+        # Insert the separator into the parents, splitting those that
+        # overflow in turn.
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, right)
+            if len(parent.children) <= self._fanout:
+                return True
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            right = BPlusInternal(parent.keys[mid + 1:], parent.children[mid + 1:])
+            del parent.keys[mid:]
+            del parent.children[mid + 1:]
+
+        # The root split: grow the tree by one level.
+        self._root = BPlusInternal([separator], [self._root, right])
+        return True
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value from the tree. Returns True if the value is removed,
+        otherwise returns False.
+
+        O(fanout * log_fanout(N)) runtime complexity.
+
+        Parameters:
+        - value: The value to be removed from the tree.
+
+        Returns:
+        - bool: True if the value is removed, False otherwise.
+        """
+        path = []
+        node = self._find_leaf(value, path)
+        keys = node.keys
+        i = bisect_left(keys, value)
+        if i == len(keys) or value < keys[i]:
+            return False
+        del keys[i]
+        self._size -= 1
+
+        # Refill under-full nodes from a sibling, or merge them into one,
+        # which can leave the parent under-full in turn.
+        while path and self._fill(node) < self._min_fill:
+            parent, i = path.pop()
+            self._rebalance(parent, i)
+            node = parent
+
+        # A root with a single child is replaced by that child.
+        root = self._root
+        if type(root) is BPlusInternal and len(root.children) == 1:
+            self._root = root.children[0]
+        return True
+
+    @staticmethod
+    def _fill(node) -> int:
+        """Helper method to get the number of entries (keys or children) in a node."""
+        if type(node) is BPlusInternal:
+            return len(node.children)
+        return len(node.keys)
+
+    def _rebalance(self, parent: BPlusInternal, i: int) -> None:
+        """
+        Helper method that fixes the under-full child i of parent: borrow
+        one entry from a sibling that can spare it, otherwise merge the
+        child with a sibling.
+
+        Parameters:
+        - parent: The parent of the under-full node.
+        - i: Index of the under-full node in parent.children.
+
+        Returns:
+        - None
+        """
+        children = parent.children
+        node = children[i]
+        left = children[i - 1] if i > 0 else None
+        right = children[i + 1] if i + 1 < len(children) else None
+        is_leaf = type(node) is BPlusLeaf
+
+        if left is not None and self._fill(left) > self._min_fill:
+            # Borrow the largest entry of the left sibling.
+            if is_leaf:
+                node.keys.insert(0, left.keys.pop())
+                parent.keys[i - 1] = node.keys[0]
+            else:
+                node.keys.insert(0, parent.keys[i - 1])
+                node.children.insert(0, left.children.pop())
+                parent.keys[i - 1] = left.keys.pop()
+        elif right is not None and self._fill(right) > self._min_fill:
+            # Borrow the smallest entry of the right sibling.
+            if is_leaf:
+                node.keys.append(right.keys.pop(0))
+                parent.keys[i] = right.keys[0]
+            else:
+                node.keys.append(parent.keys[i])
+                node.children.append(right.children.pop(0))
+                parent.keys[i] = right.keys.pop(0)
+        else:
+            # Merge with a sibling: always fold the right node of the pair
+            # into the left one, so the first leaf never goes away.
+            if left is None:
+                left, node, i = node, right, i + 1
+            if is_leaf:
+                left.keys.extend(node.keys)
+                left.next = node.next
+                if node.next is not None:
+                    node.next.prev = left
+            else:
+                left.keys.append(parent.keys[i - 1])
+                left.keys.extend(node.keys)
+                left.children.extend(node.children)
+            del parent.keys[i - 1]
+            del children[i]
+
+    def contains(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree, otherwise returns False.
+
+        O(log N) comparisons over O(log_fanout(N)) nodes.
+        """
+        keys = self._find_leaf(value).keys
+        i = bisect_left(keys, value)
+        return i < len(keys) and not value < keys[i]
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Return a Queue of the values in ascending order, read off the
+        linked leaves. If the tree is empty, return an empty Queue.
+
+        O(N) runtime complexity.
+        """
+        result_queue = Queue()
+        for value in self:
+            result_queue.enqueue(value)
+        return result_queue
+
+    def irange(self, lo: object = None, hi: object = None,
+               inclusive: tuple = (True, False), reverse: bool = False):
+        """
+        Lazily yield the values between lo and hi in sorted order, walking
+        the linked leaves from the first (or last) value in the range.
+
+        O(log N + K) for K results.
+
+        Parameters:
+        - lo: Lower bound, or None for no lower bound.
+        - hi: Upper bound, or None for no upper bound.
+        - inclusive: Pair of bools, whether lo and hi themselves are included.
+        - reverse: Yield in descending order instead.
+
+        Returns:
+        - generator: Values in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        if reverse:
+            return self._irange_descending(lo, hi, lo_inclusive, hi_inclusive)
+        return self._irange_ascending(lo, hi, lo_inclusive, hi_inclusive)
+
+    def _irange_ascending(self, lo: object, hi: object,
+                          lo_inclusive: bool, hi_inclusive: bool):
+        """
+        Helper generator for irange() in ascending order.
+        """
+        if lo is None:
+            leaf, i = self._leftmost_leaf(), 0
+        else:
+            leaf = self._find_leaf(lo)
+            i = (bisect_left if lo_inclusive else bisect_right)(leaf.keys, lo)
+        while leaf is not None:
+            keys = leaf.keys
+            stop = len(keys)
+            if hi is not None:
+                stop = (bisect_right if hi_inclusive else bisect_left)(keys, hi, i)
+            yield from keys[i:stop]
+            if stop < len(keys):
+                return
+            leaf, i = leaf.next, 0
+
+    def _irange_descending(self, lo: object, hi: object,
+                           lo_inclusive: bool, hi_inclusive: bool):
+        """
+        Helper generator for irange() in descending order.
+        """
+        if hi is None:
+            leaf = self._rightmost_leaf()
+            stop = len(leaf.keys)
+        else:
+            leaf = self._find_leaf(hi)
+            stop = (bisect_right if hi_inclusive else bisect_left)(leaf.keys, hi)
+        while leaf is not None:
+            keys = leaf.keys
+            start = 0
+            if lo is not None:
+                start = (bisect_left if lo_inclusive else bisect_right)(keys, lo, 0, stop)
+            yield from reversed(keys[start:stop])
+            if start > 0:
+                return
+            leaf = leaf.prev
+            if leaf is not None:
+                stop = len(leaf.keys)
+
+    def find_min(self) -> object:
+        """
+        Return the lowest value in the tree, or None if the tree is empty.
+
+        O(log_fanout(N)) runtime complexity.
+        """
+        keys = self._leftmost_leaf().keys
+        return keys[0] if keys else None
+
+    def find_max(self) -> object:
+        """
+        Return the highest value in the tree, or None if the tree is empty.
+
+        O(log_fanout(N)) runtime complexity.
+        """
+        keys = self._rightmost_leaf().keys
+        return keys[-1] if keys else None
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the tree is empty, otherwise returns False.
+        """
+        return self._size == 0
+
+    def make_empty(self) -> None:
+        """
+        Removes all the values from the tree.
+        """
+        self._root = BPlusLeaf()
+        self._size = 0
+
+    def height(self) -> int:
+        """
+        Return the number of levels below the root (0 for a single leaf),
+        -1 for an empty tree.
+        """
+        if self._size == 0:
+            return -1
+        height = 0
+        node = self._root
+        while type(node) is BPlusInternal:
+            node = node.children[0]
+            height += 1
+        return height
+
+    def __iter__(self):
+        """
+        Iterate over the values in ascending order along the leaf chain.
+        """
+        leaf = self._leftmost_leaf()
+        while leaf is not None:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def __reversed__(self):
+        """
+        Iterate over the values in descending order along the leaf chain.
+        """
+        leaf = self._rightmost_leaf()
+        while leaf is not None:
+            yield from reversed(leaf.keys)
+            leaf = leaf.prev
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Support the 'in' operator. See contains().
+        """
+        return self.contains(value)
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree. O(1).
+        """
+        return self._size
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+
+    print("\nBPlusTree - add()/remove()/irange() stress test")
+    print("-----------------------------------------------")
+    for fanout in (4, 5, 8, 64):
+        for _ in range(10):
+            tree = BPlusTree(random.sample(range(1000), 100), fanout)
+            expected = set(tree)
+            for _ in range(2000):
+                value = random.randrange(1000)
+                if random.random() < 0.5:
+                    if tree.add(value) != (value not in expected):
+                        raise Exception("PROBLEM WITH ADD RESULT")
+                    expected.add(value)
+                else:
+                    if tree.remove(value) != (value in expected):
+                        raise Exception("PROBLEM WITH REMOVE RESULT")
+                    expected.discard(value)
+            values = sorted(expected)
+            if list(tree) != values or list(reversed(tree)) != values[::-1] or \
+                    len(tree) != len(values):
+                raise Exception("PROBLEM WITH B+ TREE CONTENTS")
+            if values and (tree.find_min() != values[0] or tree.find_max() != values[-1]):
+                raise Exception("PROBLEM WITH MIN OR MAX")
+            lo, hi = sorted(random.randrange(1000) for _ in range(2))
+            if list(tree.irange(lo, hi)) != [v for v in values if lo <= v < hi]:
+                raise Exception("PROBLEM WITH IRANGE")
+    print('stress test finished')
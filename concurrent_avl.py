@@ -0,0 +1,330 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Thread-safe AVL tree with lock-free reads of published versions
+
+
+import threading
+from queue_and_stack import Queue
+from persistent_avl import PersistentAVL
+
+
+class ConcurrentAVL:
+    """
+    Thread-safe AVL tree whose reads take no lock.
+
+    The tree is kept as a PersistentAVL. Writes are serialized by one lock:
+    each one copies the path it changes, leaving every node that readers
+    can see untouched, and then publishes the new version by replacing a
+    single attribute. Reads run on the last published version without any
+    locking, so they never wait for a writer (or for each other), and a
+    read always sees every write that returned before it started.
+
+    Iteration and irange() walk the version current when they start, so
+    they are lazy, never block writers and never see a half-applied
+    change. snapshot() returns a tree holding that version, for several
+    reads that must agree with each other.
+
+    Same duplicate handling and return values as AVL.
+    """
+
+    def __init__(self, start_tree=None, multiset: bool = False) -> None:
+        """
+        Initialize a new thread-safe AVL tree
+
+        Parameters:
+        - start_tree: Iterable of initial values.
+        - multiset: Count duplicates instead of ignoring them.
+        """
+        # writers' working tree, only touched with the write lock held
+        self._tree = PersistentAVL(start_tree, multiset)
+        self._write_lock = threading.Lock()
+
+        # last published version, never modified once published
+        self._version = self._tree.snapshot()
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        version = self._version
+        values = []
+        version._str_helper(version._root, values)
+        return "Concurrent AVL pre-order { " + ", ".join(values) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def _write(self, method, *args):
+        """
+        Helper method for writes: calls method(tree, *args) holding the
+        write lock, and publishes the new version if the tree changed (a
+        changed persistent tree always has a new root).
+        """
+        with self._write_lock:
+            tree = self._tree
+            root = tree._root
+            result = method(tree, *args)
+            if tree._root is not root:
+                self._version = tree.snapshot()
+            return result
+
+    def snapshot(self) -> PersistentAVL:
+        """
+        Return a tree holding the current version. Later writes never
+        change it, so any number of reads on it agree with each other, and
+        changing it does not affect this tree.
+
+        O(1) runtime complexity.
+
+        Returns:
+        - PersistentAVL: The current version.
+        """
+        return self._version.snapshot()
+
+    # ------------------------------------------------------------------ #
+    # Writes
+
+    def add(self, value: object, n: int = 1) -> bool:
+        """
+        Add a value. See AVL.add().
+
+        Returns:
+        - bool: True if the tree changed, False otherwise.
+        """
+        # _write() written out for the two most common writes
+        with self._write_lock:
+            tree = self._tree
+            if not tree.add(value, n):
+                return False
+            self._version = tree.snapshot()
+            return True
+
+    def remove(self, value: object, n: int = 1) -> bool:
+        """
+        Remove a value. See AVL.remove().
+
+        Returns:
+        - bool: True if the value is removed, False otherwise.
+        """
+        with self._write_lock:
+            tree = self._tree
+            if not tree.remove(value, n):
+                return False
+            self._version = tree.snapshot()
+            return True
+
+    def discard(self, value: object, n: int = 1) -> bool:
+        """
+        Remove a value if it is present. See BST.discard().
+        """
+        return self._write(PersistentAVL.discard, value, n)
+
+    def add_many(self, values) -> int:
+        """
+        Add a batch of values under one write lock. See BST.add_many().
+
+        Returns:
+        - int: Number of values that were added.
+        """
+        return self._write(PersistentAVL.add_many, values)
+
+    def remove_many(self, values) -> int:
+        """
+        Remove a batch of values under one write lock. See BST.remove_many().
+
+        Returns:
+        - int: Number of values that were removed.
+        """
+        return self._write(PersistentAVL.remove_many, values)
+
+    def pop_min(self) -> object:
+        """
+        Remove one copy of the lowest value and return it (None if empty).
+        """
+        return self._write(PersistentAVL.pop_min)
+
+    def pop_max(self) -> object:
+        """
+        Remove one copy of the highest value and return it (None if empty).
+        """
+        return self._write(PersistentAVL.pop_max)
+
+    def make_empty(self) -> None:
+        """
+        Remove all values.
+        """
+        self._write(PersistentAVL.make_empty)
+
+    # ------------------------------------------------------------------ #
+    # Reads, each on the version published when it starts
+
+    def contains(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree, otherwise returns False.
+        """
+        return self._version.contains(value)
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Support the 'in' operator. See contains().
+        """
+        return self._version.contains(value)
+
+    def contains_many(self, values) -> list:
+        """
+        Check a batch of values for membership, all in the same version.
+        """
+        return self._version.contains_many(values)
+
+    def count(self, value: object) -> int:
+        """
+        Return the number of copies of value in the tree.
+        """
+        return self._version.count(value)
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree.
+        """
+        return len(self._version)
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the tree is empty, otherwise returns False.
+        """
+        return self._version.is_empty()
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Return a Queue of the values in ascending order.
+        """
+        return self._version.inorder_traversal()
+
+    def to_list(self) -> list:
+        """
+        Return a list of the values in ascending order.
+        """
+        return list(self._version)
+
+    def __iter__(self):
+        """
+        Iterate lazily over the values in ascending order, as of the start
+        of the iteration.
+        """
+        return iter(self._version)
+
+    def __reversed__(self):
+        """
+        Iterate lazily over the values in descending order, as of the start
+        of the iteration.
+        """
+        return reversed(self._version)
+
+    def irange(self, lo: object = None, hi: object = None,
+               inclusive: tuple = (True, False), reverse: bool = False):
+        """
+        Lazily yield the values between lo and hi, as of the start of the
+        iteration. See BST.irange().
+        """
+        return self._version.irange(lo, hi, inclusive, reverse)
+
+    def rank(self, value: object) -> int:
+        """
+        Return the number of values less than value.
+        """
+        return self._version.rank(value)
+
+    def select(self, index: int) -> object:
+        """
+        Return the value at index in sorted order. See BST.select().
+        """
+        return self._version.select(index)
+
+    def floor(self, value: object) -> object:
+        """
+        Return the largest value <= value, or None.
+        """
+        return self._version.floor(value)
+
+    def ceiling(self, value: object) -> object:
+        """
+        Return the smallest value >= value, or None.
+        """
+        return self._version.ceiling(value)
+
+    def find_min(self) -> object:
+        """
+        Return the lowest value in the tree, or None if it is empty.
+        """
+        return self._version.find_min()
+
+    def find_max(self) -> object:
+        """
+        Return the highest value in the tree, or None if it is empty.
+        """
+        return self._version.find_max()
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nConcurrentAVL - threaded writers and readers")
+    print("--------------------------------------------")
+    tree = ConcurrentAVL()
+    problems = []
+
+    def writer(start: int) -> None:
+        for value in range(start, 4000, 4):
+            if not tree.add(value):
+                problems.append(('add', value))
+        for value in range(start, 4000, 8):
+            if not tree.remove(value) or tree.remove(value):
+                problems.append(('remove', value))
+
+    def reader() -> None:
+        for _ in range(200):
+            values = list(tree)
+            if values != sorted(set(values)):
+                problems.append(values)
+
+    threads = [threading.Thread(target=writer, args=(start,)) for start in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = [value for value in range(4000) if value % 8 >= 4]
+    if problems or tree.to_list() != expected:
+        raise Exception("PROBLEM WITH CONCURRENT AVL")
+    if tree.rank(expected[10]) != 10 or tree.select(10) != expected[10]:
+        raise Exception("PROBLEM WITH RANK OR SELECT")
+    print('concurrent test finished')
+
+    print("\nConcurrentAVL - AVL return values, lazy reads of one version")
+    print("-------------------------------------------------------------")
+    tree = ConcurrentAVL([5, 1, 9])
+    results = [tree.add(3), tree.add(3), tree.remove(4), tree.remove(1), tree.discard(1),
+               tree.add_many([7, 8, 9]), tree.remove_many([7, 7, 10])]
+    if results != [True, False, False, True, False, 2, 1]:
+        raise Exception("PROBLEM WITH WRITE RESULTS")
+
+    # Iterators and snapshots keep the version they started on.
+    values, window, version = iter(tree), tree.irange(3, 9), tree.snapshot()
+    if next(values) != 3 or next(window) != 3:
+        raise Exception("PROBLEM WITH LAZY ITERATION")
+    tree.add(4)
+    tree.remove(8)
+    if list(values) != [5, 8, 9] or list(window) != [5, 8]:
+        raise Exception("PROBLEM WITH LAZY ITERATION")
+    if list(version) != [3, 5, 8, 9] or tree.to_list() != [3, 4, 5, 9]:
+        raise Exception("PROBLEM WITH SNAPSHOT")
+    version.add(6)
+    if 6 in tree or tree.snapshot().contains(6):
+        raise Exception("PROBLEM WITH SNAPSHOT")
+    if tree.pop_min() != 3 or tree.pop_max() != 9 or list(reversed(tree)) != [5, 4]:
+        raise Exception("PROBLEM WITH POP")
+    print('version test finished')
@@ -0,0 +1,215 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Read-only snapshot of a tree in Eytzinger (BFS) order with vectorised NumPy lookups
+
+
+import numpy as np
+
+
+class FrozenTree:
+    """
+    Immutable search structure built from the sorted values of a BST or
+    AVL tree (see BST.freeze()).
+
+    The values are stored in Eytzinger order: position 1 is the root and
+    the children of position k are 2k and 2k + 1. Every level of the
+    implicit tree is contiguous in memory, and the batch methods run one
+    vectorised step per level for a whole array of keys at once.
+    """
+
+    def __init__(self, values) -> None:
+        """
+        Build the snapshot from values in ascending order.
+
+        Parameters:
+        - values: Sorted sequence of values (duplicates allowed).
+        """
+        values = np.asarray(values)
+        size = len(values)
+        self._size = size
+        self._levels = size.bit_length()
+
+        # Walk the implicit tree in order: the i-th position visited holds
+        # the i-th smallest value.
+        order = np.empty(size, dtype=np.intp)
+        i = 0
+        stack = []
+        k = 1
+        while stack or k <= size:
+            while k <= size:
+                stack.append(k)
+                k = 2 * k
+            k = stack.pop()
+            order[i] = k
+            i += 1
+            k = 2 * k + 1
+
+        # Position 0 and the unused positions up to the last level are
+        # padding; _search() ignores what it reads there.
+        padded = 1 << self._levels
+        fill = values[-1] if size else 0
+        self._layout = np.full(padded, fill, dtype=values.dtype if size else float)
+        self._layout[order] = values
+        self._rank_of = np.zeros(padded, dtype=np.intp)
+        self._rank_of[order] = np.arange(size)
+
+        self._values = values.copy()
+        self._values.flags.writeable = False
+        self._layout.flags.writeable = False
+        self._rank_of.flags.writeable = False
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the snapshot.
+        """
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterate over the values in ascending order.
+        """
+        return iter(self._values.tolist())
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Support the 'in' operator. See contains().
+        """
+        return self.contains(key)
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Read-only array of the values in ascending order.
+        """
+        return self._values
+
+    # ------------------------------------------------------------------ #
+
+    def _search(self, keys: np.ndarray, upper: bool) -> np.ndarray:
+        """
+        Helper method that descends the Eytzinger layout for every key at
+        once and returns the layout position of the first value >= key
+        (or > key when upper is True), with 0 meaning there is none.
+
+        Parameters:
+        - keys: Array of keys.
+        - upper: Whether equal values count as smaller than the key.
+
+        Returns:
+        - ndarray: Layout positions, same shape as keys.
+        """
+        layout, size = self._layout, self._size
+        k = np.ones(keys.shape, dtype=np.intp)
+        for _ in range(self._levels):
+            node = layout[k]
+            go_right = (node <= keys) if upper else (node < keys)
+            # Past the last node the path is padding; treat it as right
+            # turns so it is dropped with the other trailing ones below.
+            go_right |= k > size
+            k = 2 * k + go_right
+
+        # The answer is where the search last turned left: drop the
+        # trailing right turns (1 bits) and that left turn (a 0 bit).
+        lowest_zero = ~k & (k + 1)
+        return k >> (np.log2(lowest_zero).astype(np.intp) + 1)
+
+    def _rank_many(self, keys: np.ndarray, upper: bool) -> np.ndarray:
+        """
+        Helper method that converts search positions into ranks.
+        """
+        position = self._search(keys, upper)
+        return np.where(position == 0, self._size, self._rank_of[position])
+
+    def contains_many(self, keys) -> np.ndarray:
+        """
+        Check a whole batch of keys for membership.
+
+        O(M log N) for M keys, vectorised over the batch.
+
+        Parameters:
+        - keys: Array-like of keys.
+
+        Returns:
+        - ndarray: Boolean array, True where the key is in the snapshot.
+        """
+        keys = np.asarray(keys)
+        position = self._search(keys, False)
+        return (position != 0) & (self._layout[position] == keys)
+
+    def rank_many(self, keys) -> np.ndarray:
+        """
+        Return, for every key in a batch, the number of values less than it.
+
+        Parameters:
+        - keys: Array-like of keys.
+
+        Returns:
+        - ndarray: Integer array of ranks.
+        """
+        return self._rank_many(np.asarray(keys), False)
+
+    def count_range_many(self, lo, hi, inclusive: tuple = (True, False)) -> np.ndarray:
+        """
+        Count the values between pairs of bounds, one count per pair.
+
+        Parameters:
+        - lo: Array-like of lower bounds.
+        - hi: Array-like of upper bounds.
+        - inclusive: Pair of bools, whether lo and hi themselves are counted.
+
+        Returns:
+        - ndarray: Integer array of counts (0 where hi is below lo).
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        start = self._rank_many(np.asarray(lo), not lo_inclusive)
+        stop = self._rank_many(np.asarray(hi), hi_inclusive)
+        return np.maximum(stop - start, 0)
+
+    def contains(self, key: object) -> bool:
+        """
+        Returns True if the key is in the snapshot, otherwise returns False.
+        """
+        return bool(self.contains_many([key])[0])
+
+    def rank(self, key: object) -> int:
+        """
+        Return the number of values less than key.
+        """
+        return int(self.rank_many([key])[0])
+
+    def count_range(self, lo: object, hi: object, inclusive: tuple = (True, False)) -> int:
+        """
+        Return the number of values between lo and hi.
+        """
+        return int(self.count_range_many([lo], [hi], inclusive)[0])
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+    from bisect import bisect_left, bisect_right
+    from avl import AVL
+
+    print("\nFrozenTree - batch queries against bisect")
+    print("-----------------------------------------")
+    for size in (0, 1, 2, 7, 8, 100, 1000):
+        values = sorted(random.randrange(500) for _ in range(size))
+        frozen = FrozenTree(values)
+        keys = [random.randrange(-10, 510) for _ in range(200)]
+        if list(frozen) != values or len(frozen) != size:
+            raise Exception("PROBLEM WITH FROZEN CONTENTS")
+        if frozen.contains_many(keys).tolist() != [key in values for key in keys] or \
+                frozen.rank_many(keys).tolist() != [bisect_left(values, key) for key in keys]:
+            raise Exception("PROBLEM WITH CONTAINS_MANY OR RANK_MANY", size)
+        lo, hi = keys[:100], keys[100:]
+        counts = [max(bisect_right(values, b) - bisect_left(values, a), 0) for a, b in zip(lo, hi)]
+        if frozen.count_range_many(lo, hi, (True, True)).tolist() != counts:
+            raise Exception("PROBLEM WITH COUNT_RANGE_MANY", size)
+        if list(AVL(values).freeze()) != sorted(set(values)):
+            raise Exception("PROBLEM WITH FREEZE", size)
+    print('frozen test finished')
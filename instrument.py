@@ -0,0 +1,525 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Opt-in counters, histograms and hooks for the tree operations
+
+
+import time
+from collections import Counter
+
+
+# single-value operations recorded as events, when the tree class has them
+SET_OPERATIONS = ('add', 'remove', 'discard', 'contains', 'count', 'rank',
+                  'floor', 'ceiling', 'lower', 'higher', 'pop_min', 'pop_max')
+
+# key operations of map classes (those with a _sort_key() method)
+MAP_OPERATIONS = ('__setitem__', '__getitem__', '__delitem__', 'get', 'setdefault', 'pop')
+
+# operations that can unlink a node
+REMOVING_OPERATIONS = ('remove', 'discard', 'pop_min', 'pop_max', '__delitem__', 'pop')
+
+# per-event quantities kept as exact histograms
+HISTOGRAM_FIELDS = ('depth', 'comparisons', 'rotations', 'allocated', 'freed')
+
+
+class CountingKey:
+    """
+    Stand-in for the value an operation searches for, which counts every
+    comparison the tree makes against it. The trees compare the searched
+    value with node values using < (and == / != in BST), so the stored
+    value's comparison returns NotImplemented and Python falls back to
+    the reflected method here.
+
+    The stored values' types must return NotImplemented when compared with
+    an unknown type, as all built-in types do.
+    """
+
+    __slots__ = ('value', 'stats')
+
+    def __init__(self, value: object, stats: 'Instrumentation') -> None:
+        self.value = value
+        self.stats = stats
+
+    def __lt__(self, other: object) -> bool:
+        self.stats.comparisons += 1
+        return self.value < other
+
+    def __le__(self, other: object) -> bool:
+        self.stats.comparisons += 1
+        return self.value <= other
+
+    def __gt__(self, other: object) -> bool:
+        self.stats.comparisons += 1
+        return self.value > other
+
+    def __ge__(self, other: object) -> bool:
+        self.stats.comparisons += 1
+        return self.value >= other
+
+    def __eq__(self, other: object) -> bool:
+        self.stats.comparisons += 1
+        return self.value == other
+
+    def __ne__(self, other: object) -> bool:
+        self.stats.comparisons += 1
+        return self.value != other
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __repr__(self) -> str:
+        return 'CountingKey({!r})'.format(self.value)
+
+
+class OperationEvent:
+    """
+    What one instrumented operation did, passed to every hook.
+
+    - operation: Method name, e.g. 'add'.
+    - depth: Nodes on the search path before the operation (0 if empty).
+    - comparisons: Comparisons made against the searched value.
+    - rotations: Rotations done by _rotate_left() / _rotate_right().
+    - allocated: Nodes created (including path copies in PersistentAVL).
+    - freed: Nodes unlinked from the tree (0 or 1).
+    - seconds: Wall-clock time of the operation.
+    """
+
+    __slots__ = ('operation', 'depth', 'comparisons', 'rotations',
+                 'allocated', 'freed', 'seconds')
+
+    def __init__(self, operation: str, depth: int, comparisons: int, rotations: int,
+                 allocated: int, freed: int, seconds: float) -> None:
+        self.operation = operation
+        self.depth = depth
+        self.comparisons = comparisons
+        self.rotations = rotations
+        self.allocated = allocated
+        self.freed = freed
+        self.seconds = seconds
+
+    def as_dict(self) -> dict:
+        """
+        Return the event as a plain dict, e.g. for a metrics exporter.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return 'OperationEvent({})'.format(
+            ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__))
+
+
+class Instrumentation:
+    """
+    Counters and histograms for one instrumented tree (see instrument()).
+
+    rotations and allocated count everything since the last reset(),
+    including work done by methods that are not recorded as events:
+    add_many(), split(), join(), the set operations, and bulk builds and
+    rebuilds (counted by the nodes they create). Trees made by split(),
+    join() and the set operations share these statistics. Everything else
+    comes only from the events of the single-value operations, because
+    only those search with a counting key and check for unlinked nodes.
+    That covers comparisons, nodes freed (not the nodes a rebuild or
+    make_empty() drops), calls per operation, exact histograms of each
+    HISTOGRAM_FIELDS quantity per event, and a latency histogram in
+    power-of-two microsecond buckets.
+
+    Hooks are called with each OperationEvent after it is counted.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize empty statistics with no hooks.
+        """
+        self.hooks = []
+        self.reset()
+        # True while a recorded operation runs, so that the operations it
+        # calls internally (pop_min() calls remove()) are not recorded twice
+        self._active = False
+
+    def reset(self) -> None:
+        """
+        Zero all counters and histograms. Hooks are kept.
+        """
+        self.comparisons = 0
+        self.rotations = 0
+        self.allocated = 0
+        self.freed = 0
+        self.operations = Counter()
+        self.histograms = {name: Counter() for name in HISTOGRAM_FIELDS}
+        self.histograms['latency_us'] = Counter()
+
+    def add_hook(self, hook) -> None:
+        """
+        Call hook(event) after every recorded operation.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook) -> None:
+        """
+        Stop calling a hook added with add_hook().
+        """
+        self.hooks.remove(hook)
+
+    def summary(self) -> dict:
+        """
+        Return the counters and histograms as a JSON-ready dict.
+        """
+        return {'operations': dict(self.operations),
+                'comparisons': self.comparisons,
+                'rotations': self.rotations,
+                'allocated': self.allocated,
+                'freed': self.freed,
+                'histograms': {name: {str(key): count for key, count in sorted(histogram.items())}
+                               for name, histogram in self.histograms.items()}}
+
+    def _record(self, event: OperationEvent) -> None:
+        """
+        Helper method that adds an event to the counters and histograms and
+        passes it to the hooks.
+        """
+        self.operations[event.operation] += 1
+        self.freed += event.freed
+        histograms = self.histograms
+        for name in HISTOGRAM_FIELDS:
+            histograms[name][getattr(event, name)] += 1
+        # bucket b holds latencies in [2**(b-1), 2**b) microseconds
+        histograms['latency_us'][1 << int(event.seconds * 1e6).bit_length()] += 1
+        for hook in self.hooks:
+            hook(event)
+
+
+# ---------------------------------------------------------------------- #
+
+
+def _find(root, value) -> tuple:
+    """
+    Helper function that searches for value like the trees do, without
+    modifying anything.
+
+    Returns:
+    - tuple: (nodes on the search path, True if value was found)
+    """
+    depth = 0
+    node = root
+    while node is not None:
+        depth += 1
+        if value < node.value:
+            node = node.left
+        elif node.value < value:
+            node = node.right
+        else:
+            return depth, True
+    return depth, False
+
+
+def _unwrap_extremes(tree) -> None:
+    """
+    Helper function that replaces a CountingKey an operation cached as the
+    tree's lowest or highest value with the value itself.
+    """
+    if type(tree._min_value) is CountingKey:
+        tree._min_value = tree._min_value.value
+    if type(tree._max_value) is CountingKey:
+        tree._max_value = tree._max_value.value
+
+
+def _record_operation(plain: type, name: str, wrap_key: bool):
+    """
+    Helper function that returns an instrumented version of the operation
+    plain.<name>, recording one OperationEvent per outermost call.
+    """
+    method = getattr(plain, name)
+    removes = name in REMOVING_OPERATIONS
+    is_map = hasattr(plain, '_sort_key')
+
+    def operation(self, *args, **kwargs):
+        stats = self._stats
+        if stats is None:
+            return method(self, *args, **kwargs)
+        if wrap_key and args and type(args[0]) is not CountingKey:
+            args = (CountingKey(args[0], stats),) + args[1:]
+        if stats._active:
+            # called by another recorded operation, which counts it
+            return method(self, *args, **kwargs)
+
+        # The value searched for, as the tree compares it.
+        if name == 'pop_min':
+            value = None if self._root is None else self._min_value
+        elif name == 'pop_max':
+            value = None if self._root is None else self._max_value
+        else:
+            value = args[0].value if wrap_key else args[0]
+            if is_map:
+                value = plain._sort_key(self, value)
+        depth = 0 if value is None else _find(self._root, value)[0]
+        size = len(self) if removes else 0
+
+        comparisons, rotations, allocated = stats.comparisons, stats.rotations, stats.allocated
+        stats._active = True
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stats._active = False
+            # The searched-for key must never be left behind in the tree.
+            _unwrap_extremes(self)
+
+        # A node is unlinked when a copy goes and, in multiset mode, it
+        # was the last one.
+        freed = 0
+        if removes and len(self) < size:
+            freed = int(not self._multiset or not _find(self._root, value)[1])
+        stats._record(OperationEvent(name, depth, stats.comparisons - comparisons,
+                                     stats.rotations - rotations, stats.allocated - allocated,
+                                     freed, seconds))
+        return result
+
+    operation.__name__ = name
+    operation.__doc__ = method.__doc__
+    return operation
+
+
+def _counting(plain: type, name: str, counter: str):
+    """
+    Helper function that returns a version of the helper plain.<name>
+    which adds one to the given Instrumentation counter per call.
+    """
+    method = getattr(plain, name)
+
+    def helper(self, *args, **kwargs):
+        stats = self._stats
+        if stats is not None:
+            setattr(stats, counter, getattr(stats, counter) + 1)
+        return method(self, *args, **kwargs)
+
+    helper.__name__ = name
+    return helper
+
+
+def _counting_nodes(plain: type, name: str, nodes):
+    """
+    Helper function that returns a version of the bulk builder (or path
+    copier) plain.<name> which adds nodes(*args), the number of nodes it
+    creates, to the allocated counter. The builders create nodes directly
+    rather than through _new_node(), which would slow them down.
+    """
+    method = getattr(plain, name)
+
+    def builder(self, *args):
+        stats = self._stats
+        if stats is not None:
+            stats.allocated += nodes(*args)
+        return method(self, *args)
+
+    builder.__name__ = name
+    return builder
+
+
+def _new_node(plain: type):
+    """
+    Helper function that returns a version of plain._new_node() that
+    counts the allocation and stores the value itself, not its CountingKey.
+    """
+    method = plain._new_node
+
+    def new_node(self, value: object, count: int):
+        if type(value) is CountingKey:
+            value = value.value
+        stats = self._stats
+        if stats is not None:
+            stats.allocated += 1
+        return method(self, value, count)
+
+    return new_node
+
+
+def _empty_copy(plain: type):
+    """
+    Helper function that returns a version of plain._empty_copy() whose
+    trees share the instrumented tree's statistics, so the nodes built
+    for the results of split(), join() and the set operations are counted.
+    """
+    method = plain._empty_copy
+
+    def empty_copy(self):
+        tree = method(self)
+        if self._stats is not None:
+            tree._stats = self._stats
+        return tree
+
+    return empty_copy
+
+
+def _sort_key(plain: type):
+    """
+    Helper function for map classes, whose operations search for the sort
+    key computed from the key they are given: returns a version of
+    plain._sort_key() that hands back a CountingKey during a recorded
+    operation, so the key itself is stored untouched.
+    """
+    method = plain._sort_key
+
+    def sort_key(self, key: object) -> object:
+        value = method(self, key)
+        stats = self._stats
+        if stats is not None and stats._active:
+            return CountingKey(value, stats)
+        return value
+
+    return sort_key
+
+
+# instrumented subclass of each tree class, created on first use
+_instrumented_classes = {}
+
+
+def instrumented_class(plain: type) -> type:
+    """
+    Return the instrumented subclass of a tree class, creating it once.
+
+    The subclass overrides the recorded operations and the node-creation
+    and rotation helpers. A tree is instrumented by switching its
+    __class__ to this subclass and back, so an uninstrumented tree runs
+    the plain class's code with no overhead at all.
+    """
+    if plain in _instrumented_classes:
+        return _instrumented_classes[plain]
+
+    is_map = hasattr(plain, '_sort_key')
+    namespace = {'_plain_class': plain,
+                 # trees created with type(self)(...) by an instrumented
+                 # tree (PersistentAVL.snapshot()) get the class but no stats
+                 '_stats': None,
+                 '_new_node': _new_node(plain)}
+    for name in (MAP_OPERATIONS + SET_OPERATIONS if is_map else SET_OPERATIONS):
+        if hasattr(plain, name):
+            # Map operations wrap the sort key instead, in _sort_key().
+            wrap_key = not is_map and name not in ('pop_min', 'pop_max')
+            namespace[name] = _record_operation(plain, name, wrap_key)
+    for name in ('_rotate_left', '_rotate_right'):
+        if hasattr(plain, name):
+            namespace[name] = _counting(plain, name, 'rotations')
+    # one node per value in values[lo:hi], and one per value restored
+    namespace['_build_balanced'] = _counting_nodes(
+        plain, '_build_balanced', lambda values, lo, hi, counts=None: max(hi - lo, 0))
+    namespace['_restore'] = _counting_nodes(
+        plain, '_restore', lambda values, counts, shape: len(values))
+    if hasattr(plain, '_make'):
+        # PersistentAVL copies the nodes on the path instead, one per level
+        # in _copy_path() and the rest (rotations, counts) in _make()
+        namespace['_make'] = _counting(plain, '_make', 'allocated')
+        namespace['_copy_path'] = _counting_nodes(
+            plain, '_copy_path', lambda path, value, node: len(path))
+    if is_map:
+        namespace['_sort_key'] = _sort_key(plain)
+    if hasattr(plain, '_empty_copy'):
+        namespace['_empty_copy'] = _empty_copy(plain)
+
+    def __reduce__(self) -> tuple:
+        # Pickle as the plain class, which can be found by name.
+        function, args = plain.__reduce__(self)
+        cls = type(self)
+        function = plain if function is cls else function
+        return function, tuple(plain if arg is cls else arg for arg in args)
+
+    def _copy_tree(self, memo: dict):
+        # Copies are plain trees.
+        tree = plain._copy_tree(self, memo)
+        tree.__class__ = plain
+        tree.__dict__.pop('_stats', None)
+        return tree
+
+    namespace['__reduce__'] = __reduce__
+    namespace['_copy_tree'] = _copy_tree
+    cls = type('Instrumented' + plain.__name__, (plain,), namespace)
+    cls.__module__ = plain.__module__
+    _instrumented_classes[plain] = cls
+    return cls
+
+
+def instrument(tree, hook=None) -> Instrumentation:
+    """
+    Start recording a tree's operations. See BST.instrument().
+
+    Parameters:
+    - tree: The tree to instrument.
+    - hook: Optional callable, called with each OperationEvent.
+
+    Returns:
+    - Instrumentation: The tree's statistics.
+    """
+    stats = tree.__dict__.get('_stats')
+    if stats is None:
+        stats = Instrumentation()
+        tree.__class__ = instrumented_class(type(tree))
+        tree._stats = stats
+    if hook is not None:
+        stats.add_hook(hook)
+    return stats
+
+
+def uninstrument(tree) -> Instrumentation:
+    """
+    Stop recording a tree's operations and return its final statistics,
+    or None if it was not instrumented. See BST.uninstrument().
+    """
+    stats = tree.__dict__.pop('_stats', None)
+    if stats is not None:
+        tree.__class__ = type(tree)._plain_class
+    return stats
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+    from avl import AVL
+    from rbtree import RedBlackTree
+
+    print("\ninstrument()/uninstrument() counters")
+    print("------------------------------------")
+    for cls in (AVL, RedBlackTree):
+        tree = cls()
+        events = []
+        stats = tree.instrument(events.append)
+        for _ in range(2000):
+            value = random.randrange(500)
+            if random.random() < 0.6:
+                tree.add(value)
+            else:
+                tree.remove(value)
+            tree.contains(random.randrange(500))
+        if stats.allocated - stats.freed != len(tree):
+            raise Exception("PROBLEM WITH ALLOCATED/FREED COUNTS", cls.__name__)
+        if len(events) != 4000 or sum(stats.operations.values()) != 4000 or \
+                stats.comparisons != sum(event.comparisons for event in events):
+            raise Exception("PROBLEM WITH EVENT COUNTS", cls.__name__)
+        if tree.uninstrument() is not stats or type(tree) is not cls or \
+                tree.uninstrument() is not None:
+            raise Exception("PROBLEM WITH UNINSTRUMENT", cls.__name__)
+    print('instrumentation test finished')
+
+    print("\ninstrument() counters of derived trees")
+    print("--------------------------------------")
+    # union() reuses the nodes of both trees, so it allocates none
+    for cls in (AVL, RedBlackTree):
+        tree = cls()
+        stats = tree.instrument()
+        for value in range(100):
+            tree.add(value)
+        allocated = stats.allocated
+        union = tree.union(cls(range(500, 600)))
+        if stats.allocated != allocated or union._stats is not stats:
+            raise Exception("PROBLEM WITH DERIVED TREE COUNTS", cls.__name__)
+        # a large batch rebuilds the tree, which allocates at least one node
+        # per new value
+        stats.reset()
+        union.add_many(range(2000, 7000))
+        if stats.allocated < 5000:
+            raise Exception("PROBLEM WITH REBUILD COUNTS", cls.__name__)
+    print('derived tree counter test finished')
@@ -0,0 +1,408 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Persistent (path-copying) AVL tree with O(1) snapshots
+
+
+from bst import BSTNode, BST
+
+
+class PersistentNode(BSTNode):
+    """
+    Node of a persistent AVL tree. Inherits from BSTNode
+
+    Once a node is part of a tree it is never modified, so any number of
+    trees can share it. There is no parent pointer, since a shared node
+    has many parents.
+    """
+
+    # fixed attribute layout, no per-node __dict__
+    __slots__ = ('height',)
+
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new persistent node
+        """
+        # Every copied node is built here, so the BSTNode fields are set
+        # directly instead of through super().__init__().
+        self.value = value
+        self.left = self.right = None
+        self.size = self.count = 1
+        self.height = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Persistent Node: {}'.format(self.value)
+
+
+class PersistentAVL(BST):
+    """
+    Persistent AVL tree class. Inherits from BST
+
+    add() and remove() never modify a node: they copy the O(log N) nodes on
+    the path from the root and install the new root, and every subtree off
+    that path is shared with the previous version. snapshot() is therefore
+    an O(1) handle on the current version, which later changes to either
+    tree never affect.
+
+    For concurrent use the writer calls snapshot() and hands the result to
+    reader threads; readers can search and iterate their snapshot without
+    locks while the writer keeps going.
+
+    Same duplicate handling as AVL, and the read-only BST methods (rank,
+    select, floor, irange, iteration, ...) work unchanged.
+    """
+
+    # node class (or factory taking a value) used for every new node
+    _node_type = PersistentNode
+
+    # load() bulk-builds instead of restoring a stored shape (see BST)
+    _restore_shape = False
+
+    def __init__(self, start_tree=None, multiset: bool = False) -> None:
+        """
+        Initialize a new persistent AVL tree
+
+        Without multiset mode duplicates are ignored; with it each node
+        counts the copies of its value.
+        """
+        super().__init__(start_tree, multiset)
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        self._str_helper(self._root, values)
+        return "Persistent AVL pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_avl(self) -> bool:
+        """
+        Troubleshooting helper: check the heights, sizes and AVL balance of
+        every node.
+        """
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                left, right = node.left, node.right
+                if node.height != 1 + max(self._height(left), self._height(right)):
+                    return False
+                if abs(self._height(left) - self._height(right)) > 1:
+                    return False
+                if node.size != node.count + self._size(left) + self._size(right):
+                    return False
+                stack.append(right)
+                stack.append(left)
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with a perfectly
+        balanced tree of new nodes built from a sorted list. Duplicates are
+        dropped, or counted in multiset mode. Snapshots keep the old nodes.
+
+        Parameters:
+        - values: Sorted list of values.
+
+        Returns:
+        - None
+        """
+        unique, counts = self._group_runs(values)
+        self._root = self._build_balanced(unique, 0, len(unique), counts if self._multiset else None)
+        self._refresh_extremes()
+
+    def _update_node(self, node: PersistentNode) -> None:
+        """
+        Helper method to compute a new node's height and subtree size from
+        its children. Only used on nodes that no other tree shares yet.
+        """
+        # Runs once per copied node, so the _height()/_size() calls are
+        # written out.
+        left, right = node.left, node.right
+        if left is None:
+            left_height, size = -1, node.count
+        else:
+            left_height, size = left.height, node.count + left.size
+        if right is None:
+            node.height = 1 + left_height
+        else:
+            right_height = right.height
+            node.height = 1 + (left_height if left_height > right_height else right_height)
+            size += right.size
+        node.size = size
+
+    @staticmethod
+    def _height(node: PersistentNode) -> int:
+        """Helper method to get the height of a node."""
+        if node is None:
+            return -1
+        return node.height
+
+    def _make(self, source: PersistentNode, left: PersistentNode,
+              right: PersistentNode, count: int = None) -> PersistentNode:
+        """
+        Helper method that returns a new node with the value (and count,
+        unless given) of source and the given children.
+        """
+        node = self._node_type(source.value)
+        node.count = source.count if count is None else count
+        node.left, node.right = left, right
+        self._update_node(node)
+        return node
+
+    def _balance(self, source: PersistentNode, left: PersistentNode,
+                 right: PersistentNode) -> PersistentNode:
+        """
+        Helper method that builds a new node with source's value over left
+        and right, whose heights differ by at most two, doing the AVL
+        rotations by building the rotated nodes new instead of relinking
+        the old ones.
+
+        Parameters:
+        - source: Node whose value (and count) goes between the subtrees.
+        - left: The new left subtree.
+        - right: The new right subtree.
+
+        Returns:
+        - PersistentNode: The root of the new subtree.
+        """
+        left_height = -1 if left is None else left.height
+        right_height = -1 if right is None else right.height
+        if left_height > right_height + 1:
+            if self._height(left.left) < self._height(left.right):
+                # Left Right Case
+                pivot = left.right
+                return self._make(pivot, self._make(left, left.left, pivot.left),
+                                  self._make(source, pivot.right, right))
+            # Left Left Case
+            return self._make(left, left.left, self._make(source, left.right, right))
+
+        if right_height > left_height + 1:
+            if self._height(right.right) < self._height(right.left):
+                # Right Left Case
+                pivot = right.left
+                return self._make(pivot, self._make(source, left, pivot.left),
+                                  self._make(right, pivot.right, right.right))
+            # Right Right Case
+            return self._make(right, self._make(source, left, right.left), right.right)
+
+        return self._make(source, left, right)
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object, n: int = 1) -> bool:
+        """
+        Add a new value to the tree by copying the path to it. Without
+        multiset mode duplicates are not allowed; if the value is already
+        present the tree is unchanged.
+
+        O(log N) runtime complexity and new nodes.
+
+        Parameters:
+        - value: The value to be added to the tree.
+        - n: Number of copies to add (multiset mode).
+
+        Returns:
+        - bool: True if the tree changed, False otherwise.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        # Find the value's place, remembering the path to it.
+        path = []
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                path.append(node)
+                node = node.left
+            elif node.value < value:
+                path.append(node)
+                node = node.right
+            elif self._multiset:
+                # Already present, count the new copies in a copy of the node
+                node = self._make(node, node.left, node.right, node.count + n)
+                break
+            else:
+                return False
+        else:
+            node = self._new_node(value, n if self._multiset else 1)
+            # Keep the cached extremes current.
+            if self._root is None:
+                self._min_value = self._max_value = value
+            elif value < self._min_value:
+                self._min_value = value
+            elif self._max_value < value:
+                self._max_value = value
+        self._root = self._copy_path(path, value, node)
+        return True
+
+    def _copy_path(self, path: list, value: object, node: PersistentNode) -> PersistentNode:
+        """
+        Helper method for add() and remove() that copies the search path
+        to value bottom-up around the new version of its last subtree,
+        rebalancing on the way. Each level is copied directly rather than
+        through _make(), since this is where nearly all of the copying is
+        done; the rare copy that is out of balance is rebuilt by
+        _balance().
+
+        Parameters:
+        - path: Nodes on the search path for value, from the root down.
+        - value: The value that was searched for.
+        - node: The new version of the subtree below the last path node.
+
+        Returns:
+        - PersistentNode: The root of the new version of the tree.
+        """
+        if not path:
+            return node
+        # Every field of the copies is set below, so __init__() is skipped.
+        node_type = type(path[0])
+        new = node_type.__new__
+        for parent in reversed(path):
+            parent_value = parent.value
+            if value < parent_value:
+                left, right = node, parent.right
+            else:
+                left, right = parent.left, node
+            node = new(node_type)
+            node.value = parent_value
+            node.left, node.right = left, right
+            size = node.count = parent.count
+            if left is None:
+                left_height = -1
+            else:
+                left_height = left.height
+                size += left.size
+            if right is None:
+                right_height = -1
+            else:
+                right_height = right.height
+                size += right.size
+            if -2 < left_height - right_height < 2:
+                node.height = 1 + (left_height if left_height > right_height else right_height)
+                node.size = size
+            else:
+                node = self._balance(node, left, right)
+        return node
+
+    def remove(self, value: object, n: int = 1) -> bool:
+        """
+        Remove a value from the tree by copying the path to it. Returns True
+        if the value is removed, otherwise returns False.
+
+        O(log N) runtime complexity and new nodes.
+
+        Parameters:
+        - value: The value to be removed from the tree.
+        - n: Number of copies to remove (multiset mode).
+
+        Returns:
+        - bool: True if the value is removed, False otherwise.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        # Find the value, remembering the path to it; a miss copies nothing.
+        path = []
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                path.append(node)
+                node = node.left
+            elif node.value < value:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        else:
+            return False
+
+        if node.count > n:
+            # Multiset mode with copies to spare: only the count changes
+            node = self._make(node, node.left, node.right, node.count - n)
+        elif node.left is None:
+            node = node.right
+        elif node.right is None:
+            node = node.left
+        else:
+            # Two children: the inorder successor takes the node's place
+            right, successor = self._pop_min(node.right)
+            node = self._balance(successor, node.left, right)
+        self._root = self._copy_path(path, value, node)
+        # Removing the smallest or largest value moves that extreme.
+        if not self._min_value < value < self._max_value:
+            self._refresh_extremes()
+        return True
+
+    def _pop_min(self, node: PersistentNode) -> tuple:
+        """
+        Helper method that returns a new version of a subtree without its
+        smallest node, and that node.
+
+        Returns:
+        - tuple: (root of the remaining subtree, the smallest node)
+        """
+        if node.left is None:
+            return node.right, node
+        left, smallest = self._pop_min(node.left)
+        return self._balance(node, left, node.right), smallest
+
+    def snapshot(self) -> 'PersistentAVL':
+        """
+        Return an independent tree holding the current contents, sharing
+        all of its nodes with this one.
+
+        O(1) runtime complexity.
+
+        Returns:
+        - PersistentAVL: The snapshot.
+        """
+        tree = type(self)(multiset=self._multiset)
+        tree._root = self._root
+        tree._min_value, tree._max_value = self._min_value, self._max_value
+        return tree
+
+    def height(self) -> int:
+        """
+        Return the height of the tree, -1 for an empty tree.
+
+        O(1) runtime complexity: read from the root node.
+        """
+        return self._height(self._root)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+
+    print("\nPersistentAVL - snapshot isolation stress test")
+    print("----------------------------------------------")
+    for _ in range(20):
+        tree = PersistentAVL()
+        expected = set()
+        snapshots = []
+        for _ in range(500):
+            value = random.randrange(200)
+            if random.random() < 0.6:
+                if tree.add(value) != (value not in expected):
+                    raise Exception("PROBLEM WITH ADD RESULT")
+                expected.add(value)
+            else:
+                if tree.remove(value) != (value in expected):
+                    raise Exception("PROBLEM WITH REMOVE RESULT")
+                expected.discard(value)
+            if random.random() < 0.05:
+                snapshots.append((tree.snapshot(), sorted(expected)))
+        if not tree.is_valid_avl() or list(tree) != sorted(expected):
+            raise Exception("PROBLEM WITH PERSISTENT AVL", tree)
+        for snapshot, values in snapshots:
+            if not snapshot.is_valid_avl() or list(snapshot) != values:
+                raise Exception("PROBLEM: SNAPSHOT CHANGED AFTER LATER WRITES")
+    print('snapshot test finished')
@@ -0,0 +1,1117 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Red-black tree with the same public API as the AVL tree
+
+
+from bst import BSTNode, BST
+from avl import Cursor
+
+
+class RBNode(BSTNode):
+    """
+    Red-black tree node class. Inherits from BSTNode
+    """
+
+    # fixed attribute layout, no per-node __dict__
+    __slots__ = ('parent', 'red', 'height')
+
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new red-black node. New nodes start out red.
+        """
+        super().__init__(value)
+        self.parent = None
+        self.red = True
+        self.height = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'RB Node: {}'.format(self.value)
+
+
+class RedBlackTree(BST):
+    """
+    Red-black tree class. Inherits from BST
+
+    Same public API and duplicate handling as AVL. The tree is less
+    strictly balanced (height at most 2 log2(N + 1)), but an insert does
+    at most two rotations and a remove at most three, however far up the
+    tree the recolouring goes. AVL can rotate at every level on the way up
+    after a removal.
+
+    Like AVL nodes, every node keeps its height, so height() is O(1). The
+    tree keeps its black height (the number of black nodes on every path
+    from the root down), and the black height of a subtree follows from
+    it on the way down, which is what split(), join() and the set
+    operations compare, as AVL compares heights.
+    """
+
+    # node class (or factory taking a value) used for every new node
+    _node_type = RBNode
+
+    # load() bulk-builds instead of restoring a stored shape (see BST)
+    _restore_shape = False
+
+    # advanced on every structural change, so cursors can tell that the
+    # tree was modified under them
+    _version = 0
+
+    # black nodes on every path from the root down, 0 for an empty tree
+    _black_height = 0
+
+    def __init__(self, start_tree=None, multiset: bool = False) -> None:
+        """
+        Initialize a new red-black tree
+
+        Without multiset mode duplicates are ignored; with it each node
+        counts the copies of its value.
+        """
+        super().__init__(start_tree, multiset)
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        self._str_helper(self._root, values)
+        return "RB pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_rb(self) -> bool:
+        """
+        Troubleshooting helper: check the red-black properties (black root,
+        no red node with a red child, the same number of black nodes on
+        every path down, which must be the stored black height), the parent
+        pointers and the subtree sizes and heights.
+        """
+        if self._root is None:
+            return self._black_height == 0
+        if self._root.red or self._root.parent is not None:
+            return False
+
+        stack = [(self._root, 0)]
+        while stack:
+            node, blacks = stack.pop()
+            if not node.red:
+                blacks += 1
+            if node.size != node.count + self._size(node.left) + self._size(node.right):
+                return False
+            if node.height != 1 + max(self._height(node.left), self._height(node.right)):
+                return False
+            for child in (node.left, node.right):
+                if child is None:
+                    # Every path down ends with the same black count
+                    if blacks != self._black_height:
+                        return False
+                else:
+                    if child.parent is not node or (node.red and child.red):
+                        return False
+                    stack.append((child, blacks))
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with a balanced
+        tree built from a sorted list. Duplicates are dropped, or counted in
+        multiset mode.
+
+        Parameters:
+        - values: Sorted list of values.
+
+        Returns:
+        - None
+        """
+        unique, counts = self._group_runs(values)
+        self._build(unique, counts if self._multiset else None)
+
+    def _build(self, values: list, counts: list) -> None:
+        """
+        Helper method that replaces the contents of the tree with a balanced
+        tree of distinct sorted values and colours it. Every path down in a
+        tree built by halving has the same length give or take one, so
+        colouring the deepest level red (unless it is the root) and the rest
+        black gives every path the same number of black nodes.
+
+        Parameters:
+        - values: Sorted list of distinct values.
+        - counts: Copies of each value (multiset mode), or None for one each.
+
+        Returns:
+        - None
+        """
+        root = self._build_balanced(values, 0, len(values), counts)
+        black_height = 0
+        level = [root] if root is not None else []
+        while level:
+            below = [child for node in level for child in (node.left, node.right)
+                     if child is not None]
+            red = not below and black_height > 0
+            for node in level:
+                node.red = red
+            if not red:
+                black_height += 1
+            level = below
+
+        self._set_tree(root, black_height)
+        self._refresh_extremes()
+
+    def _set_tree(self, root: RBNode, black_height: int) -> None:
+        """
+        Helper method to install a detached subtree as the whole tree,
+        colouring its root black.
+
+        Parameters:
+        - root: The root of the subtree, or None.
+        - black_height: Black nodes on every path down from root.
+
+        Returns:
+        - None
+        """
+        if root is not None:
+            root.parent = None
+            if root.red:
+                root.red = False
+                black_height += 1
+        self._root = root
+        self._black_height = black_height
+        self._version += 1
+
+    @staticmethod
+    def _height(node: RBNode) -> int:
+        """Helper method to get the height of a node; -1 for a missing node."""
+        return -1 if node is None else node.height
+
+    def _update_node(self, node: RBNode) -> None:
+        """
+        Helper method to recompute a node's height and subtree size from its
+        children and point the children's parent pointers at it.
+
+        Parameters:
+        - node: The node whose children changed.
+
+        Returns:
+        - None
+        """
+        left, right = node.left, node.right
+        size = node.count
+        height = -1
+        if left is not None:
+            left.parent = node
+            size += left.size
+            height = left.height
+        if right is not None:
+            right.parent = node
+            size += right.size
+            if right.height > height:
+                height = right.height
+        node.size = size
+        node.height = height + 1
+
+    def _update_path(self, node: RBNode) -> None:
+        """
+        Helper method to recompute the heights and sizes from node up to
+        the root. O(H).
+
+        Parameters:
+        - node: The lowest node to update, or None.
+
+        Returns:
+        - None
+        """
+        while node is not None:
+            self._update_node(node)
+            node = node.parent
+
+    def _update_heights(self, node: RBNode) -> None:
+        """
+        Helper method to recompute heights from node up after a rotation
+        below it, stopping at the first height that does not change.
+        Rotations do not change the sizes above them.
+
+        Parameters:
+        - node: The lowest node to update, or None.
+
+        Returns:
+        - None
+        """
+        while node is not None:
+            left, right = node.left, node.right
+            height = -1 if left is None else left.height
+            if right is not None and right.height > height:
+                height = right.height
+            height += 1
+            if height == node.height:
+                return
+            node.height = height
+            node = node.parent
+
+    def _rotate_left(self, x: RBNode) -> RBNode:
+        """
+        Perform a left rotation at x, keeping parent pointers, sizes and
+        heights. x's parent (or the root) is pointed at the new subtree
+        root; the heights of the nodes above it are not updated.
+
+        Parameters:
+        - x: The node at which the rotation is performed.
+
+        Returns:
+        - RBNode: The new root of the rotated subtree.
+        """
+        y = x.right
+        inner = y.left
+        parent = x.parent
+        x.right = inner
+        if inner is not None:
+            inner.parent = x
+        y.left = x
+        x.parent = y
+        y.parent = parent
+        if parent is None:
+            self._root = y
+        elif parent.left is x:
+            parent.left = y
+        else:
+            parent.right = y
+
+        # y takes over x's subtree, x keeps what is left of it
+        y.size = x.size
+        x.size = x.count + self._size(x.left) + self._size(inner)
+        x.height = 1 + max(self._height(x.left), self._height(inner))
+        y.height = 1 + max(x.height, self._height(y.right))
+        return y
+
+    def _rotate_right(self, x: RBNode) -> RBNode:
+        """
+        Perform a right rotation at x. Mirror image of _rotate_left().
+
+        Parameters:
+        - x: The node at which the rotation is performed.
+
+        Returns:
+        - RBNode: The new root of the rotated subtree.
+        """
+        y = x.left
+        inner = y.right
+        parent = x.parent
+        x.left = inner
+        if inner is not None:
+            inner.parent = x
+        y.right = x
+        x.parent = y
+        y.parent = parent
+        if parent is None:
+            self._root = y
+        elif parent.right is x:
+            parent.right = y
+        else:
+            parent.left = y
+
+        y.size = x.size
+        x.size = x.count + self._size(inner) + self._size(x.right)
+        x.height = 1 + max(self._height(inner), self._height(x.right))
+        y.height = 1 + max(x.height, self._height(y.left))
+        return y
+
+    @staticmethod
+    def _is_red(node: RBNode) -> bool:
+        """Helper method to get the colour of a node; missing nodes are black."""
+        return node is not None and node.red
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object, n: int = 1) -> bool:
+        """
+        Add a new value to the tree. Without multiset mode duplicates are
+        not allowed; if the value is already present the tree is unchanged.
+
+        O(log N) runtime complexity, with at most two rotations.
+
+        Parameters:
+        - value: The value to be added to the tree.
+        - n: Number of copies to add (multiset mode).
+
+        Returns:
+        - bool: True if the tree changed, False otherwise.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+
+        # Walk down to the empty slot where the value belongs.
+        parent, node = None, self._root
+        while node is not None:
+            parent = node
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            elif self._multiset:
+                # Already present, count the new copies on the way back up
+                node.count += n
+                while node is not None:
+                    node.size += n
+                    node = node.parent
+                return True
+            else:
+                # Already present, nothing changes
+                return False
+
+        node = self._new_node(value, n if self._multiset else 1)
+        node.parent = parent
+        if parent is None:
+            self._root = node
+            self._min_value = self._max_value = value
+        else:
+            if value < parent.value:
+                parent.left = node
+            else:
+                parent.right = node
+            # Keep the cached extremes current.
+            if value < self._min_value:
+                self._min_value = value
+            elif self._max_value < value:
+                self._max_value = value
+            # Every ancestor gains the new node's values. The ancestors
+            # grow until one has a longer path down its other side.
+            count, height = node.count, 0
+            while parent is not None and parent.height <= height:
+                height += 1
+                parent.height = height
+                parent.size += count
+                parent = parent.parent
+            while parent is not None:
+                parent.size += count
+                parent = parent.parent
+
+        self._insert_fixup(node)
+        self._version += 1
+        return True
+
+    def _insert_fixup(self, node: RBNode) -> None:
+        """
+        Helper method that restores the red-black properties after node was
+        inserted red. Recolouring moves the problem up two levels at a time;
+        the rotations (at most two) end the loop. The sizes and heights on
+        the path must already be current.
+
+        Parameters:
+        - node: The new node.
+
+        Returns:
+        - None
+        """
+        while True:
+            parent = node.parent
+            if parent is None or not parent.red:
+                break
+            # A red parent is never the root, so the grandparent exists.
+            grand = parent.parent
+            if parent is grand.left:
+                uncle = grand.right
+                if self._is_red(uncle):
+                    # Red uncle: push the blackness down from the grandparent
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = grand
+                    continue
+                if node is parent.right:
+                    # Left Right Case
+                    self._rotate_left(parent)
+                    node, parent = parent, node
+                # Left Left Case
+                parent.red = False
+                grand.red = True
+                self._rotate_right(grand)
+            else:
+                uncle = grand.left
+                if self._is_red(uncle):
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = grand
+                    continue
+                if node is parent.left:
+                    # Right Left Case
+                    self._rotate_right(parent)
+                    node, parent = parent, node
+                # Right Right Case
+                parent.red = False
+                grand.red = True
+                self._rotate_left(grand)
+            # The rotations can change the heights above them.
+            self._update_heights(parent.parent)
+            break
+        if self._root.red:
+            # The recolouring reached the root: every path gains a black node
+            self._root.red = False
+            self._black_height += 1
+
+    def remove(self, value: object, n: int = 1) -> bool:
+        """
+        Remove a value from the tree. Returns True if the value is removed,
+        otherwise returns False.
+
+        O(log N) runtime complexity, with at most three rotations.
+
+        Parameters:
+        - value: The value to be removed from the tree.
+        - n: Number of copies to remove (multiset mode).
+
+        Returns:
+        - bool: True if the value is removed, False otherwise.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                break
+        if node is None:
+            return False
+
+        if node.count > n:
+            # Multiset mode with copies to spare: only the counts change.
+            node.count -= n
+            while node is not None:
+                node.size -= n
+                node = node.parent
+            return True
+
+        if node.left is not None and node.right is not None:
+            # Two children: move the inorder successor's entry here and
+            # remove the successor's node instead, which has at most one
+            # child.
+            successor = node.right
+            while successor.left is not None:
+                successor = successor.left
+            self._copy_entry(node, successor)
+            node = successor
+
+        # Splice the node out, replacing it with its only child (if any).
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        if parent is None:
+            self._root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+        # Recompute the sizes and heights on the path up; the entry that
+        # moved is on it.
+        self._update_path(parent)
+
+        if not node.red:
+            self._remove_fixup(child, parent)
+
+        self._version += 1
+        # Removing the smallest or largest value moves that extreme.
+        if not self._min_value < value < self._max_value:
+            self._refresh_extremes()
+        return True
+
+    def _remove_fixup(self, node: RBNode, parent: RBNode) -> None:
+        """
+        Helper method that restores the red-black properties after a black
+        node was removed, leaving the path through node (possibly None) one
+        black short. Recolouring moves the shortage up; at most three
+        rotations are done before the loop ends. If the shortage reaches
+        the root, every path has lost a black node.
+
+        Parameters:
+        - node: The node that took the removed node's place, or None.
+        - parent: Its parent.
+
+        Returns:
+        - None
+        """
+        while node is not self._root and not self._is_red(node):
+            if node is parent.left:
+                sibling = parent.right
+                if sibling.red:
+                    # Red sibling: rotate so the sibling is black
+                    sibling.red = False
+                    parent.red = True
+                    self._update_heights(self._rotate_left(parent).parent)
+                    sibling = parent.right
+                if not self._is_red(sibling.left) and not self._is_red(sibling.right):
+                    # Both nephews black: take one black off this level
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not self._is_red(sibling.right):
+                    # Near nephew red: rotate it into the far position
+                    sibling.left.red = False
+                    sibling.red = True
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                # Far nephew red: one rotation fixes the shortage
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self._rotate_left(parent)
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._update_heights(self._rotate_right(parent).parent)
+                    sibling = parent.left
+                if not self._is_red(sibling.left) and not self._is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not self._is_red(sibling.left):
+                    sibling.right.red = False
+                    sibling.red = True
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self._rotate_right(parent)
+            # The rotations can change the heights above them.
+            self._update_heights(parent.parent.parent)
+            return
+        if self._is_red(node):
+            node.red = False
+        elif node is self._root:
+            self._black_height -= 1
+
+    # ------------------------------------------------------------------ #
+
+    def _empty_copy(self) -> 'RedBlackTree':
+        """
+        Helper method that returns a new empty tree configured like this
+        one (same class and mode).
+        """
+        return type(self)(multiset=self._multiset)
+
+    def _new_tree(self, root: RBNode, black_height: int) -> 'RedBlackTree':
+        """
+        Helper method to wrap a detached subtree in a new tree of the same
+        class and mode as this one.
+
+        Parameters:
+        - root: The root of the subtree, or None.
+        - black_height: Black nodes on every path down from root.
+
+        Returns:
+        - RedBlackTree: The new tree.
+        """
+        tree = self._empty_copy()
+        tree._set_tree(root, black_height)
+        tree._refresh_extremes()
+        return tree
+
+    def _join(self, left: RBNode, left_black: int, pivot: RBNode,
+              right: RBNode, right_black: int) -> tuple:
+        """
+        Helper method that joins two red-black subtrees and a detached pivot
+        node, where every value in left < pivot < every value in right.
+        Descends the spine of the subtree with more black nodes to where
+        the black heights match, so it costs O(1 + black height difference).
+
+        Parameters:
+        - left: Root of the left subtree, or None.
+        - left_black: Black nodes on every path down from left.
+        - pivot: Node to put between the two subtrees.
+        - right: Root of the right subtree, or None.
+        - right_black: Black nodes on every path down from right.
+
+        Returns:
+        - tuple: (root of the joined subtree, its black height)
+        """
+        # Both subtrees must hang from black roots; a red root can be
+        # made black, which adds one black node to every path.
+        if left is not None:
+            left.parent = None
+            if left.red:
+                left.red = False
+                left_black += 1
+        if right is not None:
+            right.parent = None
+            if right.red:
+                right.red = False
+                right_black += 1
+
+        if left_black > right_black:
+            root = self._join_right(left, left_black, pivot, right, right_black)
+            black_height = left_black
+        elif right_black > left_black:
+            root = self._join_left(left, left_black, pivot, right, right_black)
+            black_height = right_black
+        else:
+            pivot.left, pivot.right = left, right
+            pivot.red = False
+            self._update_node(pivot)
+            pivot.parent = None
+            return pivot, left_black + 1
+
+        root.parent = None
+        if root.red:
+            root.red = False
+            black_height += 1
+        return root, black_height
+
+    def _join_right(self, left: RBNode, left_black: int, pivot: RBNode,
+                    right: RBNode, right_black: int) -> RBNode:
+        """
+        Helper method for _join() when left has more black nodes: walks down
+        the right spine of left to a black node with right's black height,
+        and puts pivot there, red, with that node and right as its children.
+        A red node under a red parent is fixed by one rotation at the black
+        node above them, on the way back up.
+
+        Returns:
+        - RBNode: The root of the joined subtree, which may be red.
+        """
+        if not self._is_red(left) and left_black == right_black:
+            pivot.left, pivot.right = left, right
+            pivot.red = True
+            self._update_node(pivot)
+            return pivot
+
+        below = left_black if left.red else left_black - 1
+        child = self._join_right(left.right, below, pivot, right, right_black)
+        left.right = child
+        self._update_node(left)
+        if not left.red and child.red and self._is_red(child.right):
+            child.right.red = False
+            return self._rotate_left(left)
+        return left
+
+    def _join_left(self, left: RBNode, left_black: int, pivot: RBNode,
+                   right: RBNode, right_black: int) -> RBNode:
+        """
+        Helper method for _join() when right has more black nodes. Mirror
+        image of _join_right().
+        """
+        if not self._is_red(right) and left_black == right_black:
+            pivot.left, pivot.right = left, right
+            pivot.red = True
+            self._update_node(pivot)
+            return pivot
+
+        below = right_black if right.red else right_black - 1
+        child = self._join_left(left, left_black, pivot, right.left, below)
+        right.left = child
+        self._update_node(right)
+        if not right.red and child.red and self._is_red(child.left):
+            child.left.red = False
+            return self._rotate_right(right)
+        return right
+
+    def _join2(self, left: RBNode, left_black: int, right: RBNode, right_black: int) -> tuple:
+        """
+        Helper method that joins two red-black subtrees without a pivot,
+        using the largest node of left as the pivot.
+
+        Returns:
+        - tuple: (root of the joined subtree, its black height)
+        """
+        if left is None:
+            return right, right_black
+        left, left_black, pivot = self._pop_max_node(left, left_black)
+        return self._join(left, left_black, pivot, right, right_black)
+
+    def _pop_max_node(self, node: RBNode, black: int) -> tuple:
+        """
+        Helper method that detaches the node with the largest value from a
+        subtree, joining the rest back together on the way up.
+
+        Parameters:
+        - node: The root of the subtree.
+        - black: Black nodes on every path down from node.
+
+        Returns:
+        - tuple: (root of the remaining subtree, its black height, detached node)
+        """
+        below = black if node.red else black - 1
+        if node.right is None:
+            left = node.left
+            node.left = None
+            return left, below, node
+        right, right_black, largest = self._pop_max_node(node.right, below)
+        root, black = self._join(node.left, below, node, right, right_black)
+        return root, black, largest
+
+    def _split(self, node: RBNode, black: int, key: object) -> tuple:
+        """
+        Helper method that splits a subtree around key. O(log N) joins.
+
+        Parameters:
+        - node: The root of the subtree, or None.
+        - black: Black nodes on every path down from node.
+        - key: The value to split at.
+
+        Returns:
+        - tuple: (subtree of values < key, its black height, detached node
+          equal to key or None, subtree of values > key, its black height)
+        """
+        if node is None:
+            return None, 0, None, None, 0
+        below = black if node.red else black - 1
+        if key < node.value:
+            left, left_black, found, right, right_black = self._split(node.left, below, key)
+            right, right_black = self._join(right, right_black, node, node.right, below)
+            return left, left_black, found, right, right_black
+        if node.value < key:
+            left, left_black, found, right, right_black = self._split(node.right, below, key)
+            left, left_black = self._join(node.left, below, node, left, left_black)
+            return left, left_black, found, right, right_black
+
+        left, right = node.left, node.right
+        node.left = node.right = None
+        self._update_node(node)
+        return left, below, node, right, below
+
+    def split(self, key: object) -> tuple:
+        """
+        Split the tree into a tree of the values less than key and a tree
+        of the values greater than or equal to key. This tree is left empty.
+
+        O(log² N) runtime complexity: O(log N) joins along the search path.
+
+        Parameters:
+        - key: The value to split at.
+
+        Returns:
+        - tuple: (tree of values < key, tree of values >= key)
+        """
+        left, left_black, found, right, right_black = \
+            self._split(self._root, self._black_height, key)
+        if found is not None:
+            right, right_black = self._join(None, 0, found, right, right_black)
+        self.make_empty()
+        return self._new_tree(left, left_black), self._new_tree(right, right_black)
+
+    @classmethod
+    def join(cls, left: 'RedBlackTree', pivot: object, right: 'RedBlackTree') -> 'RedBlackTree':
+        """
+        Join two trees and a value, where every value in left is less than
+        pivot and every value in right is greater than pivot. Both input
+        trees are left empty.
+
+        O(log N) runtime complexity.
+
+        Parameters:
+        - left: Tree of values less than pivot.
+        - pivot: The value between the two trees.
+        - right: Tree of values greater than pivot.
+
+        Returns:
+        - RedBlackTree: A new tree holding all the values.
+        """
+        if not left.is_empty() and not left._max_value < pivot:
+            raise ValueError('join() requires every value in left to be less than pivot')
+        if not right.is_empty() and not pivot < right._min_value:
+            raise ValueError('join() requires every value in right to be greater than pivot')
+
+        tree = left._empty_copy()
+        root, black_height = tree._join(left._root, left._black_height, tree._new_node(pivot, 1),
+                                        right._root, right._black_height)
+        tree._set_tree(root, black_height)
+        tree._refresh_extremes()
+        left.make_empty()
+        right.make_empty()
+        return tree
+
+    def _union(self, first: RBNode, first_black: int, second: RBNode, second_black: int) -> tuple:
+        """
+        Helper method for union(): splits second at the root of first and
+        recurses on both sides, like AVL._union().
+        """
+        if first is None:
+            return second, second_black
+        if second is None:
+            return first, first_black
+        below = first_black if first.red else first_black - 1
+        first_left, first_right = first.left, first.right
+        left, left_black, found, right, right_black = self._split(second, second_black, first.value)
+        if found is not None and self._multiset:
+            first.count += found.count
+        left, left_black = self._union(first_left, below, left, left_black)
+        right, right_black = self._union(first_right, below, right, right_black)
+        return self._join(left, left_black, first, right, right_black)
+
+    def _intersection(self, first: RBNode, first_black: int,
+                      second: RBNode, second_black: int) -> tuple:
+        """
+        Helper method for intersection(). See AVL._intersection().
+        """
+        if first is None or second is None:
+            return None, 0
+        below = first_black if first.red else first_black - 1
+        first_left, first_right = first.left, first.right
+        left, left_black, found, right, right_black = self._split(second, second_black, first.value)
+        left, left_black = self._intersection(first_left, below, left, left_black)
+        right, right_black = self._intersection(first_right, below, right, right_black)
+        if found is not None:
+            first.count = min(first.count, found.count)
+            return self._join(left, left_black, first, right, right_black)
+        return self._join2(left, left_black, right, right_black)
+
+    def _difference(self, first: RBNode, first_black: int,
+                    second: RBNode, second_black: int) -> tuple:
+        """
+        Helper method for difference(): splits first at the root of second.
+        See AVL._difference().
+        """
+        if first is None or second is None:
+            return first, first_black
+        below = second_black if second.red else second_black - 1
+        second_left, second_right = second.left, second.right
+        left, left_black, found, right, right_black = self._split(first, first_black, second.value)
+        left, left_black = self._difference(left, left_black, second_left, below)
+        right, right_black = self._difference(right, right_black, second_right, below)
+        if found is not None and found.count > second.count:
+            found.count -= second.count
+            return self._join(left, left_black, found, right, right_black)
+        return self._join2(left, left_black, right, right_black)
+
+    def _symmetric_difference(self, first: RBNode, first_black: int,
+                              second: RBNode, second_black: int) -> tuple:
+        """
+        Helper method for symmetric_difference(). See
+        AVL._symmetric_difference().
+        """
+        if first is None:
+            return second, second_black
+        if second is None:
+            return first, first_black
+        below = first_black if first.red else first_black - 1
+        first_left, first_right = first.left, first.right
+        left, left_black, found, right, right_black = self._split(second, second_black, first.value)
+        left, left_black = self._symmetric_difference(first_left, below, left, left_black)
+        right, right_black = self._symmetric_difference(first_right, below, right, right_black)
+        if found is not None:
+            if first.count == found.count:
+                return self._join2(left, left_black, right, right_black)
+            first.count = abs(first.count - found.count)
+        return self._join(left, left_black, first, right, right_black)
+
+    def _combine(self, other: 'RedBlackTree', operation) -> 'RedBlackTree':
+        """
+        Helper method that runs a set operation on the roots of this tree
+        and other, leaves both empty and wraps the result in a new tree.
+        """
+        if other is self:
+            raise ValueError('cannot combine a tree with itself')
+        root, black_height = operation(self._root, self._black_height,
+                                       other._root, other._black_height)
+        self.make_empty()
+        other.make_empty()
+        return self._new_tree(root, black_height)
+
+    def union(self, other: 'RedBlackTree') -> 'RedBlackTree':
+        """
+        Return a new tree with the values in either tree. The nodes of both
+        trees are reused, so both are left empty. In multiset mode the
+        counts of a shared value are added.
+
+        O(M log(N / M + 1)) splits and joins for trees of sizes M <= N.
+        """
+        return self._combine(other, self._union)
+
+    def intersection(self, other: 'RedBlackTree') -> 'RedBlackTree':
+        """
+        Return a new tree with the values in both trees. Both trees are
+        left empty. In multiset mode the smaller count is kept.
+
+        O(M log(N / M + 1)) splits and joins for trees of sizes M <= N.
+        """
+        return self._combine(other, self._intersection)
+
+    def difference(self, other: 'RedBlackTree') -> 'RedBlackTree':
+        """
+        Return a new tree with the values in this tree but not in other.
+        Both trees are left empty. In multiset mode the counts in other are
+        subtracted.
+
+        O(M log(N / M + 1)) splits and joins for trees of sizes M <= N.
+        """
+        return self._combine(other, self._difference)
+
+    def symmetric_difference(self, other: 'RedBlackTree') -> 'RedBlackTree':
+        """
+        Return a new tree with the values in exactly one of the trees.
+        Both trees are left empty. In multiset mode the difference of the
+        counts is kept.
+
+        O(M log(N / M + 1)) splits and joins for trees of sizes M <= N.
+        """
+        return self._combine(other, self._symmetric_difference)
+
+    def make_empty(self) -> None:
+        """
+        Removes all the nodes from the tree.
+
+        O(1) runtime complexity.
+
+        Returns:
+        - None
+        """
+        super().make_empty()
+        self._black_height = 0
+        self._version += 1
+
+    def height(self) -> int:
+        """
+        Return the height of the tree: the number of edges on the longest
+        path from the root to a leaf, -1 for an empty tree.
+
+        O(1) runtime complexity: every node keeps its height, as in AVL.
+
+        Returns:
+        - int: The height of the tree.
+        """
+        return self._height(self._root)
+
+    def cursor(self, value: object = None) -> Cursor:
+        """
+        Return a cursor positioned at the smallest value greater than or
+        equal to value (the smallest value in the tree if value is None).
+        See avl.Cursor.
+
+        Parameters:
+        - value: Where to start, or None for the beginning.
+
+        Returns:
+        - Cursor: The new cursor.
+        """
+        cursor = Cursor(self)
+        cursor.seek(value)
+        return cursor
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+
+    print("\nRedBlackTree - add()/remove() stress test")
+    print("-----------------------------------------")
+    for _ in range(50):
+        tree = RedBlackTree()
+        expected = set()
+        for _ in range(500):
+            value = random.randrange(200)
+            if random.random() < 0.6:
+                if tree.add(value) != (value not in expected):
+                    raise Exception("PROBLEM WITH ADD RESULT")
+                expected.add(value)
+            else:
+                if tree.remove(value) != (value in expected):
+                    raise Exception("PROBLEM WITH REMOVE RESULT")
+                expected.discard(value)
+        if not tree.is_valid_rb() or list(tree) != sorted(expected):
+            raise Exception("PROBLEM WITH RED-BLACK TREE", tree)
+        if tree.height() > 2 * (len(expected) + 1).bit_length():
+            raise Exception("PROBLEM WITH RED-BLACK HEIGHT")
+    print('add/remove stress test finished')
+
+    print("\nRedBlackTree - multiset mode")
+    print("----------------------------")
+    tree = RedBlackTree(multiset=True)
+    counts = {}
+    for _ in range(3000):
+        value = random.randrange(40)
+        if random.random() < 0.6:
+            tree.add(value)
+            counts[value] = counts.get(value, 0) + 1
+        elif tree.remove(value):
+            counts[value] -= 1
+            if not counts[value]:
+                del counts[value]
+    if any(tree.count(value) != counts.get(value, 0) for value in range(40)):
+        raise Exception("PROBLEM WITH MULTISET COUNT")
+    if not tree.is_valid_rb() or len(tree) != sum(counts.values()):
+        raise Exception("PROBLEM WITH MULTISET TREE")
+    print('multiset test finished')
+
+    print("\nRedBlackTree - split()/join() and set operations")
+    print("------------------------------------------------")
+    for _ in range(20):
+        first = set(random.randrange(500) for _ in range(200))
+        second = set(random.randrange(500) for _ in range(200))
+        key = random.randrange(500)
+        left, right = RedBlackTree(first).split(key)
+        if list(left) != sorted(v for v in first if v < key) or \
+                list(right) != sorted(v for v in first if v >= key):
+            raise Exception("PROBLEM WITH SPLIT")
+        joined = RedBlackTree.join(left, 1000, RedBlackTree(range(1001, 1100)))
+        if not joined.is_valid_rb() or \
+                list(joined) != sorted(v for v in first if v < key) + list(range(1000, 1100)):
+            raise Exception("PROBLEM WITH JOIN")
+        for name, expected in (('union', first | second), ('intersection', first & second),
+                               ('difference', first - second),
+                               ('symmetric_difference', first ^ second)):
+            result = getattr(RedBlackTree(first), name)(RedBlackTree(second))
+            if list(result) != sorted(expected) or not result.is_valid_rb():
+                raise Exception("PROBLEM WITH " + name.upper())
+    print('split/join/set operations test finished')
+
+    print("\nRedBlackTree - heights, black heights and joins of unequal trees")
+    print("----------------------------------------------------------------")
+    from collections import Counter
+
+    def built(values, multiset=False) -> RedBlackTree:
+        """
+        Return a tree built with one add() per value, so that its shape and
+        colours come from the fixups rather than from a bulk build.
+        """
+        tree = RedBlackTree(multiset=multiset)
+        for value in values:
+            tree.add(value)
+        return tree
+
+    for _ in range(30):
+        # one side a few values, the other up to thousands, so the black
+        # heights differ
+        sizes = [random.randrange(20), random.randrange(3000)]
+        random.shuffle(sizes)
+        left_values = random.sample(range(0, 3000), sizes[0])
+        right_values = random.sample(range(4000, 100000), sizes[1])
+        left, right = built(left_values), built(right_values)
+        joined = RedBlackTree.join(left, 3500, right)
+        expected = sorted(left_values) + [3500] + sorted(right_values)
+        if list(joined) != expected or not joined.is_valid_rb() or len(left) or len(right):
+            raise Exception("PROBLEM WITH JOIN OF UNEQUAL TREES")
+        key = random.randrange(-10, 100010)
+        low, high = joined.split(key)
+        if list(low) + list(high) != expected or not low.is_valid_rb() or \
+                not high.is_valid_rb() or any(v >= key for v in low):
+            raise Exception("PROBLEM WITH SPLIT OF A JOINED TREE")
+        # height() is kept by the rotations, not recomputed
+        tree = built(random.sample(range(5000), 2000))
+        for value in random.sample(range(5000), 1500):
+            tree.remove(value)
+            if value % 7 == 0 and not tree.is_valid_rb():
+                raise Exception("PROBLEM WITH HEIGHT/BLACK HEIGHT AFTER REMOVE")
+        if tree.height() > 2 * (len(tree) + 1).bit_length():
+            raise Exception("PROBLEM WITH RED-BLACK HEIGHT")
+
+    for _ in range(20):
+        first = Counter(random.randrange(300) for _ in range(400))
+        second = Counter(random.randrange(300) for _ in range(random.choice((5, 400))))
+        for name, operation in (('union', lambda a, b: a + b), ('intersection', lambda a, b: a & b),
+                                ('difference', lambda a, b: a - b),
+                                ('symmetric_difference', lambda a, b: (a - b) + (b - a))):
+            result = getattr(built(first.elements(), True), name)(built(second.elements(), True))
+            if list(result) != sorted(operation(first, second).elements()) or \
+                    not result.is_valid_rb():
+                raise Exception("PROBLEM WITH MULTISET " + name.upper())
+    print('height/black height/join test finished')
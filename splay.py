@@ -0,0 +1,403 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Self-adjusting splay tree
+
+
+from bst import BSTNode, BST
+
+
+class SplayTree(BST):
+    """
+    Splay tree class. Inherits from BST
+
+    Every add, remove and contains moves the node it reaches to the root
+    with splay rotations, so recently used values sit near the top.
+    Operations are amortized O(log N), and a sequence of lookups makes
+    O(N + sum of log(1 / frequency)) comparisons.
+
+    Fewer comparisons do not make it faster than AVL here: each splay step
+    writes several links, which in CPython costs more than the comparisons
+    it saves. bench_splay() measures it slower than AVL on uniform, Zipf
+    and sequential lookups alike, so use AVL when speed matters.
+
+    Splaying keeps only the root's subtree size (the size of the tree);
+    rank() and select() recompute the others in O(N) on their first call
+    after the tree was splayed. Duplicates are handled as in AVL: ignored,
+    or counted in multiset mode. The ordered queries inherited from BST
+    (rank, select, floor, irange, ...) do not splay.
+    """
+
+    # set when splaying has left the subtree sizes below the root stale
+    _sizes_stale = False
+
+    def __init__(self, start_tree=None, multiset: bool = False) -> None:
+        """
+        Initialize a new splay tree
+
+        Without multiset mode duplicates are ignored; with it each node
+        counts the copies of its value.
+        """
+        super().__init__(start_tree, multiset)
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        self._str_helper(self._root, values)
+        return "Splay pre-order { " + ", ".join(values) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def _bulk_load(self, values: list) -> None:
+        """
+        Helper method to replace the contents of the tree with a perfectly
+        balanced tree built from a sorted list. Duplicates are dropped, or
+        counted in multiset mode.
+
+        Parameters:
+        - values: Sorted list of values.
+
+        Returns:
+        - None
+        """
+        unique, counts = self._group_runs(values)
+        self._set_root(self._build_balanced(unique, 0, len(unique),
+                                            counts if self._multiset else None))
+        self._refresh_extremes()
+        self._tree_height = None
+
+    def _set_root(self, root: BSTNode) -> None:
+        """
+        Helper method to install a new root whose subtree sizes are all
+        current (a bulk build or a restored shape).
+        """
+        self._root = root
+        self._sizes_stale = False
+
+    def _refresh_sizes(self) -> None:
+        """
+        Helper method that recomputes every subtree size, bottom up, after
+        splaying left them stale. O(N), once per run of size queries.
+
+        Returns:
+        - None
+        """
+        if not self._sizes_stale:
+            return
+        # Pre-order with an explicit stack, then finish the nodes in
+        # reverse, so every child is done before its parent.
+        order = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        for node in reversed(order):
+            self._update_node(node)
+        self._sizes_stale = False
+
+    def _splay(self, value: object) -> BSTNode:
+        """
+        Helper method that splays the node holding value, or the last node
+        on the search path for it, to the root in a single top-down pass.
+
+        On the way down, nodes smaller than value are hung on a left tree
+        and larger ones on a right tree (with an extra rotation for every
+        zig-zig step); at the bottom both trees become the subtrees of the
+        node reached. Only the root's size is kept: it is the size of the
+        whole tree, so len() stays O(1). The sizes below it are left stale
+        until a size query needs them, see _refresh_sizes().
+
+        Parameters:
+        - value: The value to search for.
+
+        Returns:
+        - BSTNode: The new root, or None if the tree is empty.
+        """
+        root = node = self._root
+        if node is None:
+            return None
+
+        # The header's right child is the left tree and its left child the
+        # right tree; smaller and larger are their last nodes, whose free
+        # slot the next node is linked into.
+        header = _Header()
+        smaller = larger = header
+        while True:
+            if value < node.value:
+                child = node.left
+                if child is None:
+                    break
+                if value < child.value:
+                    # Zig-zig: rotate right before linking
+                    node.left = child.right
+                    child.right = node
+                    node = child
+                    if node.left is None:
+                        break
+                # Link node into the right tree
+                larger.left = node
+                larger = node
+                node = node.left
+            elif node.value < value:
+                child = node.right
+                if child is None:
+                    break
+                if child.value < value:
+                    # Zig-zig: rotate left before linking
+                    node.right = child.left
+                    child.left = node
+                    node = child
+                    if node.right is None:
+                        break
+                # Link node into the left tree
+                smaller.right = node
+                smaller = node
+                node = node.right
+            else:
+                break
+
+        if node is root:
+            # Already at the root, nothing moved.
+            return node
+
+        # Reassemble: node's subtrees go to the ends of the two trees, and
+        # the trees become its subtrees.
+        smaller.right = node.left
+        larger.left = node.right
+        node.left = header.right
+        node.right = header.left
+        node.size = root.size
+        self._root = node
+        self._sizes_stale = True
+        self._tree_height = None
+        return node
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object, n: int = 1) -> bool:
+        """
+        Add a new value to the tree as the new root. Without multiset mode
+        duplicates are not allowed; if the value is already present it is
+        splayed but the tree's contents are unchanged.
+
+        Amortized O(log N) runtime complexity.
+
+        Parameters:
+        - value: The value to be added to the tree.
+        - n: Number of copies to add (multiset mode).
+
+        Returns:
+        - bool: True if the tree changed, False otherwise.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        root = self._splay(value)
+        if root is not None and not root.value < value and not value < root.value:
+            if not self._multiset:
+                return False
+            # Already present, count the new copies
+            root.count += n
+            root.size += n
+            return True
+
+        node = self._new_node(value, n if self._multiset else 1)
+        if root is None:
+            self._root = node
+            self._min_value = self._max_value = value
+            self._tree_height = 0
+            return True
+
+        # The old root is the neighbour of value: split it around the new
+        # node, which becomes the root. The old root loses a subtree, so
+        # its size goes stale.
+        if value < root.value:
+            node.left, node.right = root.left, root
+            root.left = None
+        else:
+            node.left, node.right = root, root.right
+            root.right = None
+        node.size = root.size + node.count
+        self._root = node
+        self._sizes_stale = True
+        self._tree_height = None
+
+        # Keep the cached extremes current.
+        if value < self._min_value:
+            self._min_value = value
+        elif self._max_value < value:
+            self._max_value = value
+        return True
+
+    def contains(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree, otherwise returns False.
+        The last node reached is splayed to the root.
+
+        Amortized O(log N) runtime complexity.
+
+        Parameters:
+        - value: The value to check for in the tree.
+
+        Returns:
+        - bool: True if the value is in the tree, False otherwise.
+        """
+        root = self._splay(value)
+        return root is not None and not root.value < value and not value < root.value
+
+    def remove(self, value: object, n: int = 1) -> bool:
+        """
+        Remove a value from the tree. The node is splayed to the root and
+        its two subtrees joined by splaying the largest value of the left
+        subtree to its top.
+
+        Amortized O(log N) runtime complexity.
+
+        Parameters:
+        - value: The value to be removed from the tree.
+        - n: Number of copies to remove (multiset mode).
+
+        Returns:
+        - bool: True if the value is removed, False otherwise.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        root = self._splay(value)
+        if root is None or root.value < value or value < root.value:
+            return False
+
+        if root.count > n:
+            # Multiset mode with copies to spare: only the counts change.
+            root.count -= n
+            root.size -= n
+            return True
+
+        size = root.size - root.count
+        left, right = root.left, root.right
+        if left is None:
+            self._root = right
+        else:
+            # Every value on the left is smaller, so splaying for value
+            # brings the largest of them up; it then has no right child.
+            # The left subtree's own size is stale, so the new root's size
+            # is set from the total instead.
+            self._root = left
+            left.size = size
+            left = self._splay(value)
+            left.right = right
+        if self._root is not None:
+            self._root.size = size
+            self._sizes_stale = True
+
+        self._tree_height = None
+        # Removing the smallest or largest value moves that extreme.
+        if not self._min_value < value < self._max_value:
+            self._refresh_extremes()
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Ordered queries that read the subtree sizes
+
+    def rank(self, value: object) -> int:
+        """
+        Return the number of values less than value. See BST.rank().
+        O(N) right after splaying (the sizes are recomputed), else O(H).
+        """
+        self._refresh_sizes()
+        return super().rank(value)
+
+    def _select_node(self, index: int) -> BSTNode:
+        """
+        Helper method for select(). See BST._select_node(); the sizes are
+        recomputed first if splaying left them stale.
+        """
+        self._refresh_sizes()
+        return super()._select_node(index)
+
+
+class _Header:
+    """
+    Scratch node for SplayTree._splay(): holds the roots of the left and
+    right trees while they are built.
+    """
+
+    __slots__ = ('left', 'right')
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty header
+        """
+        self.left = self.right = None
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+
+    print("\nSplayTree - add()/remove()/contains() stress test")
+    print("-------------------------------------------------")
+    for _ in range(50):
+        tree = SplayTree()
+        expected = set()
+        for _ in range(500):
+            value = random.randrange(200)
+            action = random.random()
+            if action < 0.4:
+                if tree.add(value) != (value not in expected):
+                    raise Exception("PROBLEM WITH ADD RESULT")
+                expected.add(value)
+            elif action < 0.7:
+                if tree.remove(value) != (value in expected):
+                    raise Exception("PROBLEM WITH REMOVE RESULT")
+                expected.discard(value)
+            elif tree.contains(value) != (value in expected):
+                raise Exception("PROBLEM WITH CONTAINS")
+            elif value in expected and tree.get_root().value != value:
+                raise Exception("PROBLEM: FOUND VALUE NOT SPLAYED TO THE ROOT")
+        if not tree.is_valid_bst() or list(tree) != sorted(expected):
+            raise Exception("PROBLEM WITH SPLAY TREE", tree)
+        if expected and (tree.find_min() != min(expected) or tree.find_max() != max(expected)):
+            raise Exception("PROBLEM WITH MIN OR MAX")
+        if any(tree.select(i) != v for i, v in enumerate(sorted(expected))):
+            raise Exception("PROBLEM WITH SUBTREE SIZES")
+    print('stress test finished')
+
+    print("\nSplayTree - len(), rank() and select() after splaying")
+    print("-----------------------------------------------------")
+    for multiset in (False, True):
+        tree = SplayTree(range(0, 400, 4), multiset=multiset)
+        expected = {value: 1 for value in range(0, 400, 4)}
+        for _ in range(3000):
+            value = random.randrange(400)
+            action = random.random()
+            if action < 0.4:
+                if tree.add(value):
+                    expected[value] = expected.get(value, 0) + 1
+            elif action < 0.7:
+                if tree.remove(value):
+                    expected[value] -= 1
+                    if not expected[value]:
+                        del expected[value]
+            else:
+                tree.contains(value)
+            if len(tree) != sum(expected.values()):
+                raise Exception("PROBLEM WITH LEN AFTER SPLAYING")
+            if action > 0.95:
+                values = sorted(v for v, count in expected.items() for _ in range(count))
+                if tree.rank(value) != sum(v < value for v in values) or \
+                        (values and tree.select(len(values) // 2) != values[len(values) // 2]):
+                    raise Exception("PROBLEM WITH RANK OR SELECT AFTER SPLAYING")
+        if list(tree) != sorted(v for v, count in expected.items() for _ in range(count)):
+            raise Exception("PROBLEM WITH SPLAY TREE CONTENTS")
+    if SplayTree().rank(5) != 0 or len(SplayTree()) != 0:
+        raise Exception("PROBLEM WITH AN EMPTY SPLAY TREE")
+    print('size test finished')
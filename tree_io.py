@@ -0,0 +1,396 @@
+# Name: William Clements
+# OSU Email: clemenwi@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: BST implementation
+# Description: Compact binary file format for trees, and a memory-mapped read-only tree
+
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+# File layout (all little-endian):
+#
+#   header   magic, format version, key kind, flags, node count N
+#   keys     'q' / 'd': N fixed-width 8-byte keys
+#            's' / 'b': N u32 lengths, then the encoded keys back to back
+#   counts   N u64 copy counts (multiset trees only)
+#   shape    2 bits per node in pre-order: has left child, has right child
+#            (only for trees without balance rules, see BST._restore_shape)
+#
+# Each section after the header starts at a multiple of 8 bytes, so the
+# fixed-width keys can be used in place from a memory map.
+
+MAGIC = b'BSTF'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBQ')
+
+FLAG_MULTISET = 1
+FLAG_SHAPE = 2
+
+# key kinds: 64-bit ints, doubles, UTF-8 strings, raw bytes
+KIND_INT, KIND_FLOAT, KIND_STR, KIND_BYTES = b'q', b'd', b's', b'b'
+
+# array typecode of the u32 string lengths
+LENGTH_TYPE = 'I'
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _key_kind(values: list) -> bytes:
+    """
+    Helper function that picks the key encoding for a list of keys, all
+    of which must be of the same kind. Raises TypeError otherwise.
+    """
+    if not values:
+        return KIND_INT
+    kinds = {type(value) for value in values}
+    if kinds == {int}:
+        if INT64_MIN <= values[0] and values[-1] <= INT64_MAX:
+            return KIND_INT
+        raise TypeError('integer keys must fit in 64 bits')
+    if kinds == {float}:
+        return KIND_FLOAT
+    if kinds == {str}:
+        return KIND_STR
+    if kinds == {bytes}:
+        return KIND_BYTES
+    raise TypeError('cannot store keys of type(s) {}'.format(
+        ', '.join(sorted(kind.__name__ for kind in kinds))))
+
+
+def _little_endian(data: array) -> array:
+    """
+    Helper function that returns data in little-endian byte order.
+    """
+    if sys.byteorder != 'little':
+        data = array(data.typecode, data)
+        data.byteswap()
+    return data
+
+
+def _padding(offset: int) -> bytes:
+    """Helper function that returns the zero bytes up to the next multiple of 8."""
+    return bytes(-offset % 8)
+
+
+def dump_tree(tree, path, values: list = None) -> None:
+    """
+    Write a tree to a file in the binary format above. See BST.dump().
+
+    Parameters:
+    - tree: The tree to write.
+    - path: File name or path.
+    - values: Distinct keys in ascending order to store instead of the
+      node values (AVLMap.dump() stores its keys, not its sort keys).
+
+    Returns:
+    - None
+    """
+    flags = FLAG_MULTISET if tree._multiset else 0
+    if tree._restore_shape:
+        flags |= FLAG_SHAPE
+
+    nodes = list(tree._iter_nodes())
+    if values is None:
+        values = [node.value for node in nodes]
+    kind = _key_kind(values)
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, kind[0], flags, len(nodes)))
+        offset = HEADER.size
+        if kind in (KIND_INT, KIND_FLOAT):
+            data = _little_endian(array(kind.decode(), values)).tobytes()
+        else:
+            encoded = [value.encode() for value in values] if kind == KIND_STR else values
+            lengths = _little_endian(array(LENGTH_TYPE, [len(key) for key in encoded]))
+            data = lengths.tobytes() + b''.join(encoded)
+        file.write(data)
+        offset += len(data)
+
+        if flags & FLAG_MULTISET:
+            file.write(_padding(offset))
+            offset += -offset % 8
+            data = _little_endian(array('Q', [node.count for node in nodes])).tobytes()
+            file.write(data)
+            offset += len(data)
+
+        if flags & FLAG_SHAPE:
+            file.write(_padding(offset))
+            file.write(tree._shape_bits())
+
+
+def _read_header(data) -> tuple:
+    """
+    Helper function that checks and unpacks the header of a file's bytes.
+
+    Returns:
+    - tuple: (key kind, flags, node count)
+    """
+    if len(data) < HEADER.size:
+        raise ValueError('not a tree file: too short')
+    magic, version, kind, flags, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('not a tree file: bad magic number')
+    if version != VERSION:
+        raise ValueError('unsupported tree file version {}'.format(version))
+    kind = bytes([kind])
+    if kind not in (KIND_INT, KIND_FLOAT, KIND_STR, KIND_BYTES):
+        raise ValueError('unknown key kind {!r}'.format(kind))
+    return kind, flags, count
+
+
+def _read_array(typecode: str, data, offset: int, count: int) -> array:
+    """
+    Helper function that reads count little-endian items from data.
+    """
+    items = array(typecode)
+    items.frombytes(data[offset:offset + count * items.itemsize])
+    if sys.byteorder != 'little':
+        items.byteswap()
+    return items
+
+
+def read_tree(path) -> tuple:
+    """
+    Read the sections of a file written by dump_tree().
+
+    Parameters:
+    - path: File name or path.
+
+    Returns:
+    - tuple: (values, counts or None, shape bits or None)
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    kind, flags, count = _read_header(data)
+    offset = HEADER.size
+
+    if kind in (KIND_INT, KIND_FLOAT):
+        values = _read_array(kind.decode(), data, offset, count).tolist()
+        offset += 8 * count
+    else:
+        lengths = _read_array(LENGTH_TYPE, data, offset, count)
+        offset += 4 * count
+        values = []
+        for length in lengths:
+            values.append(data[offset:offset + length])
+            offset += length
+        if kind == KIND_STR:
+            values = [value.decode() for value in values]
+
+    counts = None
+    if flags & FLAG_MULTISET:
+        offset += -offset % 8
+        counts = _read_array('Q', data, offset, count).tolist()
+        offset += 8 * count
+
+    shape = None
+    if flags & FLAG_SHAPE:
+        offset += -offset % 8
+        shape = data[offset:offset + (count + 3) // 4]
+    return values, counts, shape
+
+
+def load_tree(cls, path):
+    """
+    Read a tree written by dump_tree() into a new tree of class cls. See
+    BST.load().
+
+    Parameters:
+    - cls: The tree class to create.
+    - path: File name or path.
+
+    Returns:
+    - The new tree.
+    """
+    values, counts, shape = read_tree(path)
+    tree = cls(multiset=counts is not None)
+    if shape is not None and tree._restore_shape:
+        tree._restore(values, counts, shape)
+    else:
+        tree._load_sorted(values, counts)
+    return tree
+
+
+class MappedTree:
+    """
+    Read-only sorted collection served straight from a tree file with
+    integer or float keys, through a memory map. Nothing is deserialised:
+    contains(), rank() and range queries binary-search the mapped keys, so
+    opening a file is O(1) and pages are read only as they are touched.
+
+    The values are the file's distinct keys (nodes); in a multiset file
+    count() reports the copies of each.
+    """
+
+    def __init__(self, path) -> None:
+        """
+        Map a tree file for reading.
+
+        Parameters:
+        - path: File name or path.
+        """
+        if sys.byteorder != 'little':
+            raise ValueError('MappedTree requires a little-endian machine')
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        kind, flags, count = _read_header(self._map)
+        if kind not in (KIND_INT, KIND_FLOAT):
+            self._map.close()
+            raise ValueError('MappedTree needs integer or float keys')
+
+        self._view = memoryview(self._map)
+        end = HEADER.size + 8 * count
+        self._keys = self._view[HEADER.size:end].cast(kind.decode())
+        self._counts = None
+        if flags & FLAG_MULTISET:
+            self._counts = self._view[end:end + 8 * count].cast('Q')
+
+    def close(self) -> None:
+        """
+        Release the memory map.
+        """
+        # The views must be released before the map can be closed.
+        self._keys.release()
+        if self._counts is not None:
+            self._counts.release()
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> 'MappedTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Return the number of keys.
+        """
+        return len(self._keys)
+
+    def __iter__(self):
+        """
+        Iterate over the keys in ascending order.
+        """
+        return iter(self._keys)
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Support the 'in' operator. See contains().
+        """
+        return self.contains(value)
+
+    def contains(self, value: object) -> bool:
+        """
+        Returns True if the value is in the file, otherwise returns False.
+
+        O(log N) runtime complexity.
+        """
+        keys = self._keys
+        i = bisect_left(keys, value)
+        return i < len(keys) and keys[i] == value
+
+    def count(self, value: object) -> int:
+        """
+        Return the number of copies of value.
+        """
+        keys = self._keys
+        i = bisect_left(keys, value)
+        if i == len(keys) or keys[i] != value:
+            return 0
+        if self._counts is None:
+            return bisect_right(keys, value, i) - i
+        return self._counts[i]
+
+    def rank(self, value: object) -> int:
+        """
+        Return the number of keys less than value.
+        """
+        return bisect_left(self._keys, value)
+
+    def _bounds(self, lo: object, hi: object, inclusive: tuple) -> tuple:
+        """
+        Helper method that returns the index range of the keys between lo
+        and hi.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        keys = self._keys
+        start = 0 if lo is None else (bisect_left if lo_inclusive else bisect_right)(keys, lo)
+        stop = len(keys) if hi is None else (bisect_right if hi_inclusive else bisect_left)(keys, hi)
+        return start, max(start, stop)
+
+    def count_range(self, lo: object = None, hi: object = None,
+                    inclusive: tuple = (True, False)) -> int:
+        """
+        Return the number of keys between lo and hi.
+
+        O(log N) runtime complexity.
+        """
+        start, stop = self._bounds(lo, hi, inclusive)
+        return stop - start
+
+    def irange(self, lo: object = None, hi: object = None,
+               inclusive: tuple = (True, False), reverse: bool = False):
+        """
+        Lazily yield the keys between lo and hi in sorted order.
+
+        O(log N + K) for K results.
+        """
+        start, stop = self._bounds(lo, hi, inclusive)
+        keys = self._keys
+        if reverse:
+            return (keys[i] for i in range(stop - 1, start - 1, -1))
+        return (keys[i] for i in range(start, stop))
+
+    def find_min(self) -> object:
+        """
+        Return the lowest key, or None if there are none.
+        """
+        return self._keys[0] if len(self._keys) else None
+
+    def find_max(self) -> object:
+        """
+        Return the highest key, or None if there are none.
+        """
+        return self._keys[-1] if len(self._keys) else None
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import os
+    import random
+    import tempfile
+    from avl import AVL
+    from rbtree import RedBlackTree
+
+    print("\ndump_tree()/load_tree()/MappedTree round trip")
+    print("---------------------------------------------")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tree.bin')
+        for cls in (AVL, RedBlackTree):
+            for values in ([random.randrange(1000) for _ in range(500)],
+                           [random.random() for _ in range(500)], ['b', 'a', 'c'], []):
+                for multiset in (False, True):
+                    tree = cls(values, multiset)
+                    tree.dump(path)
+                    loaded = cls.load(path)
+                    if list(loaded) != list(tree) or type(loaded) is not cls:
+                        raise Exception("PROBLEM WITH LOAD", cls.__name__, multiset)
+                    if not values or type(values[0]) is str:
+                        continue
+                    mapped = MappedTree(path)
+                    value = random.choice(values)
+                    if mapped.count(value) != tree.count(value) or \
+                            mapped.rank(value) != len(set(v for v in values if v < value)) or \
+                            list(mapped.irange()) != sorted(set(values)):
+                        raise Exception("PROBLEM WITH MAPPED TREE", cls.__name__, multiset)
+                    mapped.close()
+    print('round trip test finished')